@@ -3,65 +3,568 @@
 Advanced Hash Cracking Module
 """
 
-import hashlib
+import os
 import time
 import argparse
 from colorama import Fore, Style, init
-from tqdm import tqdm
-import multiprocessing as mp
-from utils.cracker import HashCracker, CrackResults
-from utils.wordlists import load_wordlist, extended_common_passwords
+from utils.cracker import HashCracker, HASH_FUNCTIONS
+from utils.results import CrackResult, CrackResults
+from utils.wordlists import WordlistSource, extended_common_passwords
+from utils.ingest import HashTargets
+from utils.mask import MaskKeyspace
+from utils.potfile import Potfile, DEFAULT_POTFILE
+from utils.checkpoint import Checkpoint, DEFAULT_CHECKPOINT, DEFAULT_INTERVAL
+from utils.slowhash import CRYPT_SCHEMES, SlowHashScheduler
+from utils.metrics import DEFAULT_METRICS, active, profiled
+from utils.progress import set_enabled
+from utils.rules import DEFAULT_BASE_WORDS
+from utils.scheduler import DEFAULT_STATS, Deadline, StrategyStats, estimate_lines, schedule
+# utils.parallel (multiprocessing) and utils.benchmark are imported when first needed
 
 init(autoreset=True)
 
+# Default strategy order of crack_hash / crack_hash_file (scheduling ties, and
+# checkpoints saved without an order)
+STRATEGIES = ('common', 'wordlist', 'rules')
+
 class AdvancedHashCracker:
-    def __init__(self):
+    def __init__(self, potfile=None, checkpoint=None, stats=None):
         self.cracker = HashCracker()
         self.results = CrackResults()
+        # Potfile path or instance; None disables the cracked-hash cache
+        self.potfile = Potfile(potfile) if isinstance(potfile, str) else potfile
+        # Checkpoint path or instance; None disables checkpointing
+        self.checkpoint = Checkpoint(checkpoint) if isinstance(checkpoint, str) else checkpoint
+        # Strategy history path or instance; None keeps it for this session only
+        self.stats = stats if isinstance(stats, StrategyStats) else StrategyStats(stats)
+    
+    def resolve_hash_type(self, target_hash, hash_type='auto'):
+        return self.cracker.detect_hash_type(target_hash) if hash_type == 'auto' else hash_type
+    
+    def _start_job(self, job, resume):
+        """Reset the checkpoint for a new (or resumed) job"""
+        if self.checkpoint is not None:
+            self.checkpoint.state = {'job': job}
+        if resume:
+            print(f"{Fore.WHITE}Resuming: {Fore.YELLOW}{resume['strategy']} strategy at position {resume['position']:,}")
+    
+    def _progress(self, strategy, position=0):
+        """Progress callback recording strategy/position in the checkpoint (None when disabled)"""
+        if self.checkpoint is None:
+            return None
+        self.checkpoint.update(strategy=strategy, position=position)
+        return self.checkpoint.progress(strategy)
     
-    def crack_hash(self, target_hash, hash_type='auto', wordlist=None, max_workers=4):
-        """Advanced hash cracking with multiple strategies"""
+    def _measured(self, strategy, attack, words=None, algorithm=None, targets=()):
+        """Run attack(), adding it to the strategy history and, when profiling is on, the metrics.
+        
+        ``words`` (a fresh or re-iterable candidate source) is sampled to split
+        the strategy's time between generating, hashing and comparing against
+        ``targets``, the raw digests as the attack loop looks them up (or a
+        callable building them, only called when profiling).
+        """
+        metrics = active()
+        if metrics is not None and words is not None and algorithm in HASH_FUNCTIONS:
+            metrics.sample_stages(strategy, words, HASH_FUNCTIONS[algorithm],
+                                  targets() if callable(targets) else targets)
+        started = time.perf_counter()
+        result = attack()
+        seconds = time.perf_counter() - started
+        self.stats.record(strategy, result, seconds)
+        if metrics is not None:
+            metrics.record_attack(strategy, result, seconds)
+        return result
+    
+    def _schedule(self, strategies, wordlist, rules, targets, resume=None):
+        """Strategy order: the saved one when resuming, else by expected hits per second"""
+        if resume:
+            saved = resume.get('order', STRATEGIES)
+            order = [strategy for strategy in saved if strategy in strategies]
+            if resume['strategy'] in order:
+                order = order[order.index(resume['strategy']):]
+        else:
+            saved = order = self._plan(strategies, wordlist, rules, targets)
+        if self.checkpoint is not None:
+            self.checkpoint.update(order=list(saved))
+        return order
+    
+    def _plan(self, strategies, wordlist, rules, targets):
+        """Print and return the strategies by expected hits per second"""
+        lines = estimate_lines(wordlist) if wordlist else None
+        keyspaces = {}
+        for strategy in strategies:
+            if strategy == 'common':
+                keyspaces[strategy] = len(extended_common_passwords)
+            elif strategy == 'wordlist':
+                keyspaces[strategy] = lines
+            else:
+                words = lines if rules and wordlist else len(DEFAULT_BASE_WORDS)
+                keyspaces[strategy] = len(self.cracker.rule_engine(rules)) * words
+        plan = schedule(keyspaces, self.stats, targets)
+        print(f"{Fore.WHITE}Strategy order: " + ", ".join(
+            f"{Fore.YELLOW}{step['strategy']}{Fore.WHITE} (~{step['keyspace'] or 0:,} cand, "
+            f"{step['hits_per_second']:.2g} hits/s)" for step in plan))
+        return [step['strategy'] for step in plan]
+    
+    def _finish_job(self, deadline=None):
+        """Drop the checkpoint, or keep it for --resume when the time budget cut the run short"""
+        self.stats.save()
+        if deadline is not None and deadline.expired():
+            print(f"\n{Fore.YELLOW}⏱️  Time budget reached: results are partial")
+            if self.checkpoint is not None:
+                self.checkpoint.save()
+                print(f"{Fore.YELLOW}💡 Continue with --resume --checkpoint {self.checkpoint.path}")
+            return
+        if self.checkpoint is not None:
+            self.checkpoint.clear()
+    
+    def crack_hash(self, target_hash, hash_type='auto', wordlist=None, max_workers=4, rules=None, resume=None,
+                   max_seconds=None):
+        """Advanced hash cracking with multiple strategies.
+        
+        Strategies run in order of expected hits per second. ``resume`` is a
+        saved checkpoint state; strategies before its strategy are skipped and
+        that strategy restarts from the saved position. ``max_seconds`` stops
+        the run once the time budget is spent.
+        """
         print(f"\n{Fore.CYAN}🔓 Starting Advanced Hash Cracking")
         print(f"{Fore.WHITE}Target Hash: {Fore.YELLOW}{target_hash}")
         print(f"{Fore.WHITE}Hash Type: {Fore.YELLOW}{hash_type}")
+        print(f"{Fore.WHITE}Workers: {Fore.YELLOW}{max_workers}")
         print(f"{Fore.CYAN}{'='*50}")
         
         start_time = time.time()
+        deadline = Deadline(max_seconds)
+        algorithm = self.resolve_hash_type(target_hash, hash_type)
         
-        # Strategy 1: Common passwords first
-        print(f"\n{Fore.GREEN}[1/3] Trying common passwords...")
-        common_result = self.cracker.dictionary_attack(
-            target_hash, extended_common_passwords, hash_type
-        )
+        # Previously cracked hashes are answered from the potfile
+        if self.potfile is not None:
+            plaintext = self.potfile.lookup(algorithm, target_hash)
+            if plaintext is not None:
+                result = CrackResult(
+                    cracked=True,
+                    password=plaintext,
+                    attempts=0,
+                    time=time.time() - start_time,
+                    method='potfile'
+                )
+                self.display_result(result, result['time'])
+                self._finish_job()
+                return result
+        
+        if algorithm in CRYPT_SCHEMES:
+            result = self.crack_slow([target_hash], algorithm, wordlist, max_workers, rules, deadline)[target_hash]
+            self.display_result(result, time.time() - start_time)
+            if result['cracked'] and self.potfile is not None:
+                self.potfile.add(algorithm, target_hash, result['password'])
+            self.stats.save()
+            return result
         
-        if common_result['cracked']:
-            self.display_result(common_result, time.time() - start_time)
-            return common_result
+        self._start_job({'mode': 'hash', 'hash': target_hash, 'type': hash_type, 'wordlist': wordlist,
+                         'rules': rules, 'workers': max_workers}, resume)
+        result = self._run_strategies(target_hash, hash_type, wordlist, max_workers, rules, start_time, resume,
+                                      deadline)
         
-        # Strategy 2: Wordlist attack
+        if result['cracked'] and self.potfile is not None:
+            self.potfile.add(algorithm, target_hash, result['password'])
+        
+        self._finish_job(deadline)
+        return result
+    
+    def _run_strategies(self, target_hash, hash_type, wordlist, max_workers, rules, start_time, resume=None,
+                        deadline=None):
+        """Run common-password, wordlist and rule strategies until one cracks the hash"""
+        deadline = deadline or Deadline()
+        # Wordlist and rule strategies are sharded across processes
+        parallel = None
+        if max_workers > 1:
+            from utils.parallel import ParallelCracker
+            parallel = ParallelCracker(max_workers, deadline)
+        
+        algorithm = self.resolve_hash_type(target_hash, hash_type)
+        
+        def start(strategy):
+            return resume['position'] if resume and resume['strategy'] == strategy else 0
+        
+        # Each builder returns (attack, candidate source to sample) once its strategy is due
+        def common_attack():
+            self._progress('common')
+            return (lambda: self.cracker.dictionary_attack(
+                target_hash, deadline.limit(extended_common_passwords), hash_type
+            )), extended_common_passwords
+        
+        def wordlist_attack():
+            offset = start('wordlist')
+            progress = self._progress('wordlist', offset)
+            if parallel:
+                attack = lambda: parallel.wordlist_attack(target_hash, wordlist, hash_type,
+                                                          start=offset, progress=progress)
+            else:
+                attack = lambda: self.cracker.dictionary_attack(
+                    target_hash, deadline.limit(WordlistSource(wordlist, start=offset)), hash_type, desc="Wordlist",
+                    progress=progress
+                )
+            return attack, WordlistSource(wordlist, start=offset)
+        
+        # Advanced rules, over the wordlist when a rules file is given.
+        # The position is a wordlist byte offset, or a base-word index without one.
+        def rule_attack():
+            position = start('rules')
+            progress = self._progress('rules', position)
+            if parallel and rules and wordlist:
+                attack = lambda: parallel.wordlist_attack(target_hash, wordlist, hash_type, rules=rules,
+                                                          desc="Rule-based", start=position, progress=progress)
+            elif parallel:
+                attack = lambda: parallel.rule_attack(target_hash, hash_type, rules=rules,
+                                                      start=position, progress=progress)
+            elif rules and wordlist:
+                attack = lambda: self.cracker.rule_based_attack(
+                    target_hash, hash_type, rules=rules,
+                    wordlist=deadline.limit(WordlistSource(wordlist, start=position)), progress=progress
+                )
+            else:
+                attack = lambda: self.cracker.rule_based_attack(target_hash, hash_type, rules=rules,
+                                                                start=position, progress=progress)
+            rule_words = WordlistSource(wordlist, start=position) if rules and wordlist else None
+            return attack, self.cracker.rule_candidates(rule_words, rules)
+        
+        attacks = {'common': (common_attack, "Trying common passwords"),
+                   'wordlist': (wordlist_attack, "Trying wordlist attack"),
+                   'rules': (rule_attack, "Trying rule-based attacks")}
+        if not wordlist:
+            del attacks['wordlist']
+        order = self._schedule(attacks, wordlist, rules, 1, resume)
+        
+        attempts = 0
+        method = 'dictionary'
+        for step, strategy in enumerate(order, 1):
+            if deadline.expired():
+                break
+            build, desc = attacks[strategy]
+            print(f"\n{Fore.GREEN}[{step}/{len(order)}] {desc}...")
+            attack, words = build()
+            result = self._measured(strategy, attack, words, algorithm, (bytes.fromhex(target_hash),))
+            if result['cracked']:
+                self.display_result(result, time.time() - start_time)
+                return result
+            attempts += result['attempts']
+            method = result['method']
+        
+        result = CrackResult(
+            cracked=False,
+            password=None,
+            attempts=attempts,
+            time=time.time() - start_time,
+            method=method
+        )
+        self.display_result(result, result['time'])
+        if not deadline.expired():
+            print(f"\n{Fore.RED}❌ Hash could not be cracked with available methods")
+            print(f"{Fore.YELLOW}💡 Try with a larger wordlist or different attack type")
+        
+        return result
+    
+    def slow_candidates(self, wordlist=None, rules=None):
+        """Candidates for slow hashes, most likely first: common passwords, wordlist, rule output"""
+        yield from extended_common_passwords
         if wordlist:
-            print(f"\n{Fore.GREEN}[2/3] Trying wordlist attack...")
-            wordlist_data = load_wordlist(wordlist)
-            wordlist_result = self.cracker.dictionary_attack(
-                target_hash, wordlist_data, hash_type, desc="Wordlist"
+            for word in WordlistSource(wordlist):
+                yield word.decode('utf-8', 'surrogateescape')
+        rule_words = WordlistSource(wordlist) if rules and wordlist else None
+        yield from self.cracker.rule_candidates(rule_words, rules)
+    
+    def crack_slow(self, target_hashes, hash_type='auto', wordlist=None, max_workers=4, rules=None, deadline=None):
+        """Cost-scheduled dictionary attack on salted slow hashes; returns {hash: result}"""
+        targets = [(target_hash, self.resolve_hash_type(target_hash, hash_type)) for target_hash in target_hashes]
+        print(f"\n{Fore.GREEN}Trying {len(targets)} salted hash(es) with cost-aware scheduling...")
+        scheduler = SlowHashScheduler(max_workers, deadline=deadline)
+        metrics = active()
+        if metrics is None:
+            return scheduler.run(targets, self.slow_candidates(wordlist, rules), desc="Slow hashes")
+        started = time.perf_counter()
+        results = scheduler.run(targets, self.slow_candidates(wordlist, rules), desc="Slow hashes")
+        batch = CrackResults()
+        for result in results.values():
+            batch.add_result(result)
+        batch.candidates = max((result['attempts'] for result in results.values()), default=0)
+        batch.hashes_computed = batch.total_attempts
+        metrics.record_attack('slow', batch, time.perf_counter() - started)
+        return results
+    
+    def crack_mask(self, target_hash, mask, hash_type='auto', max_workers=4, start=0, custom_charsets=None,
+                   resume=None, max_seconds=None):
+        """Exhaustive mask attack, optionally resumed from a keyspace index.
+        
+        ``max_seconds`` stops the attack uncracked once the time budget is
+        spent, keeping the checkpoint so it can be resumed.
+        """
+        keyspace = MaskKeyspace(mask, custom_charsets)
+        deadline = Deadline(max_seconds)
+        if resume:
+            start = resume['position']
+        
+        print(f"\n{Fore.CYAN}🔓 Starting Mask Attack")
+        print(f"{Fore.WHITE}Target Hash: {Fore.YELLOW}{target_hash}")
+        print(f"{Fore.WHITE}Mask: {Fore.YELLOW}{mask} ({len(keyspace):,} candidates, starting at {start:,})")
+        print(f"{Fore.WHITE}Workers: {Fore.YELLOW}{max_workers}")
+        print(f"{Fore.CYAN}{'='*50}")
+        
+        start_time = time.time()
+        algorithm = self.resolve_hash_type(target_hash, hash_type)
+        
+        if self.potfile is not None:
+            plaintext = self.potfile.lookup(algorithm, target_hash)
+            if plaintext is not None:
+                result = CrackResult(cracked=True, password=plaintext, attempts=0,
+                                     time=time.time() - start_time, method='potfile')
+                self.display_result(result, result['time'])
+                self._finish_job()
+                return result
+        
+        self._start_job({'mode': 'mask', 'hash': target_hash, 'type': hash_type, 'mask': mask,
+                         'custom_charsets': custom_charsets, 'workers': max_workers}, resume)
+        progress = self._progress('mask', start)
+        if max_workers > 1:
+            from utils.parallel import ParallelCracker
+            attack = lambda: ParallelCracker(max_workers, deadline).mask_attack(target_hash, mask, hash_type,
+                                                                                custom_charsets, start,
+                                                                                progress=progress)
+        else:
+            attack = lambda: self.cracker.mask_attack(target_hash, keyspace, hash_type, start, progress=progress,
+                                                      deadline=deadline)
+        result = self._measured('mask', attack, keyspace.iter_range(start), algorithm, (bytes.fromhex(target_hash),))
+        
+        self.display_result(result, time.time() - start_time)
+        
+        if result['cracked'] and self.potfile is not None:
+            self.potfile.add(algorithm, target_hash, result['password'])
+        
+        self._finish_job(deadline)
+        return result
+    
+    def crack_hash_file(self, hash_file, hash_type='auto', wordlist=None, rules=None, resume=None, max_workers=4,
+                        max_seconds=None):
+        """Crack every hash in a file, hashing each candidate once per algorithm.
+        
+        Strategies run in order of expected hits per second across the open
+        targets. Checkpoints record the open targets and the results cracked
+        so far, so ``resume`` continues with only the targets that were still
+        open. ``max_seconds`` stops the run with partial results.
+        """
+        targets = HashTargets.from_file(hash_file, hash_type)
+        target_hashes = list(targets)
+        
+        print(f"\n{Fore.CYAN}🔓 Starting Batch Hash Cracking")
+        print(f"{Fore.WHITE}Hash File: {Fore.YELLOW}{hash_file}")
+        self.display_ingest(targets)
+        print(f"{Fore.CYAN}{'='*50}")
+        
+        start_time = time.time()
+        deadline = Deadline(max_seconds)
+        
+        final = {}
+        # Salted slow hashes are cracked separately, after the cheap unsalted ones
+        slow = targets.slow()
+        pending = targets.fast()
+        
+        if resume:
+            for result in resume['cracked']:
+                final[result['hash']] = result
+            open_targets = set(resume['open_targets'])
+            pending = [target_hash for target_hash in pending if target_hash in open_targets]
+            slow = [target_hash for target_hash in slow if target_hash not in final]
+        
+        # Skip targets the potfile already resolves
+        if self.potfile is not None:
+            known = self.potfile.lookup_many(
+                (target_hash, targets.algorithm(target_hash)) for target_hash in pending
             )
+            known.update(self.potfile.lookup_many(
+                (target_hash, targets.algorithm(target_hash)) for target_hash in slow
+            ))
+            for target_hash, plaintext in known.items():
+                final[target_hash] = self.cracker._batch_result(
+                    target_hash, targets.algorithm(target_hash), plaintext, 0, start_time, 'potfile'
+                )
+            pending = [target_hash for target_hash in pending if target_hash not in known]
+            slow = [target_hash for target_hash in slow if target_hash not in known]
+            if known:
+                print(f"{Fore.WHITE}Already in potfile: {Fore.GREEN}{len(known)}")
+        
+        self._start_job({'mode': 'hash_file', 'hash_file': hash_file, 'type': hash_type, 'wordlist': wordlist,
+                         'rules': rules, 'workers': max_workers}, resume)
+        
+        # Wordlist-driven strategies resume from the byte offset saved for them
+        starts = {}
+        for strategy in ('wordlist', 'rules'):
+            starts[strategy] = resume['position'] if resume and resume['strategy'] == strategy else 0
+        strategies = {'common': ("Common passwords", extended_common_passwords, 'dictionary')}
+        if wordlist:
+            strategies['wordlist'] = ("Wordlist", WordlistSource(wordlist, start=starts['wordlist']), 'dictionary')
+        # Chunked like the wordlist, so each chunk end is a resume offset
+        rule_words = WordlistSource(wordlist, start=starts['rules']) if rules and wordlist else None
+        strategies['rules'] = ("Rule-based", self.cracker.rule_candidates(rule_words, rules), 'rule-based')
+        order = self._schedule(strategies, wordlist, rules, max(len(pending), 1), resume) if pending else []
+        
+        for step, strategy in enumerate(order, 1):
+            if not pending or deadline.expired():
+                break
+            desc, words, method = strategies[strategy]
+            algorithm = targets.algorithm(pending[0])
+            print(f"\n{Fore.GREEN}[{step}/{len(order)}] {desc} against {len(pending)} hashes...")
+            
+            save_progress = None
+            if self.checkpoint is not None:
+                resolved = [result for result in final.values() if result['cracked']]
+                position = starts['wordlist'] if strategy == 'wordlist' else 0
+                if strategy == 'rules' and rule_words is not None:
+                    position = starts['rules']
+                self.checkpoint.update(strategy=strategy, position=position, open_targets=pending, cracked=resolved)
+                
+                def checkpoint_progress(offset, cracked, strategy=strategy, previous=resolved, pending=pending):
+                    # Resolved lazily: only built when a checkpoint is actually written
+                    def open_targets():
+                        found = {result['hash'] for result in cracked()}
+                        return [target_hash for target_hash in pending if target_hash not in found]
+                    self.checkpoint.update(strategy=strategy, position=offset, open_targets=open_targets,
+                                           cracked=lambda: previous + cracked())
+                save_progress = checkpoint_progress
             
-            if wordlist_result['cracked']:
-                self.display_result(wordlist_result, time.time() - start_time)
-                return wordlist_result
+            batch = self._measured(strategy, lambda: self.cracker.batch_dictionary_attack(
+                targets.subset(pending), deadline.limit(words), desc=desc, method=method, progress=save_progress
+            ), words, algorithm, lambda: targets.subset(pending).buckets().get(algorithm, {}))
+            for result in batch.results:
+                previous = final.get(result['hash'])
+                if previous:
+                    result['attempts'] += previous['attempts']
+                final[result['hash']] = result
+            pending = [result['hash'] for result in batch.results if not result['cracked']]
+            
+            if self.potfile is not None:
+                self.potfile.add_many((result['hash_type'], result['hash'], result['password'])
+                                      for result in batch.results if result['cracked'])
         
-        # Strategy 3: Advanced rules
-        print(f"\n{Fore.GREEN}[3/3] Trying rule-based attacks...")
-        rule_result = self.cracker.rule_based_attack(target_hash, hash_type)
+        # Targets the time budget left untried
+        for target_hash in pending:
+            if target_hash not in final:
+                final[target_hash] = self.cracker._batch_result(
+                    target_hash, targets.algorithm(target_hash), None, 0, start_time, 'dictionary'
+                )
         
-        elapsed_time = time.time() - start_time
-        self.display_result(rule_result, elapsed_time)
+        if slow:
+            slow_results = self.crack_slow(slow, hash_type, wordlist, max_workers, rules, deadline)
+            final.update(slow_results)
+            if self.potfile is not None:
+                self.potfile.add_many((result['hash_type'], result['hash'], result['password'])
+                                      for result in slow_results.values() if result['cracked'])
         
-        if not rule_result['cracked']:
-            print(f"\n{Fore.RED}❌ Hash could not be cracked with available methods")
-            print(f"{Fore.YELLOW}💡 Try with a larger wordlist or different attack type")
+        self.results = CrackResults()
+        for target_hash in target_hashes:
+            self.results.add_result(final[target_hash])
+        
+        self.display_batch_results(self.results, time.time() - start_time)
+        self._finish_job(deadline)
+        return self.results
+    
+    def crack_store(self, store_path, wordlist=None, rules=None, max_workers=4, max_seconds=None):
+        """Crack the targets of a store directory written by build_store (--build-store).
         
-        return rule_result
+        The digests stay memory-mapped instead of being loaded, so dumps far
+        larger than a hash file run fit; results (and the display) hold only
+        the cracked targets. With several workers the wordlist strategies are
+        sharded across the process pool, every worker mapping the same store.
+        Store runs are not checkpointed; new cracks go to the potfile, if any.
+        """
+        from utils.targetstore import TargetStore
+        
+        with TargetStore(store_path) as store:
+            print(f"\n{Fore.CYAN}🔓 Starting Target Store Cracking")
+            print(f"{Fore.WHITE}Store: {Fore.YELLOW}{store_path}{Fore.WHITE}  Targets: {Fore.YELLOW}{len(store):,}")
+            for algorithm, count in store.counts().items():
+                print(f"  {algorithm}: {Fore.CYAN}{count:,}")
+            print(f"{Fore.CYAN}{'='*50}")
+            
+            start_time = time.time()
+            deadline = Deadline(max_seconds)
+            cracked = set()
+            parallel = None
+            if max_workers > 1 and wordlist:
+                from utils.parallel import ParallelCracker
+                parallel = ParallelCracker(max_workers, deadline)
+            
+            def wordlist_attack():
+                if parallel is not None:
+                    return parallel.store_attack(store_path, wordlist, desc="Wordlist", cracked=cracked)
+                return self.cracker.store_attack(store, deadline.limit(WordlistSource(wordlist)), "Wordlist",
+                                                 cracked=cracked)
+            
+            def rule_attack():
+                if parallel is not None and rules:
+                    return parallel.store_attack(store_path, wordlist, rules, desc="Rule-based", cracked=cracked)
+                words = WordlistSource(wordlist) if rules and wordlist else None
+                return self.cracker.store_attack(store, deadline.limit(self.cracker.rule_candidates(words, rules)),
+                                                 "Rule-based", 'rule-based', cracked=cracked)
+            
+            attacks = {'common': ("Common passwords", lambda: self.cracker.store_attack(
+                store, deadline.limit(extended_common_passwords), "Common passwords", cracked=cracked))}
+            if wordlist:
+                attacks['wordlist'] = ("Wordlist", wordlist_attack)
+            attacks['rules'] = ("Rule-based", rule_attack)
+            order = self._plan(attacks, wordlist, rules, len(store))
+            
+            self.results = CrackResults()
+            for step, strategy in enumerate(order, 1):
+                if deadline.expired() or len(cracked) == len(store):
+                    break
+                desc, attack = attacks[strategy]
+                print(f"\n{Fore.GREEN}[{step}/{len(order)}] {desc} against {len(store) - len(cracked):,} hashes...")
+                batch = self._measured(strategy, attack)
+                for result in batch.results:
+                    self.results.add_result(result)
+                if self.potfile is not None:
+                    self.potfile.add_many((result['hash_type'], result['hash'], result['password'])
+                                          for result in batch.results)
+            
+            elapsed_time = time.time() - start_time
+            print(f"\n{Fore.CYAN}{'='*50}")
+            for result in self.results.results:
+                print(f"{Fore.GREEN}✅ {result['hash']} ({result['hash_type']}): {result['password']}")
+            print(f"\n{Fore.WHITE}Cracked: {Fore.GREEN}{len(cracked):,}/{len(store):,} "
+                  f"({100 * len(cracked) / max(len(store), 1):.1f}%)")
+            print(f"{Fore.WHITE}Time: {Fore.YELLOW}{elapsed_time:.2f} seconds")
+        
+        self.stats.save()
+        if deadline.expired():
+            print(f"\n{Fore.YELLOW}⏱️  Time budget reached: results are partial")
+        return self.results
+    
+    def display_ingest(self, targets):
+        """Summarise an ingested hash file, including the first malformed lines"""
+        print(f"{Fore.WHITE}Lines: {Fore.YELLOW}{targets.lines:,}{Fore.WHITE}  "
+              f"Targets: {Fore.YELLOW}{len(targets):,}{Fore.WHITE}  "
+              f"Duplicates: {Fore.YELLOW}{targets.duplicates:,}")
+        for algorithm, count in targets.counts().items():
+            print(f"  {algorithm}: {Fore.CYAN}{count:,}")
+        if targets.malformed:
+            print(f"{Fore.YELLOW}⚠️  Skipped {targets.malformed:,} malformed lines:")
+            for line_number, reason, line in targets.errors:
+                print(f"{Fore.YELLOW}  line {line_number}: {reason}: {line[:60]}")
+            if targets.malformed > len(targets.errors):
+                print(f"{Fore.YELLOW}  ... and {targets.malformed - len(targets.errors):,} more")
+    
+    def display_batch_results(self, results, elapsed_time):
+        """Display per-target batch cracking results"""
+        print(f"\n{Fore.CYAN}{'='*50}")
+        for result in results.results:
+            if result['cracked']:
+                print(f"{Fore.GREEN}✅ {result['hash']} ({result['hash_type']}): {result['password']}")
+            else:
+                print(f"{Fore.RED}❌ {result['hash']} ({result['hash_type']})")
+        print(f"\n{Fore.WHITE}Cracked: {Fore.GREEN}{results.successful_cracks}/{len(results.results)} "
+              f"({results.get_success_rate():.1f}%)")
+        for algorithm, totals in results.by_algorithm().items():
+            print(f"  {algorithm}: {Fore.CYAN}{totals['cracked']}/{totals['targets']}")
+        print(f"{Fore.WHITE}Time: {Fore.YELLOW}{elapsed_time:.2f} seconds")
     
     def display_result(self, result, elapsed_time):
         """Display cracking results"""
@@ -76,53 +579,195 @@ class AdvancedHashCracker:
             print(f"{Fore.WHITE}Time: {Fore.YELLOW}{elapsed_time:.2f} seconds")
             print(f"{Fore.WHITE}Attempts: {Fore.CYAN}{result['attempts']}")
 
-def benchmark_cracking_speed():
-    """Benchmark hash cracking performance"""
+def benchmark_cracking_speed(output=None, baseline=None, quick=False, scaling=True):
+    """Run the benchmark suite, print a summary and optionally save/compare JSON reports"""
     print(f"\n{Fore.CYAN}🧪 Performance Benchmark")
     print(f"{Fore.CYAN}{'='*40}")
     
-    test_passwords = ['password123', 'SecurePass!2024', 'test']
-    hash_types = ['md5', 'sha1', 'sha256']
+    from utils.benchmark import run_benchmarks, save_report, load_report, compare_reports
     
-    cracker = HashCracker()
+    report = run_benchmarks(quick=quick, scaling=scaling)
     
-    for hash_type in hash_types:
-        print(f"\n{Fore.WHITE}Benchmarking {hash_type.upper()}...")
-        
-        for password in test_passwords:
-            hash_val = cracker.hash_password(password, hash_type)
-            
-            start_time = time.time()
-            attempts = 0
-            max_attempts = 10000
-            
-            # Benchmark speed
-            for test_pass in ['password', '123456', 'test', 'admin']:
-                attempts += 1
-                if cracker.verify_hash(test_pass, hash_val, hash_type):
-                    break
-                if attempts >= max_attempts:
-                    break
-            
-            end_time = time.time()
-            hashes_per_second = attempts / (end_time - start_time) if attempts > 0 else 0
-            
-            print(f"  {password}: {Fore.YELLOW}{hashes_per_second:,.0f} hashes/second")
+    print(f"\n{Fore.WHITE}Raw hash throughput (median, hot path vs verify_hash):")
+    for algorithm, stats in report['hash_throughput'].items():
+        legacy = report['verify_hash'][algorithm]
+        print(f"  {algorithm.upper()}: {Fore.YELLOW}{stats['ops_per_second']:,.0f} hashes/second "
+              f"{Fore.GREEN}({stats['ops_per_second'] / legacy['ops_per_second']:.2f}x verify_hash)")
+    
+    print(f"\n{Fore.WHITE}dictionary_attack throughput:")
+    for size, stats in report['dictionary_attack'].items():
+        print(f"  {int(size):,} words: {Fore.YELLOW}{stats['ops_per_second']:,.0f} words/second "
+              f"(p90 {stats['p90_ns']:.0f} ns/word)")
+    
+    stats = report['rule_based_attack']
+    print(f"\n{Fore.WHITE}rule_based_attack: {Fore.YELLOW}{stats['ops_per_second']:,.0f} candidates/second")
+    
+    print(f"\n{Fore.WHITE}Scoring latency per password:")
+    for name, stats in report['scoring'].items():
+        print(f"  {name}: {Fore.YELLOW}{stats['median_ns'] / 1000:.1f} µs "
+              f"(p99 {stats['p99_ns'] / 1000:.1f} µs)")
+    
+    progress_cost = report['progress']
+    print(f"\n{Fore.WHITE}Progress bars: {Fore.YELLOW}{progress_cost['overhead_pct']:+.1f}% "
+          f"{Fore.WHITE}dictionary_attack time (tqdm.update per call: "
+          f"{progress_cost['tqdm_update']['median_ns']:.0f} ns)")
+    
+    print(f"\n{Fore.WHITE}Startup (import time):")
+    for module, stats in report['startup'].items():
+        print(f"  {module}: {Fore.YELLOW}{stats['median_ns'] / 1e6:.1f} ms")
+    
+    if 'scaling' in report:
+        print(f"\n{Fore.WHITE}Multi-core scaling (wordlist attack):")
+        for workers, stats in report['scaling'].items():
+            print(f"  {workers} workers: {Fore.YELLOW}{stats['ops_per_second']:,.0f} words/second "
+                  f"{Fore.GREEN}({stats['speedup']:.2f}x)")
+    if 'audit_scaling' in report:
+        print(f"\n{Fore.WHITE}Multi-core scaling (batch scoring):")
+        for workers, stats in report['audit_scaling'].items():
+            print(f"  {workers} workers: {Fore.YELLOW}{stats['ops_per_second']:,.0f} passwords/second "
+                  f"{Fore.GREEN}({stats['speedup']:.2f}x)")
+    
+    if output:
+        save_report(report, output)
+        print(f"\n{Fore.GREEN}✅ Benchmark report saved: {output}")
+    
+    if baseline:
+        regressions = compare_reports(load_report(baseline), report)
+        if regressions:
+            print(f"\n{Fore.RED}⚠️  Regressions vs {baseline}:")
+            for name, before, after, change in regressions:
+                print(f"  {Fore.RED}{name}: {before:,.0f} -> {after:,.0f} ns/op (+{change:.0%})")
+        else:
+            print(f"\n{Fore.GREEN}✅ No regressions vs {baseline}")
+    
+    return report
+
+def build_target_store(hash_file, path, hash_type='auto'):
+    """Build a target store from a hash file and print what went into it"""
+    from utils.targetstore import build_store
+    
+    print(f"\n{Fore.CYAN}📦 Building target store {path}")
+    start_time = time.time()
+    stats = build_store(hash_file, path, hash_type)
+    print(f"{Fore.WHITE}Lines: {Fore.YELLOW}{stats['lines']:,}{Fore.WHITE}  "
+          f"Targets: {Fore.YELLOW}{sum(stats['targets'].values()):,}")
+    for algorithm, count in stats['targets'].items():
+        print(f"  {algorithm}: {Fore.CYAN}{count:,}")
+    if stats['malformed']:
+        print(f"{Fore.YELLOW}⚠️  Skipped {stats['malformed']:,} malformed lines")
+    if stats['salted']:
+        print(f"{Fore.YELLOW}⚠️  Skipped {stats['salted']:,} salted hashes (crack them with --hash-file)")
+    print(f"{Fore.WHITE}Time: {Fore.YELLOW}{time.time() - start_time:.2f} seconds")
+    return stats
+
+def export_results(results, path, output_format=None):
+    """Write batch results to a CSV/JSONL file"""
+    rows = results.export(path, output_format)
+    print(f"{Fore.GREEN}✅ Exported {rows} results to {path}")
 
 def main():
     parser = argparse.ArgumentParser(description='Advanced Hash Cracker')
-    parser.add_argument('hash', help='Hash to crack')
-    parser.add_argument('--type', default='auto', help='Hash type (md5, sha1, sha256, auto)')
+    parser.add_argument('hash', nargs='?', help='Hash to crack')
+    parser.add_argument('--hash-file', help='File of hashes to crack in batch mode')
+    parser.add_argument('--type', default='auto',
+                        help='Hash type (md5, sha1, sha256, sha512, bcrypt, pbkdf2_sha256, sha512_crypt, ..., auto)')
+    parser.add_argument('--build-store', metavar='DIR',
+                        help='Write the --hash-file targets to a compact target store directory and exit')
+    parser.add_argument('--store', metavar='DIR', help='Crack the targets of a store built with --build-store')
     parser.add_argument('--wordlist', help='Wordlist file path')
+    parser.add_argument('--output', help='Export --hash-file results to this CSV or JSONL file')
+    parser.add_argument('--format', choices=['jsonl', 'csv'], help='Export format (default: from the --output extension)')
+    parser.add_argument('--rules', help='Mangling rules file (applied to --wordlist, else to common base words)')
+    parser.add_argument('--mask', help="Brute-force mask, e.g. '?u?l?l?l?d?d'")
+    parser.add_argument('--mask-start', type=int, default=0, help='Keyspace index to start/resume the mask from')
+    for slot in '1234':
+        parser.add_argument(f'-{slot}', f'--custom-charset{slot}', dest=f'charset{slot}',
+                            help=f'Custom charset for ?{slot} in masks')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help='Worker processes for wordlist and rule attacks (1 = single process)')
+    parser.add_argument('--potfile', help=f'Cracked-hash cache to read and write, e.g. {DEFAULT_POTFILE} '
+                                          '(off by default: it stores cracked plaintexts)')
+    parser.add_argument('--no-potfile', action='store_true', help=argparse.SUPPRESS)  # the default; kept for old scripts
+    parser.add_argument('--checkpoint', default=DEFAULT_CHECKPOINT, help='Checkpoint file for resuming long jobs')
+    parser.add_argument('--checkpoint-interval', type=float, default=DEFAULT_INTERVAL,
+                        help='Seconds between checkpoint writes')
+    parser.add_argument('--no-checkpoint', action='store_true', help='Do not write checkpoints')
+    parser.add_argument('--resume', action='store_true', help='Continue the job saved in the checkpoint file')
+    parser.add_argument('--max-seconds', type=float,
+                        help='Time budget; stops with partial results (and a checkpoint to resume from)')
+    parser.add_argument('--stats', help=f'Strategy hit-rate history used to order attacks, e.g. {DEFAULT_STATS} '
+                                        '(off by default)')
+    parser.add_argument('--no-stats', action='store_true', help=argparse.SUPPRESS)  # the default; kept for old scripts
     parser.add_argument('--benchmark', action='store_true', help='Run benchmarks')
+    parser.add_argument('--benchmark-output', help='Write benchmark results to a JSON file')
+    parser.add_argument('--benchmark-baseline', help='Compare benchmark results against a saved JSON report')
+    parser.add_argument('--quick', action='store_true', help='Run a reduced benchmark')
+    parser.add_argument('--no-progress', action='store_true', help='Disable progress bars (headless runs)')
+    parser.add_argument('--profile', action='store_true', help='Record per-strategy counters and worker utilization')
+    parser.add_argument('--profile-output', default=DEFAULT_METRICS, help='Metrics file written by --profile (JSON)')
+    parser.add_argument('--profile-dump', help='Also write a cProfile (pstats) dump to this file')
     
     args = parser.parse_args()
     
-    if args.benchmark:
-        benchmark_cracking_speed()
-    else:
-        cracker = AdvancedHashCracker()
-        cracker.crack_hash(args.hash, args.type, args.wordlist)
+    if args.no_progress:
+        set_enabled(False)
+    potfile = None if args.no_potfile else args.potfile
+    checkpoint = None if args.no_checkpoint else Checkpoint(args.checkpoint, args.checkpoint_interval)
+    stats = None if args.no_stats else args.stats
+    
+    with profiled(args.profile_output if args.profile else None, args.profile_dump):
+        if args.benchmark:
+            benchmark_cracking_speed(args.benchmark_output, args.benchmark_baseline, args.quick)
+        elif args.resume:
+            resume = Checkpoint.load(args.checkpoint)
+            if resume is None:
+                parser.error(f'no checkpoint to resume: {args.checkpoint}')
+            job = resume['job']
+            cracker = AdvancedHashCracker(potfile, checkpoint or Checkpoint(args.checkpoint, args.checkpoint_interval),
+                                          stats)
+            if job['mode'] == 'mask':
+                cracker.crack_mask(job['hash'], job['mask'], job['type'], job['workers'],
+                                   custom_charsets=job['custom_charsets'], resume=resume, max_seconds=args.max_seconds)
+            elif job['mode'] == 'hash_file':
+                results = cracker.crack_hash_file(job['hash_file'], job['type'], job['wordlist'], job['rules'],
+                                                  resume=resume, max_workers=job.get('workers', 4),
+                                                  max_seconds=args.max_seconds)
+                if args.output:
+                    export_results(results, args.output, args.format)
+            else:
+                cracker.crack_hash(job['hash'], job['type'], job['wordlist'], max_workers=job['workers'],
+                                   rules=job['rules'], resume=resume, max_seconds=args.max_seconds)
+        elif args.build_store:
+            if not args.hash_file:
+                parser.error('--build-store needs --hash-file')
+            try:
+                build_target_store(args.hash_file, args.build_store, args.type)
+            except ValueError as error:
+                parser.error(str(error))
+        elif args.store:
+            cracker = AdvancedHashCracker(potfile, None, stats)
+            results = cracker.crack_store(args.store, args.wordlist, args.rules, args.workers, args.max_seconds)
+            if args.output:
+                export_results(results, args.output, args.format)
+        elif args.mask:
+            if not args.hash:
+                parser.error('--mask needs a target hash')
+            custom_charsets = {slot: getattr(args, f'charset{slot}') for slot in '1234' if getattr(args, f'charset{slot}')}
+            cracker = AdvancedHashCracker(potfile, checkpoint, stats)
+            cracker.crack_mask(args.hash, args.mask, args.type, args.workers, args.mask_start, custom_charsets,
+                               max_seconds=args.max_seconds)
+        elif args.hash_file:
+            cracker = AdvancedHashCracker(potfile, checkpoint, stats)
+            results = cracker.crack_hash_file(args.hash_file, args.type, args.wordlist, args.rules,
+                                              max_workers=args.workers, max_seconds=args.max_seconds)
+            if args.output:
+                export_results(results, args.output, args.format)
+        elif args.hash:
+            cracker = AdvancedHashCracker(potfile, checkpoint, stats)
+            cracker.crack_hash(args.hash, args.type, args.wordlist, max_workers=args.workers, rules=args.rules,
+                               max_seconds=args.max_seconds)
+        else:
+            parser.error('a hash or --hash-file is required')
 
 if __name__ == "__main__":
     main()
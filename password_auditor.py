@@ -4,95 +4,113 @@ Password Security Auditor - Advanced Version
 Comprehensive tool for password strength analysis and hash cracking
 """
 
-import hashlib
-import math
-import string
-import json
 import time
 from datetime import datetime
 from colorama import Fore, Style, init
 import argparse
+import contextlib
 import os
-from tqdm import tqdm
+import sys
 
-from utils.hashing import compute_hashes, hash_password, hash_types
+# Cracking (utils.cracker, hash_cracker), hashing and index modules are
+# imported where they are used, so scoring pays no tqdm/multiprocessing cost
 from utils.wordlists import load_wordlist, common_passwords, extended_common_passwords
-from utils.cracker import HashCracker, CrackResults
-from hash_cracker import benchmark_cracking_speed
+from utils.patterns import pattern_penalty, scan_patterns
+from utils.scoring import (CHUNK_SIZE, LOG2_POOL, class_counts, counts_mask, advanced_patterns, strength_label,
+                           score_chunk, score_passwords, read_passwords, write_results)
+from utils.history import AuditHistory, audit_record
+from utils.metrics import DEFAULT_METRICS, active, profiled
 
 # Initialize colorama for cross-platform colored output
 init(autoreset=True)
 
+STRENGTH_COLORS = {
+    "Very Weak": Fore.RED,
+    "Weak": Fore.RED,
+    "Moderate": Fore.YELLOW,
+    "Strong": Fore.GREEN,
+    "Very Strong": Fore.CYAN
+}
+
 class AdvancedPasswordAuditor:
-    def __init__(self):
-        self.common_passwords = extended_common_passwords
-        self.cracker = HashCracker()
-        self.audit_history = []
+    # Looked up through the instance so instrument() can time them
+    scan_patterns = staticmethod(scan_patterns)
+    score_chunk = staticmethod(score_chunk)
+    
+    def __init__(self, breach_index=None, history_file=None, cache=None):
+        # A breached-password index file extends the built-in common-password list
+        self.breach_index = breach_index
+        if breach_index:
+            from utils.breached import CommonPasswords
+            self.common_passwords = CommonPasswords(breach_index)
+        else:
+            self.common_passwords = extended_common_passwords
+        self._cracker = None
+        # Optional ScoreCache: batch scoring skips passwords it has already scored
+        self.cache = cache
+        # Running summary plus the newest records; every record goes to history_file if given
+        self.audit_history = AuditHistory(history_file)
+        metrics = active()
+        if metrics is not None:
+            self.instrument(metrics)
+    
+    def instrument(self, metrics):
+        """Record per-call latency histograms for the scoring stages.
+        
+        Interactive analysis goes through calculate_entropy; batch scoring
+        through score_chunk (one sample per chunk, plus an audit.passwords
+        count). Both use the timed pattern scan and common-password check.
+        """
+        self.calculate_entropy = metrics.timed('audit.calculate_entropy', self.calculate_entropy)
+        self.scan_patterns = metrics.timed('audit.pattern_detection', self.scan_patterns)
+        self.common_passwords = metrics.timed_container('audit.common_check', self.common_passwords)
+        timed_chunk = metrics.timed('audit.score_chunk', self.score_chunk)
+        
+        def score_chunk(passwords, *args):
+            metrics.count('audit.passwords', len(passwords))
+            return timed_chunk(passwords, *args)
+        self.score_chunk = score_chunk
     
+    @property
+    def cracker(self):
+        """HashCracker, created on first use"""
+        if self._cracker is None:
+            from utils.cracker import HashCracker
+            self._cracker = HashCracker()
+        return self._cracker
     
-    def calculate_entropy(self, password):
-        """Calculate password entropy in bits with advanced analysis"""
+    
+    def calculate_entropy(self, password, penalty=None):
+        """Calculate password entropy in bits with advanced analysis.
+        
+        ``penalty`` may be passed in when the pattern scan has already run.
+        """
         if not password:
             return 0, 0, 0
             
-        # Advanced character pool analysis
-        char_categories = {
-            'lower': len([c for c in password if c in string.ascii_lowercase]),
-            'upper': len([c for c in password if c in string.ascii_uppercase]),
-            'digits': len([c for c in password if c in string.digits]),
-            'special': len([c for c in password if c in string.punctuation]),
-            'other': len([c for c in password if c not in string.printable])
-        }
-        
-        # Determine character pool size
-        pool_size = 0
-        if char_categories['lower'] > 0: pool_size += 26
-        if char_categories['upper'] > 0: pool_size += 26
-        if char_categories['digits'] > 0: pool_size += 10
-        if char_categories['special'] > 0: pool_size += 32
-        if char_categories['other'] > 0: pool_size += 50  # Unicode/etc
+        # Single-pass character class analysis
+        counts = class_counts(password)
+        lower, upper, digits, special, other = counts
+        char_categories = {'lower': lower, 'upper': upper, 'digits': digits, 'special': special, 'other': other}
         
-        # Calculate entropy
-        entropy = len(password) * math.log2(pool_size) if pool_size > 0 else 0
+        # Entropy from the pool size of the classes present
+        entropy = len(password) * LOG2_POOL[counts_mask(counts)]
         
         # Pattern detection penalty
-        pattern_penalty = self.detect_patterns(password)
-        adjusted_entropy = max(0, entropy - pattern_penalty)
+        if penalty is None:
+            penalty = self.detect_patterns(password)
+        adjusted_entropy = max(0, entropy - penalty)
         
         return adjusted_entropy, entropy, char_categories
     
     def detect_patterns(self, password):
         """Detect common patterns and apply entropy penalty"""
-        penalty = 0
-        
-        # Sequential characters
-        sequences = ['123', 'abc', 'qwe', 'asd', 'zxc', '987', '321']
-        for seq in sequences:
-            if seq in password.lower():
-                penalty += 10
-                
-        # Repeated characters
-        for char in set(password):
-            count = password.count(char)
-            if count > len(password) * 0.5:  # More than 50% same char
-                penalty += 15
-                
-        # Keyboard patterns
-        keyboard_rows = ['qwertyuiop', 'asdfghjkl', 'zxcvbnm']
-        for row in keyboard_rows:
-            for i in range(len(row) - 2):
-                if row[i:i+3] in password.lower():
-                    penalty += 8
-                    
-        return penalty
+        return pattern_penalty(password)
     
     def strength_rating(self, entropy):
         """Convert entropy to strength rating with color coding"""
-        if entropy < 28: return "Very Weak", Fore.RED
-        elif entropy < 36: return "Weak", Fore.RED
-        elif entropy < 60: return "Moderate", Fore.YELLOW
-        elif entropy < 128: return "Strong", Fore.GREEN
-        else: return "Very Strong", Fore.CYAN
+        strength = strength_label(entropy)
+        return strength, STRENGTH_COLORS[strength]
     
     def check_common_password(self, password):
         """Check if password is in common password lists"""
@@ -124,8 +142,9 @@ class AdvancedPasswordAuditor:
         print(f"{Fore.WHITE}Password: {Fore.YELLOW}{'*' * len(password)} (length: {len(password)})")
         print(f"{Fore.CYAN}{'-'*60}")
         
-        # Advanced analysis
-        entropy, raw_entropy, char_categories = self.calculate_entropy(password)
+        # Advanced analysis: one pattern scan feeds both the penalty and the report
+        penalty, patterns = self.scan_patterns(password)
+        entropy, raw_entropy, char_categories = self.calculate_entropy(password, penalty)
         strength, strength_color = self.strength_rating(entropy)
         is_common = self.check_common_password(password)
         crack_time, crack_color = self.time_to_crack_estimate(entropy)
@@ -147,13 +166,13 @@ class AdvancedPasswordAuditor:
                 print(f"  {category.title()}: {color}{count} ({percentage:.1f}%)")
         
         # Pattern detection
-        patterns = self.detect_advanced_patterns(password)
         if patterns:
             print(f"\n{Fore.RED}⚠️  Detected Patterns:")
             for pattern in patterns:
                 print(f"  {Fore.RED}❌ {pattern}")
         
         # Hash examples
+        from utils.hashing import compute_hashes
         hashes = compute_hashes(password)
         print(f"\n{Fore.WHITE}Hash Examples:")
         for algo, hash_val in list(hashes.items())[:3]:  # Show first 3
@@ -177,33 +196,66 @@ class AdvancedPasswordAuditor:
     
     def detect_advanced_patterns(self, password):
         """Detect advanced password patterns"""
-        patterns = []
-        lower_pass = password.lower()
+        return advanced_patterns(password)
+    
+    def score_batch(self, passwords, chunk_size=CHUNK_SIZE):
+        """Headless scoring: stream (index, result) pairs without printing, hashing or history"""
+        return score_passwords(passwords, self.common_passwords, chunk_size, self.scan_patterns, self.cache,
+                               self.score_chunk)
+    
+    def audit_file(self, input_path, output_path=None, output_format='jsonl', workers=1, ordered=True,
+                   record=True):
+        """Score a file of passwords (one per line) and write structured results.
         
-        # Common sequences
-        sequences = [
-            '123', '234', '345', '456', '567', '678', '789', '987', '876', '765',
-            'abc', 'bcd', 'cde', 'def', 'efg', 'fgh', 'ghi', 'hij', 'ijk', 'jkl',
-            'qwe', 'wer', 'ert', 'rty', 'tyu', 'yui', 'uio', 'iop', 'asd', 'sdf',
-            'dfg', 'fgh', 'ghj', 'hjk', 'jkl', 'zxc', 'xcv', 'cvb', 'vbn', 'bnm'
-        ]
+        With ``workers`` > 1 chunks are scored across a process pool (see
+        utils.auditpool); ``ordered=False`` writes them as they finish, each
+        row keeping its input id. ``record=False`` keeps a parallel run's
+        results out of the audit history, so workers only send back rows.
+        """
+        start_time = time.perf_counter()
         
-        for seq in sequences:
-            if seq in lower_pass:
-                patterns.append(f"Sequential pattern: '{seq}'")
-                break
+        with contextlib.ExitStack() as stack:
+            if input_path == '-':
+                source = sys.stdin
+            else:
+                source = stack.enter_context(open(input_path, 'r', encoding='utf-8', errors='replace'))
+            if output_path in (None, '-'):
+                sink = sys.stdout
+            else:
+                sink = stack.enter_context(open(output_path, 'w', encoding='utf-8', newline=''))
+            
+            if workers > 1:
+                rows = self._audit_parallel(read_passwords(source), sink, output_format, workers, ordered, record)
+            else:
+                results = self._recorded(self.score_batch(read_passwords(source)))
+                rows = write_results(results, sink, output_format)
         
-        # Repeated characters
-        for char in set(password):
-            if password.count(char) >= 3:
-                patterns.append(f"Repeated character: '{char}' {password.count(char)} times")
-                break
+        elapsed = time.perf_counter() - start_time
+        return rows, elapsed
+    
+    def _audit_parallel(self, passwords, sink, output_format, workers, ordered, record):
+        from utils.auditpool import ParallelScorer
+        cache_options = None
+        if self.cache is not None:
+            cache_options = self.cache.options()
+        scorer = ParallelScorer(workers, breach_index=self.breach_index, cache_options=cache_options)
         
-        # Date patterns (simple detection)
-        if any(year in password for year in ['1980', '1990', '1991', '1992', '2000', '2001', '2020', '2021', '2022', '2023']):
-            patterns.append("Contains common year")
-            
-        return patterns
+        def on_results(start, results):
+            for _ in self._recorded(enumerate(results, start)):
+                pass
+        
+        return scorer.write(passwords, sink, output_format, ordered, on_results if record else None)
+    
+    def _recorded(self, results):
+        """Pass (index, result) pairs through, adding each to the audit history"""
+        append = self.audit_history.append
+        timestamp = None
+        for index, result in results:
+            # Results are scored in chunks; one timestamp per chunk is precise enough
+            if timestamp is None or index % CHUNK_SIZE == 0:
+                timestamp = datetime.now().isoformat()
+            append(audit_record(result, timestamp))
+            yield index, result
     
     def get_strength_icon(self, strength):
         """Get icon for strength rating"""
@@ -263,28 +315,28 @@ class AdvancedPasswordAuditor:
         if not filename:
             filename = f"password_audit_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
         
-        report = {
-            'metadata': {
-                'generated_at': datetime.now().isoformat(),
-                'total_audits': len(self.audit_history),
-                'tool_version': '2.0.0'
-            },
-            'audits': self.audit_history,
-            'summary': {
-                'average_entropy': sum(audit['entropy'] for audit in self.audit_history) / len(self.audit_history),
-                'strong_passwords': sum(1 for audit in self.audit_history if audit['strength'] in ['Strong', 'Very Strong']),
-                'weak_passwords': sum(1 for audit in self.audit_history if audit['strength'] in ['Very Weak', 'Weak'])
-            }
-        }
-        
-        with open(filename, 'w') as f:
-            json.dump(report, f, indent=2)
+        # Summary comes from the history's running aggregates; only the newest records are included
+        self.audit_history.write_report(filename, {
+            'generated_at': datetime.now().isoformat(),
+            'tool_version': '2.0.0'
+        })
         
         print(f"\n{Fore.GREEN}✅ Audit report saved: {filename}")
 
 # Create an alias for backward compatibility if needed
 PasswordAuditor = AdvancedPasswordAuditor
 
+def report_scaling(input_path, breach_index=None):
+    """Print batch scoring throughput and speedup at several worker counts"""
+    from utils.benchmark import bench_audit_scaling
+    
+    print(f"{Fore.CYAN}📈 Batch scoring scaling ({input_path})", file=sys.stderr)
+    report = bench_audit_scaling(input_path, breach_index=breach_index)
+    for workers, stats in report.items():
+        print(f"  {workers} workers: {Fore.YELLOW}{stats['ops_per_second']:,.0f} passwords/second "
+              f"{Fore.GREEN}({stats['speedup']:.2f}x)", file=sys.stderr)
+    return report
+
 def main():
     parser = argparse.ArgumentParser(description='Advanced Password Security Auditor')
     parser.add_argument('password', nargs='?', help='Password to analyze')
@@ -292,36 +344,121 @@ def main():
     parser.add_argument('--wordlist', help='Custom wordlist file')
     parser.add_argument('--benchmark', action='store_true', help='Run performance benchmarks')
     parser.add_argument('--report', help='Generate audit report file')
+    parser.add_argument('--history', help='Append every audit record to this JSON Lines file')
+    parser.add_argument('--batch', help="Score a file of passwords, one per line ('-' for stdin)")
+    parser.add_argument('--output', help='Batch results file (default: stdout)')
+    parser.add_argument('--format', choices=['jsonl', 'csv'], default='jsonl', help='Batch output format')
+    parser.add_argument('--index', help='Breached-password index file (checked as common passwords)')
+    parser.add_argument('--build-index', metavar='WORDLIST', help='Build the --index file from a wordlist and exit')
+    parser.add_argument('--serve', action='store_true', help='Run the scoring service (HTTP on --host/--port or --socket)')
+    parser.add_argument('--host', default='127.0.0.1', help='Service listen address')
+    parser.add_argument('--port', type=int, default=8765, help='Service listen port')
+    parser.add_argument('--socket', help='Serve on this Unix socket path instead of TCP')
+    parser.add_argument('--workers', type=int, default=0,
+                        help='Scoring processes for --serve and --batch (0 = in-process)')
+    parser.add_argument('--unordered', action='store_true',
+                        help='Write --batch chunks as workers finish them (rows keep their input ids)')
+    parser.add_argument('--scaling', action='store_true',
+                        help='Measure --batch throughput at 1, 2, 4 and all cores, then exit')
+    parser.add_argument('--cache-size', type=int, default=0,
+                        help='Cache scores of up to this many distinct passwords (0 = off, unless --cache-file)')
+    parser.add_argument('--cache-ttl', type=float, help='Seconds before a cached score expires')
+    parser.add_argument('--cache-file', help='SQLite file sharing cached scores between processes and runs')
+    parser.add_argument('--cache-key-file',
+                        help='Key for --cache-file, kept apart from it (created if missing; '
+                             'default: the PASSWORD_RESILIENCE_CACHE_KEY variable)')
+    parser.add_argument('--profile', action='store_true', help='Record latency histograms of the scoring stages that run (pool workers included)')
+    parser.add_argument('--profile-output', default=DEFAULT_METRICS, help='Metrics file written by --profile (JSON)')
+    parser.add_argument('--profile-dump', help='Also write a cProfile (pstats) dump to this file')
     
     args = parser.parse_args()
     
-    auditor = AdvancedPasswordAuditor()
+    if args.build_index:
+        if not args.index:
+            parser.error('--build-index needs --index OUTPUT')
+        from utils.breached import build_password_index
+        start_time = time.perf_counter()
+        count = build_password_index(args.build_index, args.index)
+        print(f"{Fore.GREEN}✅ Indexed {count:,} distinct passwords into {args.index} "
+              f"in {time.perf_counter() - start_time:.2f} seconds")
+        return
+    
+    cache_options = None
+    if args.cache_size or args.cache_file:
+        from utils.scorecache import DEFAULT_SIZE, SECRET_ENV, load_secret
+        secret = None
+        if args.cache_file:
+            secret = load_secret(args.cache_key_file)
+            if secret is None:
+                parser.error(f'--cache-file needs --cache-key-file or {SECRET_ENV}')
+        cache_options = {'maxsize': args.cache_size or DEFAULT_SIZE, 'ttl': args.cache_ttl, 'path': args.cache_file,
+                         'secret': secret}
+    
+    if args.serve:
+        import asyncio
+        from utils.service import AuditService
+        service = AuditService(workers=args.workers, breach_index=args.index, cache=cache_options)
+        where = args.socket or f"http://{args.host}:{args.port}"
+        print(f"{Fore.GREEN}✅ Audit service listening on {where}", file=sys.stderr)
+        try:
+            asyncio.run(service.serve_forever(args.host, args.port, args.socket))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            service.close()
+        return
     
-    if args.benchmark:
-        benchmark_cracking_speed()
-    elif args.hash:
-        from hash_cracker import main as cracker_main
-        cracker_main()
-    elif args.password:
-        auditor.analyze_password(args.password)
-        if args.report:
-            auditor.generate_report(args.report)
-    else:
-        # Interactive mode
-        print(f"{Fore.CYAN}🔓 Advanced Password Security Auditor v2.0")
-        print(f"{Fore.WHITE}Enter a password to analyze (or 'quit' to exit):")
+    with profiled(args.profile_output if args.profile else None, args.profile_dump):
+        cache = None
+        if cache_options is not None:
+            from utils.scorecache import ScoreCache
+            cache = ScoreCache(namespace=args.index or '', **cache_options)
+        auditor = AdvancedPasswordAuditor(args.index, args.history, cache)
+    
+        if args.batch and args.scaling:
+            report_scaling(args.batch, args.index)
+        elif args.batch:
+            rows, elapsed = auditor.audit_file(args.batch, args.output, args.format, args.workers,
+                                               not args.unordered, bool(args.history or args.report))
+            print(f"{Fore.GREEN}✅ Scored {rows:,} passwords in {elapsed:.2f} seconds "
+                  f"({rows / elapsed if elapsed else 0:,.0f}/s)", file=sys.stderr)
+            if cache is not None and args.workers <= 1:
+                stats = cache.stats()
+                print(f"{Fore.WHITE}Score cache: {stats['hits'] + stats['disk_hits']:,} hits "
+                      f"({stats['disk_hits']:,} shared), {stats['misses']:,} misses, "
+                      f"{stats['hit_rate']:.1%} hit rate, {stats['evictions']:,} evictions", file=sys.stderr)
+            if args.report:
+                auditor.generate_report(args.report)
+        elif args.benchmark:
+            from hash_cracker import benchmark_cracking_speed
+            benchmark_cracking_speed()
+        elif args.hash:
+            from hash_cracker import main as cracker_main
+            cracker_main()
+        elif args.password:
+            auditor.analyze_password(args.password)
+            if args.report:
+                auditor.generate_report(args.report)
+        else:
+            # Interactive mode
+            print(f"{Fore.CYAN}🔓 Advanced Password Security Auditor v2.0")
+            print(f"{Fore.WHITE}Enter a password to analyze (or 'quit' to exit):")
         
-        while True:
-            try:
-                password = input(f"\n{Fore.GREEN}Password: {Style.RESET_ALL}")
-                if password.lower() in ['quit', 'exit', 'q']:
-                    if input(f"\n{Fore.YELLOW}Generate audit report? (y/n): ").lower() == 'y':
-                        auditor.generate_report()
+            while True:
+                try:
+                    password = input(f"\n{Fore.GREEN}Password: {Style.RESET_ALL}")
+                    if password.lower() in ['quit', 'exit', 'q']:
+                        if input(f"\n{Fore.YELLOW}Generate audit report? (y/n): ").lower() == 'y':
+                            auditor.generate_report()
+                        break
+                    auditor.analyze_password(password)
+                except KeyboardInterrupt:
+                    print(f"\n{Fore.YELLOW}Exiting...")
                     break
-                auditor.analyze_password(password)
-            except KeyboardInterrupt:
-                print(f"\n{Fore.YELLOW}Exiting...")
-                break
+    
+        auditor.audit_history.close()
+        if cache is not None:
+            cache.close()
 
 if __name__ == "__main__":
     main()
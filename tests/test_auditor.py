@@ -1,5 +1,8 @@
 """Tests for password auditor"""
 
+import math
+import random
+import string
 import unittest
 import sys
 import os
@@ -9,6 +12,32 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 from password_auditor import PasswordAuditor
 
+def legacy_entropy(password):
+    """Original multi-pass calculate_entropy/detect_patterns, kept as a reference"""
+    char_categories = {
+        'lower': len([c for c in password if c in string.ascii_lowercase]),
+        'upper': len([c for c in password if c in string.ascii_uppercase]),
+        'digits': len([c for c in password if c in string.digits]),
+        'special': len([c for c in password if c in string.punctuation]),
+        'other': len([c for c in password if c not in string.printable])
+    }
+    pool_size = sum(size for name, size in [('lower', 26), ('upper', 26), ('digits', 10),
+                                            ('special', 32), ('other', 50)] if char_categories[name])
+    entropy = len(password) * math.log2(pool_size) if pool_size > 0 else 0
+    
+    penalty = 0
+    for seq in ['123', 'abc', 'qwe', 'asd', 'zxc', '987', '321']:
+        if seq in password.lower():
+            penalty += 10
+    for char in set(password):
+        if password.count(char) > len(password) * 0.5:
+            penalty += 15
+    for row in ['qwertyuiop', 'asdfghjkl', 'zxcvbnm']:
+        for i in range(len(row) - 2):
+            if row[i:i+3] in password.lower():
+                penalty += 8
+    return max(0, entropy - penalty), entropy, char_categories
+
 class TestPasswordAuditor(unittest.TestCase):
     def setUp(self):
         self.auditor = PasswordAuditor()
@@ -22,6 +51,26 @@ class TestPasswordAuditor(unittest.TestCase):
         adjusted_entropy_weak, raw_entropy_weak, char_categories_weak = self.auditor.calculate_entropy("123")
         self.assertLess(adjusted_entropy_weak, 10)
     
+    def test_entropy_pinned_values(self):
+        pinned = {
+            "StrongPass123!": (81.76424392348693, 91.76424392348693),
+            "qwerty123": (0, 46.529325012980806),
+            "aaaaaaaa": (22.603517745128734, 37.603517745128734),
+            "Zürich €2023": (81.68825906469124, 81.68825906469124),
+            "tab\there": (37.603517745128734, 37.603517745128734),
+        }
+        for password, (adjusted, raw) in pinned.items():
+            entropy, raw_entropy, _ = self.auditor.calculate_entropy(password)
+            self.assertAlmostEqual(entropy, adjusted, msg=password)
+            self.assertAlmostEqual(raw_entropy, raw, msg=password)
+    
+    def test_entropy_matches_legacy_implementation(self):
+        rng = random.Random(1234)
+        alphabet = string.printable + 'qwertyasdzxc123987' * 4 + 'éß€\x00'
+        for _ in range(2000):
+            password = ''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 20)))
+            self.assertEqual(self.auditor.calculate_entropy(password), legacy_entropy(password), msg=repr(password))
+    
     def test_common_password(self):
         self.assertTrue(self.auditor.check_common_password("password"))
         self.assertFalse(self.auditor.check_common_password("MyUniquePass123!"))
@@ -34,5 +83,17 @@ class TestPasswordAuditor(unittest.TestCase):
         rating, color = self.auditor.strength_rating(70)
         self.assertEqual(rating, "Strong")
 
+    def test_score_batch_matches_single_analysis(self):
+        passwords = ["StrongPass123!", "123", "password", "", "aaaa1990", "Zürich€2023"]
+        results = list(self.auditor.score_batch(passwords, chunk_size=4))
+        self.assertEqual([index for index, _ in results], list(range(len(passwords))))
+        for password, (_, result) in zip(passwords, results):
+            entropy, raw_entropy, _ = self.auditor.calculate_entropy(password)
+            self.assertAlmostEqual(result['entropy'], entropy)
+            self.assertAlmostEqual(result['raw_entropy'], raw_entropy)
+            self.assertEqual(result['strength'], self.auditor.strength_rating(entropy)[0])
+            self.assertEqual(result['is_common'], self.auditor.check_common_password(password))
+            self.assertEqual(result['patterns'], self.auditor.detect_advanced_patterns(password))
+
 if __name__ == '__main__':
     unittest.main()
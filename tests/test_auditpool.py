@@ -0,0 +1,81 @@
+"""Tests for process-pool batch scoring"""
+
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from password_auditor import AdvancedPasswordAuditor
+from utils.auditpool import ParallelScorer
+from utils.benchmark import bench_audit_scaling
+from utils.scoring import score_passwords, write_results
+from utils.wordlists import extended_common_passwords
+
+PASSWORDS = [f"{word}{i % 97}" for i, word in enumerate(['password', 'Tr0ub4dor&3', 'qwerty', 'café!'] * 250)]
+
+class TestParallelScorer(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def serial(self, output_format):
+        f = io.StringIO()
+        write_results(score_passwords(PASSWORDS, extended_common_passwords), f, output_format)
+        return f.getvalue()
+
+    def test_ordered_output_matches_serial(self):
+        for output_format in ('jsonl', 'csv'):
+            f = io.StringIO()
+            scorer = ParallelScorer(2, chunk_size=64)
+            self.assertEqual(scorer.write(PASSWORDS, f, output_format), len(PASSWORDS))
+            self.assertEqual(f.getvalue(), self.serial(output_format))
+
+    def test_unordered_rows_keep_ids(self):
+        f = io.StringIO()
+        ParallelScorer(2, chunk_size=64).write(PASSWORDS, f, ordered=False)
+        rows = sorted((json.loads(line) for line in f.getvalue().splitlines()), key=lambda row: row['id'])
+        self.assertEqual(rows, [json.loads(line) for line in self.serial('jsonl').splitlines()])
+
+    def test_in_flight_work_is_bounded(self):
+        consumed = []
+
+        def passwords():
+            for password in PASSWORDS:
+                consumed.append(password)
+                yield password
+
+        scorer = ParallelScorer(2, chunk_size=50, in_flight=2)
+        chunks = scorer.render(passwords())
+        start, rows, _, results = next(chunks)
+        self.assertEqual((start, rows, results), (0, 50, None))
+        # Four chunks pending, plus at most one being read
+        self.assertLessEqual(len(consumed), 5 * 50)
+        chunks.close()
+
+    def test_audit_file_with_workers(self):
+        source = os.path.join(self.directory, 'passwords.txt')
+        output = os.path.join(self.directory, 'out.csv')
+        with open(source, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(PASSWORDS) + '\n')
+
+        auditor = AdvancedPasswordAuditor()
+        rows, _ = auditor.audit_file(source, output, 'csv', workers=2)
+        self.assertEqual(rows, len(PASSWORDS))
+        with open(output, encoding='utf-8', newline='') as f:
+            self.assertEqual(f.read(), self.serial('csv'))
+        self.assertEqual(auditor.audit_history.count, len(PASSWORDS))
+
+        auditor = AdvancedPasswordAuditor()
+        auditor.audit_file(source, output, workers=2, ordered=False, record=False)
+        self.assertEqual(auditor.audit_history.count, 0)
+
+    def test_scaling_report(self):
+        report = bench_audit_scaling(workers=[1, 2], size=2000)
+        self.assertEqual(set(report), {'1', '2'})
+        self.assertEqual(report['1']['speedup'], 1.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,27 @@
+"""Tests for the benchmark suite helpers"""
+
+import unittest
+from utils.benchmark import percentile, measure, compare_reports
+
+class TestBenchmark(unittest.TestCase):
+    def test_percentile(self):
+        values = [1, 2, 3, 4, 5]
+        self.assertEqual(percentile(values, 50), 3)
+        self.assertEqual(percentile(values, 90), 4.6)
+        self.assertEqual(percentile([], 50), 0.0)
+    
+    def test_measure(self):
+        stats = measure(lambda: sum(range(100)), operations=100, repeat=5)
+        self.assertEqual(stats['repeat'], 5)
+        self.assertGreater(stats['ops_per_second'], 0)
+        self.assertLessEqual(stats['min_ns'], stats['median_ns'])
+        self.assertLessEqual(stats['median_ns'], stats['max_ns'])
+    
+    def test_compare_reports(self):
+        baseline = {'metadata': {}, 'hash_throughput': {'md5': {'median_ns': 100}, 'sha1': {'median_ns': 100}}}
+        current = {'metadata': {}, 'hash_throughput': {'md5': {'median_ns': 150}, 'sha1': {'median_ns': 105}}}
+        regressions = compare_reports(baseline, current)
+        self.assertEqual([name for name, *_ in regressions], ['hash_throughput.md5'])
+
+if __name__ == '__main__':
+    unittest.main()
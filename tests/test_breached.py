@@ -0,0 +1,70 @@
+"""Tests for the on-disk breached-password index"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from password_auditor import AdvancedPasswordAuditor
+from utils import digestindex
+from utils.breached import PasswordIndex, build_password_index
+from utils.digestindex import DigestIndex, write_index
+
+class TestBreachedIndex(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.wordlist = os.path.join(self.directory, 'breached.txt')
+        self.index = os.path.join(self.directory, 'breached.idx')
+        with open(self.wordlist, 'w') as f:
+            f.write('\n'.join(f"Leak{i}" for i in range(5000)) + '\nleak7\r\nCorrectHorse\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_build_and_lookup_with_external_merge(self):
+        run_records = digestindex.RUN_RECORDS
+        digestindex.RUN_RECORDS = 700  # force several spilled runs
+        try:
+            self.assertEqual(build_password_index(self.wordlist, self.index), 5001)
+        finally:
+            digestindex.RUN_RECORDS = run_records
+
+        index = PasswordIndex(self.index)
+        self.assertEqual(len(index), 5001)
+        for password in ['leak0', 'LEAK4999', 'correcthorse']:
+            self.assertIn(password, index)
+        for password in ['leak5000', '', 'Correct Horse', 'leak7\r']:
+            self.assertNotIn(password, index)
+        records = list(index.index)
+        self.assertEqual(records, sorted(set(records)))
+        index.close()
+
+    def test_corpus_lines_are_kept_verbatim(self):
+        with open(self.wordlist, 'wb') as f:
+            f.write(b'#1mom\nsecret \n  padded\r\n\n')
+        self.assertEqual(build_password_index(self.wordlist, self.index), 3)
+        index = PasswordIndex(self.index)
+        for password in ['#1mom', 'secret ', '  padded']:
+            self.assertIn(password, index)
+        for password in ['1mom', 'secret', 'padded']:
+            self.assertNotIn(password, index)
+        index.close()
+
+    def test_kind_is_checked(self):
+        write_index(self.index, [b'\x00\x01', b'\xff\xfe'], 2, kind='md5')
+        with DigestIndex(self.index) as index:
+            self.assertIn(b'\xff\xfe', index)
+            self.assertNotIn(b'\xff\xff', index)
+        with self.assertRaises(ValueError):
+            PasswordIndex(self.index)
+
+    def test_auditor_uses_index(self):
+        build_password_index(self.wordlist, self.index)
+        auditor = AdvancedPasswordAuditor(self.index)
+        self.assertTrue(auditor.check_common_password('Leak42'))
+        self.assertTrue(auditor.check_common_password('password'))
+        self.assertFalse(auditor.check_common_password('uNl1sted!'))
+        self.assertEqual([result['is_common'] for _, result in auditor.score_batch(['leak1', 'uNl1sted!'])],
+                         [True, False])
+
+if __name__ == '__main__':
+    unittest.main()
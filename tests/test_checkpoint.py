@@ -0,0 +1,107 @@
+"""Tests for checkpoint/resume of cracking jobs"""
+
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from hash_cracker import AdvancedHashCracker
+from utils.checkpoint import Checkpoint
+from utils.cracker import HashCracker
+from utils.hashing import hash_password
+from utils.parallel import ParallelCracker
+from utils.wordlists import WordlistSource
+
+class TestCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'job.checkpoint.json')
+        self.wordlist = os.path.join(self.directory, 'words.txt')
+        with open(self.wordlist, 'w') as f:
+            f.write('\n'.join(f"word{i:04d}" for i in range(2000)) + '\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_interval_and_lazy_fields(self):
+        checkpoint = Checkpoint(self.path, interval=3600)
+        checkpoint.update(strategy='wordlist', position=10)
+        self.assertIsNone(Checkpoint.load(self.path))
+
+        checkpoint.interval = 0
+        checkpoint.update(position=20, open_targets=lambda: ['abc'])
+        state = Checkpoint.load(self.path)
+        self.assertEqual((state['strategy'], state['position'], state['open_targets']), ('wordlist', 20, ['abc']))
+
+        checkpoint.clear()
+        self.assertIsNone(Checkpoint.load(self.path))
+
+    def test_chunks_cover_source(self):
+        source = WordlistSource(self.wordlist)
+        chunks = list(source.chunks(1000))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(chunks[-1].end, source.end)
+        self.assertEqual([word for chunk in chunks for word in chunk], list(source))
+
+    def test_dictionary_attack_reports_resumable_offsets(self):
+        offsets = []
+        cracker = HashCracker()
+        target = hash_password('word1500', 'md5')
+        with contextlib.redirect_stderr(io.StringIO()):
+            source = WordlistSource(self.wordlist)
+            self.assertFalse(cracker.dictionary_attack('00' * 16, source, 'md5', progress=offsets.append)['cracked'])
+            self.assertEqual(offsets[-1], source.end)
+
+            # Lines are 9 bytes, so offset 9000 resumes at word1000
+            resumed = cracker.dictionary_attack(target, WordlistSource(self.wordlist, start=9000), 'md5')
+            self.assertEqual((resumed['password'], resumed['attempts']), ('word1500', 501))
+
+    def test_mask_and_parallel_progress(self):
+        positions = []
+        target = hash_password('zz9', 'md5')
+        with contextlib.redirect_stderr(io.StringIO()):
+            HashCracker().mask_attack('00' * 16, '?l?l?l?d', progress=positions.append)
+            self.assertEqual(positions[-1], 26 ** 3 * 10)
+
+            positions = []
+            result = ParallelCracker(2).mask_attack(target, '?l?l?d', start=100, progress=positions.append)
+            self.assertEqual(result['password'], 'zz9')
+            self.assertEqual(positions, sorted(positions))
+            self.assertTrue(all(position >= 100 for position in positions))
+
+    def test_resume_skips_finished_strategies(self):
+        target = hash_password('word0003', 'md5')
+        resume = {'strategy': 'wordlist', 'position': os.path.getsize(self.wordlist) // 2}
+        cracker = AdvancedHashCracker(checkpoint=Checkpoint(self.path, interval=0))
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            result = cracker.crack_hash(target, 'md5', self.wordlist, max_workers=1, rules=['$1'], resume=resume)
+
+        # word0003 sits before the saved offset, so only the rule strategy is left to run
+        self.assertFalse(result['cracked'])
+        self.assertIsNone(Checkpoint.load(self.path))
+
+    def test_rules_over_wordlist_resume_from_offset(self):
+        offsets = []
+        cracker = HashCracker()
+        source = WordlistSource(self.wordlist)
+        with contextlib.redirect_stderr(io.StringIO()):
+            cracker.batch_dictionary_attack(['00' * 16], cracker.rule_candidates(source, ['$1']), 'md5',
+                                            progress=lambda offset, cracked: offsets.append(offset))
+        self.assertEqual(offsets, [source.end])
+
+        hash_file = os.path.join(self.directory, 'hashes.txt')
+        early, late = hash_password('word00031', 'md5'), hash_password('word19991', 'md5')
+        with open(hash_file, 'w') as f:
+            f.write(f"{early}\n{late}\n")
+        resume = {'strategy': 'rules', 'position': os.path.getsize(self.wordlist) // 2,
+                  'open_targets': [early, late], 'cracked': []}
+        hashes = AdvancedHashCracker(checkpoint=Checkpoint(self.path, interval=0))
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            results = hashes.crack_hash_file(hash_file, wordlist=self.wordlist, rules=['$1'], resume=resume)
+        # Only the words after the saved offset are expanded
+        self.assertEqual([result['cracked'] for result in results], [False, True])
+        self.assertEqual(results.results[1]['attempts'], 1000)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -22,6 +22,28 @@ class TestHashCracker(unittest.TestCase):
         result = self.cracker.dictionary_attack(self.test_hash_md5, wordlist, 'md5')
         self.assertTrue(result['cracked'])
         self.assertEqual(result['password'], 'test123')
+    
+    def test_bytes_candidates_and_uppercase_target(self):
+        result = self.cracker.dictionary_attack(self.test_hash_md5.upper(), [b'admin', b'test123'], 'md5')
+        self.assertTrue(result['cracked'])
+        self.assertEqual(result['password'], 'test123')
+    
+    def test_rule_based_attack(self):
+        for candidate in ['12password!!', 'Admin2023', 'QWERTY']:
+            result = self.cracker.rule_based_attack(hash_password(candidate, 'sha256'))
+            self.assertTrue(result['cracked'])
+            self.assertEqual(result['password'], candidate)
+    
+    def test_batch_dictionary_attack(self):
+        targets = [self.test_hash_md5, hash_password('admin', 'sha1'), hash_password('nope', 'sha256'),
+                   self.test_hash_md5.upper()]
+        results = self.cracker.batch_dictionary_attack(targets, ['password', 'admin', 'test123'])
+        self.assertEqual(len(results.results), 3)
+        by_hash = {result['hash']: result for result in results.results}
+        self.assertEqual(by_hash[self.test_hash_md5]['password'], 'test123')
+        self.assertEqual(by_hash[targets[1]]['password'], 'admin')
+        self.assertFalse(by_hash[targets[2]]['cracked'])
+        self.assertEqual(results.successful_cracks, 2)
 
 if __name__ == '__main__':
     unittest.main()
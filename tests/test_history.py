@@ -0,0 +1,68 @@
+"""Tests for the streaming audit history and report"""
+
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from password_auditor import AdvancedPasswordAuditor
+from utils.history import AuditHistory, audit_record
+from utils.scoring import score_password
+
+class TestAuditHistory(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.log = os.path.join(self.directory, 'history.jsonl')
+        self.report = os.path.join(self.directory, 'report.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_empty_report(self):
+        with redirect_stdout(io.StringIO()):
+            AdvancedPasswordAuditor().generate_report(self.report)
+        with open(self.report) as f:
+            report = json.load(f)
+        self.assertEqual(report['metadata']['total_audits'], 0)
+        self.assertEqual(report['summary']['average_entropy'], 0.0)
+        self.assertEqual(report['audits'], [])
+
+    def test_aggregates_are_bounded_and_logged(self):
+        passwords = ['password', 'qwerty123', 'x9!Lq#2vTz', 'aaaa1990', 'Tr0ub4dor&3'] * 20
+        history = AuditHistory(self.log, keep=7)
+        for password in passwords:
+            history.append(audit_record(score_password(password)))
+        history.write_report(self.report, {'tool_version': 'test'})
+        history.close()
+
+        results = [score_password(password) for password in passwords]
+        with open(self.report) as f:
+            report = json.load(f)
+        summary = report['summary']
+        self.assertEqual(report['metadata']['total_audits'], 100)
+        self.assertEqual(len(report['audits']), 7)
+        self.assertAlmostEqual(summary['average_entropy'], sum(r['entropy'] for r in results) / 100)
+        self.assertEqual(sum(summary['strength_histogram'].values()), 100)
+        self.assertEqual(summary['common_passwords'], sum(r['is_common'] for r in results))
+        self.assertEqual(summary['pattern_counts']['Contains common year'], 20)
+
+        with open(self.log) as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(len(records), 100)
+        self.assertEqual(records[-7:], report['audits'])
+
+    def test_batch_audit_feeds_history(self):
+        source = os.path.join(self.directory, 'passwords.txt')
+        with open(source, 'w') as f:
+            f.write('password\nSummer2024!\nx9!Lq#2vTz\n')
+        auditor = AdvancedPasswordAuditor(history_file=self.log)
+        auditor.audit_file(source, os.path.join(self.directory, 'out.jsonl'))
+        auditor.audit_history.close()
+        self.assertEqual(len(auditor.audit_history), 3)
+        with open(self.log) as f:
+            self.assertEqual(sum(1 for _ in f), 3)
+
+if __name__ == '__main__':
+    unittest.main()
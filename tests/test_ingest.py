@@ -0,0 +1,59 @@
+"""Tests for streaming hash-file ingestion"""
+
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from hash_cracker import AdvancedHashCracker
+from utils.ingest import HashTargets, parse_hash_line
+
+SAMPLE_HASHES = os.path.join(os.path.dirname(__file__), '..', 'examples', 'sample_hashes.txt')
+BCRYPT = '$2b$04$cVWp4XaNU8a4v1uMRum2SO2oQWbDOPy.eYY7CpPEMxVTD4DL6ovWG'
+
+class TestIngest(unittest.TestCase):
+    def test_line_formats(self):
+        md5 = '5f4dcc3b5aa765d61d8327deb882cf99'
+        self.assertIsNone(parse_hash_line('  # comment'))
+        self.assertEqual(parse_hash_line(md5.upper()), (md5, 'md5', bytes.fromhex(md5)))
+        self.assertEqual(parse_hash_line(f"alice:{md5}")[:2], (md5, 'md5'))
+        self.assertEqual(parse_hash_line(f"MD5: {md5} (pass:word)")[:2], (md5, 'md5'))
+        self.assertEqual(parse_hash_line(f"bob:{BCRYPT}:19000:0:99999:7:::"), (BCRYPT, 'bcrypt', None))
+        for line in ['not a hash', f"SHA1: {md5}", md5[:-1], '$9$unknown']:
+            with self.assertRaises(ValueError):
+                parse_hash_line(line)
+        with self.assertRaises(ValueError):
+            parse_hash_line(md5, 'sha256')
+
+    def test_sample_file(self):
+        targets = HashTargets.from_file(SAMPLE_HASHES)
+        self.assertEqual(len(targets), 10)
+        self.assertEqual(targets.counts(), {'md5': 4, 'sha1': 3, 'sha256': 3})
+        self.assertEqual(targets.malformed, 0)
+        self.assertEqual(sum(len(bucket) for bucket in targets.buckets().values()), 10)
+
+    def test_duplicates_and_malformed_lines(self):
+        md5 = '5f4dcc3b5aa765d61d8327deb882cf99'
+        lines = [md5, f"carol:{md5.upper()}", 'garbage', BCRYPT, '', 'deadbeef'] + ['x'] * 20
+        targets = HashTargets.from_lines(lines)
+        self.assertEqual(list(targets), [md5, BCRYPT])
+        self.assertEqual((targets.lines, targets.duplicates, targets.malformed), (26, 1, 22))
+        self.assertEqual(targets.errors[0][:1], (3,))
+        self.assertEqual(len(targets.errors), 10)
+        self.assertEqual((targets.fast(), targets.slow()), ([md5], [BCRYPT]))
+
+    def test_crack_hash_file_reports_and_continues(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+            f.write("5f4dcc3b5aa765d61d8327deb882cf99\nnot-a-hash\nalice:5F4DCC3B5AA765D61D8327DEB882CF99\n")
+        out = io.StringIO()
+        try:
+            with redirect_stdout(out):
+                results = AdvancedHashCracker().crack_hash_file(f.name)
+        finally:
+            os.remove(f.name)
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results.results[0]['password'], 'password')
+        self.assertIn('line 2', out.getvalue())
+
+if __name__ == '__main__':
+    unittest.main()
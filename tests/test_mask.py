@@ -0,0 +1,38 @@
+"""Tests for mask keyspaces and the mask attack"""
+
+import itertools
+import string
+import unittest
+from utils.cracker import HashCracker
+from utils.hashing import hash_password
+from utils.mask import MaskKeyspace
+from utils.parallel import ParallelCracker
+
+class TestMaskKeyspace(unittest.TestCase):
+    def test_order_and_index_addressing(self):
+        keyspace = MaskKeyspace('?d?1x', {'1': 'ab?d'})
+        expected = [f"{d}{c}x".encode() for d, c in itertools.product(string.digits, 'ab' + string.digits)]
+        self.assertEqual(len(keyspace), len(expected))
+        self.assertEqual([bytes(c) for c in keyspace.iter_range()], expected)
+        self.assertEqual([keyspace.candidate(i) for i in (0, 13, 119)], [expected[0], expected[13], expected[119]])
+        self.assertEqual([bytes(c) for c in keyspace.iter_range(11, 37)], expected[11:37])
+    
+    def test_invalid_masks(self):
+        for mask in ['', '?z', '?1']:
+            with self.assertRaises(ValueError):
+                MaskKeyspace(mask)
+    
+    def test_mask_attack_and_resume(self):
+        target = hash_password('Zz9', 'sha1')
+        cracker = HashCracker()
+        result = cracker.mask_attack(target, '?u?l?d')
+        self.assertEqual(result['password'], 'Zz9')
+        self.assertFalse(cracker.mask_attack(target, '?u?l?d', end=100)['cracked'])
+        self.assertEqual(cracker.mask_attack(target, '?u?l?d', start=6000)['attempts'], len(MaskKeyspace('?u?l?d')) - 6000)
+    
+    def test_parallel_mask_attack(self):
+        result = ParallelCracker(2).mask_attack(hash_password('q7?', 'md5'), '?l?d??')
+        self.assertEqual(result['password'], 'q7?')
+
+if __name__ == '__main__':
+    unittest.main()
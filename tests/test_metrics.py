@@ -0,0 +1,96 @@
+"""Tests for opt-in profiling instrumentation"""
+
+import io
+import json
+import os
+import pstats
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from hash_cracker import AdvancedHashCracker
+from password_auditor import AdvancedPasswordAuditor
+from utils.auditpool import ParallelScorer
+from utils.cracker import HashCracker
+from utils.metrics import Histogram, active, profiled
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.metrics_path = os.path.join(self.directory, 'metrics.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_histogram(self):
+        histogram = Histogram()
+        for ns in [100] * 98 + [5000, 1000000]:
+            histogram.add(ns)
+        self.assertEqual(histogram.count, 100)
+        self.assertEqual(histogram.percentile(0.5), 127)
+        self.assertEqual(histogram.percentile(0.99), 8191)
+        self.assertEqual(histogram.to_dict()['max_us'], 1000.0)
+
+    def test_disabled_is_untouched(self):
+        with profiled() as metrics:
+            self.assertIsNone(metrics)
+            auditor = AdvancedPasswordAuditor()
+        self.assertIsNone(active())
+        self.assertNotIn('calculate_entropy', vars(auditor))
+        self.assertFalse(os.path.exists(self.metrics_path))
+
+    def test_auditor_stage_histograms(self):
+        dump_path = os.path.join(self.directory, 'audit.prof')
+        with profiled(self.metrics_path, dump_path), redirect_stdout(io.StringIO()):
+            auditor = AdvancedPasswordAuditor()
+            auditor.analyze_password('Summer2024!')
+            list(auditor.score_batch(['password', 'x9!Lq#2vTz']))
+        self.assertIsNone(active())
+
+        with open(self.metrics_path) as f:
+            latency = json.load(f)['latency']
+        self.assertEqual(latency['audit.calculate_entropy']['count'], 1)
+        self.assertEqual(latency['audit.score_chunk']['count'], 1)
+        self.assertEqual(latency['audit.pattern_detection']['count'], 3)
+        self.assertEqual(latency['audit.common_check']['count'], 3)
+        self.assertGreater(pstats.Stats(dump_path).total_calls, 0)
+
+    def test_batch_stages_include_pool_workers(self):
+        passwords = [f"Summer{i}!" for i in range(300)]
+        with profiled(self.metrics_path):
+            list(AdvancedPasswordAuditor().score_batch(passwords, chunk_size=100))
+            ParallelScorer(2, chunk_size=100).write(passwords, io.StringIO())
+
+        with open(self.metrics_path) as f:
+            report = json.load(f)
+        latency = report['latency']
+        # Batch scoring never calls calculate_entropy, so it reports no empty histogram for it
+        self.assertNotIn('audit.calculate_entropy', latency)
+        self.assertEqual(latency['audit.score_chunk']['count'], 6)
+        self.assertEqual(latency['audit.pattern_detection']['count'], 600)
+        self.assertEqual(latency['audit.common_check']['count'], 600)
+        self.assertEqual(report['counters']['audit.passwords'], 600)
+        self.assertIn('audit', report['workers'])
+
+    def test_cracking_strategy_counters(self):
+        wordlist = os.path.join(self.directory, 'words.txt')
+        with open(wordlist, 'w') as f:
+            f.write('\n'.join(f"word{i}" for i in range(3000)) + '\n')
+        target = HashCracker().hash_password('word2999', 'md5')
+
+        with profiled(self.metrics_path), redirect_stdout(io.StringIO()):
+            with profiled(os.path.join(self.directory, 'nested.json')) as nested:
+                self.assertIs(nested, active())
+                result = AdvancedHashCracker().crack_hash(target, wordlist=wordlist, max_workers=1)
+        self.assertTrue(result['cracked'])
+        self.assertFalse(os.path.exists(os.path.join(self.directory, 'nested.json')))
+
+        with open(self.metrics_path) as f:
+            strategies = json.load(f)['strategies']
+        self.assertEqual(strategies['wordlist']['candidates'], 3000)
+        self.assertEqual(strategies['wordlist']['hits'], 1)
+        self.assertEqual(strategies['common']['hits'], 0)
+        self.assertAlmostEqual(sum(strategies['wordlist']['stage_share'].values()), 1.0)
+
+if __name__ == '__main__':
+    unittest.main()
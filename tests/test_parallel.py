@@ -0,0 +1,33 @@
+"""Tests for the parallel cracking engine"""
+
+import os
+import tempfile
+import unittest
+from utils.hashing import hash_password
+from utils.parallel import ParallelCracker, split_range
+
+class TestParallelCracker(unittest.TestCase):
+    def setUp(self):
+        fd, self.wordlist = tempfile.mkstemp(suffix='.txt')
+        self.words = [f"word{i}" for i in range(5000)]
+        with os.fdopen(fd, 'w') as f:
+            f.write('# comment\n' + '\n'.join(self.words) + '\n')
+    
+    def tearDown(self):
+        os.remove(self.wordlist)
+    
+    def test_split_range(self):
+        self.assertEqual(split_range(10, 3), [(0, 3), (3, 6), (6, 10)])
+    
+    def test_wordlist_attack(self):
+        result = ParallelCracker(2).wordlist_attack(hash_password('word4321', 'sha1'), self.wordlist)
+        self.assertTrue(result['cracked'])
+        self.assertEqual(result['password'], 'word4321')
+    
+    def test_rule_attack(self):
+        result = ParallelCracker(2).rule_attack(hash_password('!admin2024', 'md5'))
+        self.assertTrue(result['cracked'])
+        self.assertEqual(result['password'], '!admin2024')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+"""Tests for the compiled pattern matcher"""
+
+import unittest
+from utils.patterns import (AhoCorasick, PatternMatcher, PatternRule, PenaltyMatcher, RepeatRule, pattern_penalty,
+                            scan_patterns)
+
+class TestPatternMatcher(unittest.TestCase):
+    def test_aho_corasick_finds_overlapping_patterns(self):
+        automaton = AhoCorasick({'he': 1, 'she': 2, 'his': 3, 'hers': 4})
+        self.assertEqual(automaton.find('ushers'), {1, 2, 4})
+        self.assertEqual(automaton.find('xyz'), set())
+    
+    def test_scan_reports_and_penalizes(self):
+        penalty, patterns = scan_patterns("Qwertz12/05/1975aaa")
+        self.assertEqual(penalty, 10 + 8 * 3)
+        self.assertEqual(patterns, [
+            "Sequential pattern: 'qwe'",
+            "Repeated character: 'a' 3 times",
+            "Contains common year",
+            "Contains date: '12/05'",
+            "Keyboard walk: 'rtz'",
+        ])
+        self.assertEqual(scan_patterns(""), (0, []))
+    
+    def test_majority_penalty(self):
+        self.assertEqual(scan_patterns("zzzzx"), (15, ["Repeated character: 'z' 4 times"]))
+    
+    def test_custom_rules(self):
+        matcher = PatternMatcher([
+            PatternRule('brand', ['acme', 'widget'], penalty=5, message="Company name: '{token}'"),
+            RepeatRule('repeat', message="Repeated '{token}' x{count}", threshold=2),
+        ])
+        self.assertEqual(matcher.scan("ACME-widget!!"), (10, ["Company name: 'acme'", "Repeated '!' x2"]))
+    
+    def test_penalty_matcher_skips_report_only_rules(self):
+        matcher = PenaltyMatcher()
+        self.assertFalse(any(token in matcher.weights for token in ('1975', '12/05', 'rtz')))
+        for password in ("Qwertz12/05/1975aaa", "zzzzx", "asdqweasd", "ab12", "", "1990-01-01"):
+            self.assertEqual(pattern_penalty(password), scan_patterns(password)[0])
+        # Tokens of different lengths starting at the same position all count
+        matcher = PenaltyMatcher([PatternRule('a', ['ab'], penalty=1), PatternRule('b', ['abc'], penalty=2)])
+        self.assertEqual(matcher.penalty("ABC"), 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+"""Tests for the persistent potfile"""
+
+import multiprocessing as mp
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from utils.hashing import hash_password
+from utils.potfile import Potfile
+
+def _write_entries(path, worker):
+    potfile = Potfile(path)
+    for i in range(50):
+        password = f"w{worker}-{i}"
+        potfile.add('md5', hash_password(password, 'md5'), password)
+    potfile.close()
+
+class TestPotfile(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'test.pot')
+    
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+    
+    def test_lookup_and_append_only(self):
+        target = hash_password('secret', 'sha1')
+        with Potfile(self.path) as potfile:
+            self.assertIsNone(potfile.lookup('sha1', target))
+            potfile.add('sha1', target, 'secret')
+            potfile.add('sha1', target.upper(), 'overwritten?')
+            self.assertEqual(potfile.lookup('sha1', target.upper()), 'secret')
+            self.assertIsNone(potfile.lookup('md5', target))
+            self.assertEqual(potfile.lookup_many([(target, 'sha1'), ('00' * 16, 'md5')]), {target: 'secret'})
+    
+    def test_concurrent_writers(self):
+        processes = [mp.Process(target=_write_entries, args=(self.path, worker)) for worker in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        self.assertTrue(all(process.exitcode == 0 for process in processes))
+        with Potfile(self.path) as potfile:
+            self.assertEqual(len(potfile), 200)
+            self.assertEqual(potfile.lookup('md5', hash_password('w3-49', 'md5')), 'w3-49')
+    
+    def test_cli_persists_only_when_asked(self):
+        script = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'hash_cracker.py')
+        command = [sys.executable, script, hash_password('7', 'md5'), '--mask', '?d', '--workers', '1',
+                   '--no-checkpoint', '--no-progress']
+        env = dict(os.environ, HOME=self.directory)
+        subprocess.run(command, env=env, cwd=self.directory, capture_output=True, check=True)
+        self.assertEqual(os.listdir(self.directory), [])
+        subprocess.run(command + ['--potfile', self.path], env=env, cwd=self.directory, capture_output=True,
+                       check=True)
+        with Potfile(self.path) as potfile:
+            self.assertEqual(potfile.lookup('md5', hash_password('7', 'md5')), '7')
+
+if __name__ == '__main__':
+    unittest.main()
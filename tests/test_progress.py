@@ -0,0 +1,43 @@
+"""Tests for the throttled progress layer"""
+
+import io
+import unittest
+from contextlib import redirect_stderr
+from utils import progress
+from utils.cracker import HashCracker
+from utils.progress import Progress
+
+class TestProgress(unittest.TestCase):
+    def test_throttled_updates(self):
+        with redirect_stderr(io.StringIO()):
+            bar = Progress(total=None, interval=3600)
+            bar.update_to(10)
+            self.assertEqual(bar._bar.n, 10)
+            for count in range(11, 1000):
+                bar.update_to(count)
+            self.assertEqual(bar._bar.n, 10)
+            bar.close()
+        self.assertEqual(bar.count, 999)
+
+    def test_disabled(self):
+        progress.set_enabled(False)
+        try:
+            with Progress(total=lambda: self.fail('total evaluated')) as bar:
+                bar.add(5)
+                bar.add(7)
+        finally:
+            progress.set_enabled(True)
+        self.assertIsNone(bar._bar)
+        self.assertEqual(bar.count, 12)
+
+    def test_generator_wordlist(self):
+        cracker = HashCracker()
+        target = cracker.hash_password('word150000', 'md5')
+        words = (f"word{i}" for i in range(200000))
+        with redirect_stderr(io.StringIO()):
+            result = cracker.dictionary_attack(target, words, 'md5')
+        self.assertEqual(result['password'], 'word150000')
+        self.assertEqual(result['attempts'], 150001)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+"""Tests for compact cracking result records"""
+
+import csv
+import io
+import json
+import unittest
+from utils.cracker import HashCracker
+from utils.results import CrackResult, CrackResults, RESULT_FIELDS
+
+class TestCrackResults(unittest.TestCase):
+    def setUp(self):
+        self.cracker = HashCracker()
+
+    def test_dict_style_access(self):
+        result = self.cracker.dictionary_attack(self.cracker.hash_password('admin', 'md5'), ['password', 'admin'])
+        self.assertIsInstance(result, CrackResult)
+        self.assertEqual(result['password'], 'admin')
+        self.assertEqual(list(result), ['cracked', 'password', 'attempts', 'time', 'method'])
+        result['attempts'] += 3
+        self.assertEqual(result.attempts, 5)
+        self.assertEqual(result, dict(result))
+        self.assertIsNone(result.get('hash'))
+        self.assertNotIn('hash', result)
+        with self.assertRaises(KeyError):
+            result['missing']
+        with self.assertRaises(AttributeError):
+            result.extra = 1
+
+    def test_aggregates_and_legacy_dicts(self):
+        targets = [self.cracker.hash_password('admin', 'md5'), self.cracker.hash_password('nope', 'md5'),
+                   self.cracker.hash_password('letmein', 'sha1')]
+        results = self.cracker.batch_dictionary_attack(targets, ['admin', 'letmein'])
+        results.add_result({'cracked': True, 'password': 'x', 'attempts': 0, 'time': 0.0, 'method': 'potfile'})
+
+        self.assertEqual(results.successful_cracks, 3)
+        self.assertEqual(results.total_attempts, 1 + 2 + 2)
+        self.assertEqual(results.get_success_rate(), 75.0)
+        self.assertEqual(results.by_method()['dictionary'],
+                         {'targets': 3, 'cracked': 2, 'attempts': 5, 'success_rate': 2 / 3 * 100})
+        self.assertEqual(results.by_method()['potfile']['cracked'], 1)
+        self.assertEqual({name: totals['cracked'] for name, totals in results.by_algorithm().items()},
+                         {'md5': 1, 'sha1': 1})
+        self.assertEqual(CrackResults().get_success_rate(), 0)
+
+    def test_export(self):
+        targets = [self.cracker.hash_password('admin', 'md5'), self.cracker.hash_password('nope', 'sha256')]
+        results = self.cracker.batch_dictionary_attack(targets, ['admin', 'café "quoted"'])
+
+        out = io.StringIO()
+        self.assertEqual(results.write_jsonl(out), 2)
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(rows, [dict(result) for result in results])
+        self.assertEqual(list(rows[0]), list(RESULT_FIELDS))
+
+        out = io.StringIO()
+        results.write_csv(out)
+        rows = list(csv.reader(io.StringIO(out.getvalue())))
+        self.assertEqual(rows[0], list(RESULT_FIELDS))
+        self.assertEqual(rows[1][:5], [targets[0], 'md5', 'True', 'admin', '1'])
+        self.assertEqual(rows[2][3], '')
+
+if __name__ == '__main__':
+    unittest.main()
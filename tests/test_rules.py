@@ -0,0 +1,46 @@
+"""Tests for the mangling-rule engine"""
+
+import unittest
+from utils.cracker import HashCracker
+from utils.hashing import hash_password
+from utils.rules import RuleEngine, parse_rule, leet_rules
+
+class TestRuleEngine(unittest.TestCase):
+    def test_operations(self):
+        cases = {
+            ':': 'password', 'u': 'PASSWORD', 'c $1': 'Password1', '^! $!': '!password!',
+            'r': 'drowssap', 'd': 'passwordpassword', "'4": 'pass', 'sa4 so0': 'p4ssw0rd',
+            'T0 ]': 'Passwor', '@s': 'paword', '$ ': 'password ',
+        }
+        for rule, expected in cases.items():
+            self.assertEqual(RuleEngine([rule]).candidate(['password'], 0), expected, msg=rule)
+        with self.assertRaises(ValueError):
+            parse_rule('X')
+    
+    def test_keyspace_and_index_addressing(self):
+        engine = RuleEngine(['$1', 'u', '$2', 'u $1', '# comment', '$1'])
+        words = ['ab', 'cd', 'ef']
+        candidates = list(engine.candidates(words))
+        self.assertEqual(len(engine), 4)
+        self.assertEqual(engine.keyspace(words), len(candidates))
+        self.assertEqual([engine.candidate(words, i) for i in range(len(candidates))], candidates)
+        self.assertEqual(list(engine.iter_range(words, 3, 9)), candidates[3:9])
+    
+    def test_leet_rules_from_cracker_map(self):
+        rules = leet_rules(HashCracker().common_leet_map)
+        self.assertIn('sa@', rules)
+        self.assertNotIn('saA', rules)
+    
+    def test_rule_based_attack_over_wordlist(self):
+        cracker = HashCracker()
+        target = hash_password('Dragon99', 'md5')
+        result = cracker.rule_based_attack(target, wordlist=[b'monkey', b'dragon'], rules=['c $9 $9'])
+        self.assertTrue(result['cracked'])
+        self.assertEqual(result['password'], 'Dragon99')
+        self.assertEqual(result['attempts'], 2)
+        self.assertEqual(len(cracker.rule_candidates(['a', 'b'], ['u', 'l'])), 4)
+        leet = cracker.rule_based_attack(hash_password('p@ssword', 'sha1'))
+        self.assertTrue(leet['cracked'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+"""Tests for adaptive strategy scheduling and time budgets"""
+
+import io
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from hash_cracker import AdvancedHashCracker
+from utils.checkpoint import Checkpoint
+from utils.cracker import HashCracker
+from utils.scheduler import BUDGET_BLOCK, Deadline, StrategyStats, estimate_lines, schedule
+
+class TestScheduler(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.wordlist = os.path.join(self.directory, 'words.txt')
+        with open(self.wordlist, 'w') as f:
+            f.write('\n'.join(f"word{i:04d}" for i in range(2000)) + '\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_history_reorders_strategies(self):
+        stats = StrategyStats()
+        keyspaces = {'common': 300, 'wordlist': 2000, 'rules': 50000}
+        self.assertEqual([step['strategy'] for step in schedule(keyspaces, stats)], ['common', 'wordlist', 'rules'])
+
+        cracker = HashCracker()
+        batch = cracker.batch_dictionary_attack([cracker.hash_password(word, 'md5') for word in ('a', 'b', 'zz')],
+                                                ['zz', 'b', 'a'])
+        stats.record('rules', batch, 0.1)
+        self.assertEqual(stats.totals['rules']['exposure'], 1 + 2 + 3)
+        self.assertEqual(stats.throughput('rules'), 30)
+
+        # A common-password list that never pays off falls behind productive rules
+        stats.record('common', {'cracked': False, 'attempts': 10 ** 7}, 1000.0)
+        stats.record('rules', {'cracked': True, 'attempts': 2000}, 0.1)
+        plan = schedule(keyspaces, stats)
+        order = [step['strategy'] for step in plan]
+        self.assertLess(order.index('rules'), order.index('common'))
+        self.assertAlmostEqual(plan[order.index('rules')]['seconds'], 50000 / stats.throughput('rules'))
+
+        path = os.path.join(self.directory, 'stats.json')
+        StrategyStats(path).save()
+        stats.path = path
+        stats.save()
+        self.assertEqual(StrategyStats(path).totals, stats.totals)
+
+    def test_estimate_lines(self):
+        self.assertEqual(estimate_lines(self.wordlist), 2000)
+
+    def test_budgeted_source(self):
+        self.assertEqual(list(Deadline().limit(range(10))), list(range(10)))
+        self.assertTrue(Deadline(0).expired())
+        self.assertFalse(Deadline().expired())
+        expired = Deadline(1e-9)
+        self.assertEqual(list(expired.limit(range(BUDGET_BLOCK * 4))), [])
+
+    def test_time_budget_keeps_partial_results(self):
+        hash_file = os.path.join(self.directory, 'hashes.txt')
+        cracker = HashCracker()
+        with open(hash_file, 'w') as f:
+            f.write(f"{cracker.hash_password('password', 'md5')}\n{cracker.hash_password('word1999', 'sha1')}\n")
+        checkpoint_path = os.path.join(self.directory, 'job.json')
+        hashes = AdvancedHashCracker(checkpoint=Checkpoint(checkpoint_path, interval=3600))
+        with redirect_stdout(io.StringIO()) as out, redirect_stderr(io.StringIO()):
+            results = hashes.crack_hash_file(hash_file, wordlist=self.wordlist, max_seconds=1e-9)
+        self.assertEqual(len(results), 2)
+        self.assertIn('Time budget reached', out.getvalue())
+        self.assertEqual(Checkpoint.load(checkpoint_path)['order'], ['common', 'wordlist', 'rules'])
+
+    def test_mask_attack_honours_time_budget(self):
+        target = HashCracker().hash_password('~~~~~~~', 'md5')  # last candidate of ?a x7
+        checkpoint_path = os.path.join(self.directory, 'mask.json')
+        for workers in (1, 2):
+            hashes = AdvancedHashCracker(checkpoint=Checkpoint(checkpoint_path, interval=3600))
+            started = time.monotonic()
+            with redirect_stdout(io.StringIO()) as out, redirect_stderr(io.StringIO()):
+                result = hashes.crack_mask(target, '?a' * 7, 'md5', max_workers=workers, max_seconds=0.5)
+            self.assertLess(time.monotonic() - started, 10)
+            self.assertFalse(result['cracked'])
+            self.assertIn('Time budget reached', out.getvalue())
+            self.assertEqual(Checkpoint.load(checkpoint_path)['job']['mode'], 'mask')
+
+    def test_crack_hash_follows_history(self):
+        stats = StrategyStats()
+        stats.totals['rules'] = {'runs': 1, 'candidates': 10 ** 6, 'exposure': 10 ** 6, 'hits': 10 ** 5,
+                                 'seconds': 1.0}
+        target = HashCracker().hash_password('word0001', 'md5')
+        with redirect_stdout(io.StringIO()) as out, redirect_stderr(io.StringIO()):
+            result = AdvancedHashCracker(stats=stats).crack_hash(target, wordlist=self.wordlist, max_workers=1)
+        self.assertTrue(result['cracked'])
+        self.assertIn('[1/3] Trying rule-based attacks', out.getvalue())
+        self.assertEqual(stats.totals['rules']['runs'], 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+"""Tests for the scoring result cache"""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from password_auditor import AdvancedPasswordAuditor
+from utils.scorecache import SECRET_ENV, ScoreCache, load_secret
+from utils.scoring import score_chunk
+from utils.wordlists import extended_common_passwords
+
+class TestScoreCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.scored = []
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def score(self, passwords):
+        self.scored.extend(passwords)
+        return score_chunk(passwords, extended_common_passwords)
+
+    def test_repeats_are_scored_once(self):
+        cache = ScoreCache()
+        passwords = ['password', 'Tr0ub4dor&3', 'password', 'letmein']
+        results = cache.score_chunk(passwords, self.score)
+        self.assertEqual(results, score_chunk(passwords, extended_common_passwords))
+        self.assertEqual(self.scored, ['password', 'Tr0ub4dor&3', 'letmein'])
+
+        cache.score_chunk(['letmein', 'password'], self.score)
+        self.assertEqual(len(self.scored), 3)
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['size']), (3, 3, 3))
+        self.assertTrue(all(isinstance(key, bytes) and len(key) == 16 for key in cache._entries))
+
+    def test_lru_eviction_and_ttl(self):
+        cache = ScoreCache(maxsize=2)
+        cache.score_chunk(['a1', 'b2'], self.score)
+        cache.score('a1', self.score)
+        cache.score('c3', self.score)
+        self.assertEqual(cache.stats()['evictions'], 1)
+        cache.score('a1', self.score)
+        cache.score('b2', self.score)
+        self.assertEqual(self.scored, ['a1', 'b2', 'c3', 'b2'])
+
+        cache = ScoreCache(ttl=0.01)
+        cache.score('short', self.score)
+        time.sleep(0.02)
+        cache.score('short', self.score)
+        self.assertEqual(cache.stats()['expired'], 1)
+        self.assertEqual(self.scored.count('short'), 2)
+
+    def test_sqlite_backing_is_shared(self):
+        path = os.path.join(self.directory, 'scores.db')
+        secret = load_secret(os.path.join(self.directory, 'scores.key'))
+        first = ScoreCache(path=path, secret=secret)
+        expected = first.score_chunk(['password', 'x9!Lq#2vTz'], self.score)
+        second = ScoreCache(**first.options())
+        self.assertEqual(second.score_chunk(['x9!Lq#2vTz', 'password'], self.score), expected[::-1])
+        self.assertEqual(second.stats()['disk_hits'], 2)
+        self.assertEqual(len(self.scored), 2)
+
+        other_index = ScoreCache(path=path, namespace='breach.idx', secret=secret)
+        other_index.score('password', self.score)
+        self.assertEqual(len(self.scored), 3)
+        first.close()
+        second.close()
+        other_index.close()
+
+    def test_cache_file_key_stays_outside_it(self):
+        path = os.path.join(self.directory, 'scores.db')
+        key_file = os.path.join(self.directory, 'scores.key')
+        environ = os.environ.pop(SECRET_ENV, None)
+        try:
+            with self.assertRaises(ValueError):
+                ScoreCache(path=path)
+        finally:
+            if environ is not None:
+                os.environ[SECRET_ENV] = environ
+
+        secret = load_secret(key_file)
+        self.assertEqual(len(secret), 32)
+        self.assertEqual(os.stat(key_file).st_mode & 0o777, 0o600)
+        self.assertEqual(load_secret(key_file), secret)
+
+        cache = ScoreCache(path=path, secret=secret)
+        cache.score('password', self.score)
+        cache.close()
+        with open(path, 'rb') as f:
+            self.assertNotIn(secret, f.read())
+
+        # Another key cannot use the stored entries
+        stranger = ScoreCache(path=path, secret=os.urandom(32))
+        stranger.score('password', self.score)
+        self.assertEqual(stranger.stats()['disk_hits'], 0)
+        stranger.close()
+        self.assertEqual(ScoreCache().options()['secret'], None)
+
+    def test_auditor_batch(self):
+        passwords = ['password', 'Summer2024!', 'password'] * 5
+        cache = ScoreCache()
+        cached = list(AdvancedPasswordAuditor(cache=cache).score_batch(passwords, chunk_size=4))
+        self.assertEqual(cached, list(AdvancedPasswordAuditor().score_batch(passwords)))
+        self.assertEqual(cache.stats()['misses'], 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+"""Tests for the asyncio audit service"""
+
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from utils.scoring import score_chunk
+from utils.service import AuditService, MicroBatcher
+from utils.wordlists import extended_common_passwords
+
+async def _request(reader, writer, method, path, payload=None):
+    body = json.dumps(payload).encode() if payload is not None else b''
+    writer.write(f"{method} {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line == b'\r\n':
+            break
+        name, _, value = line.decode().partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+class TestAuditService(unittest.TestCase):
+    def test_concurrent_requests_are_batched(self):
+        passwords = [f"Summer{i}!" for i in range(40)] + ['password', 'qwerty']
+
+        async def scenario():
+            service = AuditService()
+            server = await service.start(port=0)
+            port = server.sockets[0].getsockname()[1]
+            connections = [await asyncio.open_connection('127.0.0.1', port) for _ in passwords]
+            responses = await asyncio.gather(*(
+                _request(reader, writer, 'POST', '/score', {'password': password})
+                for (reader, writer), password in zip(connections, passwords)
+            ))
+            common = await _request(*connections[0], 'POST', '/common', {'passwords': ['Password', 'x9!Lq']})
+            errors = [await _request(*connections[1], 'POST', '/score', {'pw': 1}),
+                      await _request(*connections[1], 'GET', '/missing')]
+            health = await _request(*connections[2], 'GET', '/health')
+            for _, writer in connections:
+                writer.close()
+            server.close()
+            await server.wait_closed()
+            service.close()
+            return responses, common, errors, health
+
+        responses, common, errors, health = asyncio.run(scenario())
+        expected = json.loads(json.dumps(score_chunk(passwords, extended_common_passwords)))
+        self.assertEqual([payload for _, payload in responses], expected)
+        self.assertEqual(common, (200, {'results': [{'is_common': True}, {'is_common': False}]}))
+        self.assertEqual([status for status, _ in errors], [400, 404])
+        self.assertLess(health[1]['batches'], len(passwords))
+
+    def test_unix_socket(self):
+        path = os.path.join(tempfile.mkdtemp(), 'audit.sock')
+
+        async def scenario():
+            service = AuditService()
+            server = await service.start(socket_path=path)
+            reader, writer = await asyncio.open_unix_connection(path)
+            response = await _request(reader, writer, 'POST', '/common', {'password': 'letmein'})
+            writer.close()
+            server.close()
+            await server.wait_closed()
+            service.close()
+            return response
+
+        self.assertEqual(asyncio.run(scenario()), (200, {'is_common': True}))
+        os.remove(path)
+        os.rmdir(os.path.dirname(path))
+
+    def test_large_batches_use_executor(self):
+        async def scenario():
+            with ThreadPoolExecutor(1) as executor:
+                batcher = MicroBatcher(lambda items: [item * 2 for item in items], executor, inline_limit=4)
+                results = await asyncio.gather(*(batcher.submit(i) for i in range(100)))
+            return results, batcher.batches
+
+        results, batches = asyncio.run(scenario())
+        self.assertEqual(results, [i * 2 for i in range(100)])
+        self.assertEqual(batches, 1)
+
+if __name__ == '__main__':
+    unittest.main()
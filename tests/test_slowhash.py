@@ -0,0 +1,67 @@
+"""Tests for salted slow-hash support and cost-aware scheduling"""
+
+import contextlib
+import io
+import itertools
+import os
+import tempfile
+import unittest
+from passlib import hash as passlib_hash
+from hash_cracker import AdvancedHashCracker
+from utils.cracker import HashCracker
+from utils.hashing import load_hash_file
+from utils.slowhash import SlowHashScheduler, detect_scheme, verify_slow
+
+BCRYPT = passlib_hash.bcrypt.using(rounds=4).hash('letmein')
+PBKDF2 = passlib_hash.pbkdf2_sha256.using(rounds=1000).hash('dragon')
+SHA512_CRYPT = passlib_hash.sha512_crypt.using(rounds=1000).hash('Password1')
+
+class TestSlowHash(unittest.TestCase):
+    def test_detection_and_verification(self):
+        cracker = HashCracker()
+        self.assertEqual([cracker.detect_hash_type(h) for h in (BCRYPT, PBKDF2, SHA512_CRYPT)],
+                         ['bcrypt', 'pbkdf2_sha256', 'sha512_crypt'])
+        self.assertEqual(cracker.detect_hash_type('5f4dcc3b5aa765d61d8327deb882cf99'), 'md5')
+        self.assertIsNone(detect_scheme('5f4dcc3b5aa765d61d8327deb882cf99'))
+        self.assertTrue(cracker.verify_hash('letmein', BCRYPT, 'bcrypt'))
+        self.assertFalse(verify_slow('letmein2', BCRYPT))
+        self.assertTrue(cracker.verify_hash('x', cracker.hash_password('x', 'md5_crypt'), 'md5_crypt'))
+
+    def test_scheduler_cracks_every_scheme(self):
+        candidates = ['123456', 'dragon', 'letmein', 'Password1', 'nothere']
+        targets = [(SHA512_CRYPT, 'sha512_crypt'), (BCRYPT, 'bcrypt'), (PBKDF2, 'pbkdf2_sha256'),
+                   ('$2b$04$malformed', 'bcrypt')]
+        for workers in (1, 2):
+            with contextlib.redirect_stderr(io.StringIO()):
+                results = SlowHashScheduler(workers).run(targets, candidates)
+            self.assertEqual({h: r['password'] for h, r in results.items()},
+                             {SHA512_CRYPT: 'Password1', BCRYPT: 'letmein', PBKDF2: 'dragon',
+                              '$2b$04$malformed': None})
+            self.assertEqual(results[PBKDF2]['attempts'], 2)
+
+    def test_scheduler_streams_candidates_in_windows(self):
+        def candidates():
+            yield from ['a', 'b', 'a', 'c', 'b', 'd', 'dragon']
+            yield from (str(i) for i in itertools.count())  # never materialized
+        for dedupe_bytes, attempts in ((1024, 5), (0, 6)):
+            with contextlib.redirect_stderr(io.StringIO()):
+                results = SlowHashScheduler(1, window=3, dedupe_bytes=dedupe_bytes).run(
+                    [(PBKDF2, 'pbkdf2_sha256')], candidates())
+            self.assertEqual((results[PBKDF2]['password'], results[PBKDF2]['attempts']), ('dragon', attempts))
+
+    def test_crack_hash_routes_crypt_targets(self):
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            result = AdvancedHashCracker().crack_hash(BCRYPT, max_workers=1)
+        self.assertEqual((result['password'], result['hash_type']), ('letmein', 'bcrypt'))
+
+    def test_load_hash_file_keeps_crypt_hashes(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+            f.write(f"alice:{SHA512_CRYPT}:19000:0:99999:7:::\n{BCRYPT}\n")
+            f.write("bob:5F4DCC3B5AA765D61D8327DEB882CF99\n")
+        try:
+            self.assertEqual(load_hash_file(f.name), [SHA512_CRYPT, BCRYPT, '5f4dcc3b5aa765d61d8327deb882cf99'])
+        finally:
+            os.remove(f.name)
+
+if __name__ == '__main__':
+    unittest.main()
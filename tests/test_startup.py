@@ -0,0 +1,41 @@
+"""Tests for CLI and scoring start-up cost"""
+
+import json
+import subprocess
+import sys
+import unittest
+from utils.benchmark import REPO_ROOT, STARTUP_BUDGETS_US, import_time_us
+
+# Modules the entry points must not load until a command needs them
+HEAVY_MODULES = ['tqdm', 'multiprocessing', 'hashlib', 'hash_cracker', 'utils.cracker', 'utils.parallel']
+
+def _loaded_after_import(module):
+    code = f"import sys, json; import {module}; print(json.dumps(sorted(sys.modules)))"
+    completed = subprocess.run([sys.executable, '-c', code], cwd=REPO_ROOT,
+                               capture_output=True, text=True, check=True)
+    return set(json.loads(completed.stdout))
+
+class TestStartup(unittest.TestCase):
+    def test_import_time_budgets(self):
+        for module, budget in STARTUP_BUDGETS_US.items():
+            best = min(import_time_us(module) for _ in range(3))
+            self.assertLess(best, budget, f"import {module} took {best} us")
+
+    def test_auditor_defers_cracking_modules(self):
+        loaded = _loaded_after_import('password_auditor')
+        self.assertEqual([module for module in HEAVY_MODULES if module in loaded], [])
+
+    def test_scoring_is_standalone(self):
+        loaded = _loaded_after_import('utils.scoring')
+        self.assertEqual([module for module in HEAVY_MODULES + ['colorama'] if module in loaded], [])
+
+    def test_scoring_cli(self):
+        completed = subprocess.run([sys.executable, '-m', 'utils.scoring', 'password', 'x9!Lq#2vTz'],
+                                   cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+        results = [json.loads(line) for line in completed.stdout.splitlines()]
+        self.assertEqual([result['id'] for result in results], [0, 1])
+        self.assertTrue(results[0]['is_common'])
+        self.assertFalse(results[1]['is_common'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+"""Tests for memory-mapped target stores"""
+
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from hash_cracker import AdvancedHashCracker
+from utils.cracker import HashCracker
+from utils.digestindex import DigestIndex, write_index
+from utils.parallel import ParallelCracker
+from utils.targetstore import TargetStore, build_store
+
+class TestTargetStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.store_path = os.path.join(self.directory, 'store')
+        self.hash_file = os.path.join(self.directory, 'hashes.txt')
+        self.wordlist = os.path.join(self.directory, 'words.txt')
+        self.cracker = HashCracker()
+        lines = [self.cracker.hash_password(f"user{i}", 'md5') for i in range(3000)]
+        lines += [f"alice:{self.cracker.hash_password('word0042', 'sha1')}",
+                  self.cracker.hash_password('password', 'sha256'),
+                  lines[0].upper(),
+                  'not a hash',
+                  '$2b$04$abcdefghijklmnopqrstuu5GyJsA8XRjXAFMIQjYy4RsdAGW8OOyK']
+        with open(self.hash_file, 'w') as f:
+            f.write('# dump\n' + '\n'.join(lines) + '\n')
+        with open(self.wordlist, 'w') as f:
+            f.write('\n'.join(f"word{i:04d}" for i in range(200)) + '\nuser7\nuser7\nuser2999\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_build_and_lookup(self):
+        stats = build_store(self.hash_file, self.store_path)
+        self.assertEqual(stats['targets'], {'md5': 3000, 'sha1': 1, 'sha256': 1})
+        self.assertEqual((stats['malformed'], stats['salted']), (1, 1))
+
+        with TargetStore(self.store_path) as store:
+            self.assertEqual(len(store), 3002)
+            self.assertIn(self.cracker.hash_password('user2999', 'md5'), store)
+            self.assertIn(self.cracker.hash_password('word0042', 'sha1').upper(), store)
+            self.assertNotIn(self.cracker.hash_password('user3000', 'md5'), store)
+            self.assertNotIn(self.cracker.hash_password('user1', 'sha1'), store)
+            self.assertNotIn('zz' * 16, store)
+            digests = list(store.sets['md5'])
+            self.assertEqual(digests, sorted(digests))
+
+    def test_store_from_all_invalid_hash_file(self):
+        invalid = os.path.join(self.directory, 'invalid.txt')
+        with open(invalid, 'w') as f:
+            f.write('not a hash\n$2b$04$abcdefghijklmnopqrstuu5GyJsA8XRjXAFMIQjYy4RsdAGW8OOyK\n')
+        with self.assertRaisesRegex(ValueError, '1 malformed, 1 salted'):
+            build_store(invalid, self.store_path)
+        self.assertFalse(os.path.exists(self.store_path))
+        # A previous store survives a failed rebuild
+        build_store(self.hash_file, self.store_path)
+        with self.assertRaises(ValueError):
+            build_store(invalid, self.store_path)
+        with TargetStore(self.store_path) as store:
+            self.assertEqual(len(store), 3002)
+        self.assertEqual([name for name in os.listdir(self.directory) if name.startswith('.store-')], [])
+
+    def test_rebuild_replaces_previous_store(self):
+        build_store(self.hash_file, self.store_path)
+        md5_only = os.path.join(self.directory, 'md5.txt')
+        with open(md5_only, 'w') as f:
+            f.write(self.cracker.hash_password('user7', 'md5') + '\n')
+        self.assertEqual(build_store(md5_only, self.store_path)['targets'], {'md5': 1})
+        with TargetStore(self.store_path) as store:
+            self.assertEqual(store.counts(), {'md5': 1})
+            self.assertNotIn(self.cracker.hash_password('password', 'sha256'), store)
+        self.assertEqual(sorted(os.listdir(self.directory)), ['hashes.txt', 'md5.txt', 'store', 'words.txt'])
+
+    def test_store_attack(self):
+        build_store(self.hash_file, self.store_path)
+        with TargetStore(self.store_path) as store:
+            cracked = set()
+            results = self.cracker.store_attack(store, ['nope', 'user7', b'word0042', 'user7'], cracked=cracked)
+            self.assertEqual(sorted(result['password'] for result in results), ['user7', 'word0042'])
+            self.assertEqual(results.candidates, 4)
+            self.assertEqual(results.hashes_computed, 12)
+
+            again = self.cracker.store_attack(store, ['user7', 'password'], cracked=cracked)
+            self.assertEqual([(result['hash_type'], result['password']) for result in again], [('sha256', 'password')])
+            self.assertEqual(again.results[0]['hash'], self.cracker.hash_password('password', 'sha256'))
+
+    def test_parallel_store_attack(self):
+        build_store(self.hash_file, self.store_path)
+        results = ParallelCracker(2).store_attack(self.store_path, self.wordlist)
+        self.assertEqual(sorted(result['password'] for result in results), ['user2999', 'user7', 'word0042'])
+        self.assertEqual(results.candidates, 203)
+
+    def test_crack_store(self):
+        with redirect_stdout(io.StringIO()):
+            build_store(self.hash_file, self.store_path)
+            results = AdvancedHashCracker().crack_store(self.store_path, self.wordlist, max_workers=1)
+        self.assertEqual(sorted(result['password'] for result in results),
+                         ['password', 'user2999', 'user7', 'word0042'])
+
+    def test_small_buckets_only_match_aligned_records(self):
+        path = os.path.join(self.directory, 'tiny.idx')
+        records = [bytes([0, 0, 0, 1]), bytes([0, 0, 2, 3])]
+        write_index(path, records, 4)
+        with DigestIndex(path) as index:
+            self.assertIn(records[1], index)
+            # Found in the mapped bytes at offset 1, straddling both records
+            self.assertNotIn(bytes([0, 0, 1, 0]), index)
+            self.assertNotIn(bytes([0, 0, 1]), index)
+            self.assertNotIn(hashlib.md5().digest(), index)
+
+if __name__ == '__main__':
+    unittest.main()
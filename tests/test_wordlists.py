@@ -0,0 +1,34 @@
+"""Tests for wordlist utilities"""
+
+import os
+import tempfile
+import unittest
+from utils.wordlists import WordlistSource
+
+class TestWordlistSource(unittest.TestCase):
+    def setUp(self):
+        fd, self.wordlist = tempfile.mkstemp(suffix='.txt')
+        self.words = [f"word{i % 3000}" for i in range(5000)]
+        with os.fdopen(fd, 'w') as f:
+            f.write('# comment\n\n' + '\n'.join(self.words))
+    
+    def tearDown(self):
+        os.remove(self.wordlist)
+    
+    def test_streams_bytes_in_file_order(self):
+        source = WordlistSource(self.wordlist)
+        self.assertEqual([word.decode() for word in source], self.words)
+        self.assertEqual(len(source), len(self.words) + 2)
+    
+    def test_dedupe(self):
+        source = WordlistSource(self.wordlist, dedupe_bytes=64 * 1024)
+        self.assertEqual([word.decode() for word in source], self.words[:3000])
+    
+    def test_split_covers_every_line_once(self):
+        words = []
+        for shard in WordlistSource(self.wordlist).split(7):
+            words.extend(word.decode() for word in shard)
+        self.assertEqual(words, self.words)
+
+if __name__ == '__main__':
+    unittest.main()
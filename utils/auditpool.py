@@ -0,0 +1,142 @@
+"""Process-pool batch scoring with bounded, streaming output"""
+
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from io import StringIO
+from itertools import islice
+
+from utils.metrics import Metrics, active
+from utils.patterns import scan_patterns
+from utils.scoring import (CHUNK_SIZE, init_worker, score_chunk, score_many, worker_cache, worker_common,
+                           write_results)
+
+# Chunks queued or running per worker: enough to keep every worker busy
+# while the parent writes, few enough to bound memory on any input size
+IN_FLIGHT = 2
+
+
+def _score_profiled(passwords):
+    """score_many with the auditor's stage timers; returns (results, {name: Histogram})"""
+    metrics = Metrics()
+    common_passwords = metrics.timed_container('audit.common_check', worker_common())
+    scan = metrics.timed('audit.pattern_detection', scan_patterns)
+    timed_chunk = metrics.timed('audit.score_chunk', score_chunk)
+
+    def score(chunk):
+        return timed_chunk(chunk, common_passwords, scan)
+
+    cache = worker_cache()
+    results = cache.score_chunk(passwords, score) if cache is not None else score(passwords)
+    return results, metrics.histograms
+
+
+def _render_chunk(start, passwords, output_format, keep, profile):
+    """Worker entry point: score a chunk and render its rows, numbered from start.
+
+    Rendering happens here because serializing a result costs about as much
+    as scoring it. Returns (start, rows, text, results if keep, busy seconds,
+    stage histograms if profile).
+    """
+    started = time.perf_counter()
+    histograms = None
+    if profile:
+        results, histograms = _score_profiled(passwords)
+    else:
+        results = score_many(passwords)
+    f = StringIO()
+    rows = write_results(enumerate(results, start), f, output_format, header=False)
+    return start, rows, f.getvalue(), results if keep else None, time.perf_counter() - started, histograms
+
+
+class ParallelScorer:
+    """Score a stream of passwords in chunks across a pool of worker processes.
+
+    Every worker opens the common-password list once (a breach index is
+    memory-mapped, so its pages are shared) and, with ``cache_options``,
+    its own ScoreCache (shared through the SQLite file if one is given).
+    At most ``workers * in_flight`` chunks are pending at any time.
+    """
+    def __init__(self, workers=None, chunk_size=CHUNK_SIZE, breach_index=None, cache_options=None,
+                 in_flight=IN_FLIGHT):
+        self.workers = workers or os.cpu_count()
+        self.chunk_size = chunk_size
+        self.breach_index = breach_index
+        self.cache_options = cache_options
+        self.in_flight = in_flight
+        # Totals of the last run, for throughput and utilization reports
+        self.rows = 0
+        self.busy = 0.0
+        self.wall = 0.0
+
+    def _chunks(self, passwords):
+        iterator = iter(passwords)
+        start = 0
+        while True:
+            chunk = list(islice(iterator, self.chunk_size))
+            if not chunk:
+                return
+            yield start, chunk
+            start += len(chunk)
+
+    def render(self, passwords, output_format='jsonl', ordered=True, keep_results=False):
+        """Yield (start, rows, text, results) per chunk.
+
+        ``ordered`` yields chunks in input order; otherwise they come as
+        workers finish them, and only the row ids give the input order.
+        ``results`` is the chunk's result dicts with ``keep_results``, else None.
+        """
+        self.rows = 0
+        self.busy = 0.0
+        started = time.perf_counter()
+        # Workers time their stages only while profiling; the parent merges the histograms
+        metrics = active()
+        limit = self.workers * self.in_flight
+        chunks = self._chunks(passwords)
+        pending = deque()
+        with ProcessPoolExecutor(self.workers, initializer=init_worker,
+                                 initargs=(self.breach_index, self.cache_options)) as executor:
+            while True:
+                while len(pending) < limit:
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        break
+                    pending.append(executor.submit(_render_chunk, *chunk, output_format, keep_results,
+                                                   metrics is not None))
+                if not pending:
+                    break
+                if ordered:
+                    future = pending.popleft()
+                else:
+                    future = next(iter(wait(pending, return_when=FIRST_COMPLETED).done))
+                    pending.remove(future)
+                start, rows, text, results, seconds, histograms = future.result()
+                self.rows += rows
+                self.busy += seconds
+                if histograms is not None:
+                    metrics.merge_histograms(histograms)
+                    metrics.count('audit.passwords', rows)
+                yield start, rows, text, results
+        self.wall = time.perf_counter() - started
+
+        if metrics is not None:
+            metrics.record_workers('audit', self.workers, self.busy, self.wall)
+
+    def write(self, passwords, f, output_format='jsonl', ordered=True, on_results=None):
+        """Score passwords into a file object; returns the row count.
+
+        ``on_results(start, results)`` receives each chunk's result dicts
+        (which are then sent back from the workers as well as the rows).
+        """
+        if output_format == 'csv':
+            write_results((), f, output_format)
+        for start, _, text, results in self.render(passwords, output_format, ordered, on_results is not None):
+            f.write(text)
+            if on_results is not None:
+                on_results(start, results)
+        return self.rows
+
+    def utilization(self):
+        """Fraction of the pool's capacity spent scoring in the last run"""
+        return self.busy / (self.workers * self.wall) if self.wall else 0.0
@@ -0,0 +1,329 @@
+"""Benchmark suite for cracking and auditing performance"""
+
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from itertools import islice
+
+from utils import progress
+from utils.cracker import HashCracker, HASH_FUNCTIONS
+
+DEFAULT_WORDLIST_SIZES = [1000, 10000, 100000]
+DEFAULT_WORKER_COUNTS = [1, 2, 4]
+
+# Entry-point modules timed by bench_startup, with their import-time budgets
+# (best of several runs, µs), enforced by tests/test_startup.py
+STARTUP_BUDGETS_US = {
+    'utils.scoring': 60000,
+    'password_auditor': 100000,
+    'hash_cracker': 150000,
+}
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCORING_PASSWORDS = ['password123', 'SecurePass!2024', 'test', 'qwerty12345', 'Tr0ub4dor&3',
+                     'correcthorsebatterystaple', 'aaaaaaa', 'P@ssw0rd!']
+
+
+def percentile(sorted_values, pct):
+    """Linear-interpolated percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def measure(func, operations=1, repeat=7, warmup=1):
+    """Time func() with warm-up runs and repetitions.
+
+    ``operations`` is the number of units of work one call performs, so the
+    stats come out as per-operation latency (ns) and operations/second.
+    """
+    for _ in range(warmup):
+        func()
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        func()
+        samples.append((time.perf_counter_ns() - start) / operations)
+
+    return _stats(samples, operations)
+
+
+def _stats(samples, operations=1):
+    """Latency statistics (ns per operation) for a list of samples"""
+    samples = sorted(samples)
+    median = statistics.median(samples)
+    return {
+        'operations': operations,
+        'repeat': len(samples),
+        'median_ns': median,
+        'min_ns': samples[0],
+        'max_ns': samples[-1],
+        'p50_ns': percentile(samples, 50),
+        'p90_ns': percentile(samples, 90),
+        'p99_ns': percentile(samples, 99),
+        'ops_per_second': 1e9 / median if median else 0.0,
+    }
+
+
+@contextlib.contextmanager
+def _quiet():
+    """Silence progress bars and report output while timing"""
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        yield
+
+
+def _candidates(count):
+    return [f"candidate{i}".encode('utf-8') for i in range(count)]
+
+
+def bench_hash_throughput(count=100000, repeat=7):
+    """Raw digest throughput per algorithm"""
+    words = _candidates(count)
+    results = {}
+    for algorithm, hash_func in HASH_FUNCTIONS.items():
+        def run():
+            for word in words:
+                hash_func(word).digest()
+        results[algorithm] = measure(run, count, repeat)
+    return results
+
+
+def bench_verify_hash(count=100000, repeat=7):
+    """Legacy verify_hash (hex string) throughput, for comparison with the hot path"""
+    cracker = HashCracker()
+    words = [word.decode('utf-8') for word in _candidates(count)]
+    results = {}
+    for algorithm in HASH_FUNCTIONS:
+        target_hash = cracker.hash_password('not-in-the-list', algorithm)
+
+        def run():
+            for word in words:
+                cracker.verify_hash(word, target_hash, algorithm)
+        results[algorithm] = measure(run, count, repeat)
+    return results
+
+
+def bench_dictionary_attack(sizes=None, algorithm='md5', repeat=5):
+    """dictionary_attack throughput for a miss across several wordlist sizes"""
+    cracker = HashCracker()
+    target_hash = cracker.hash_password('not-in-any-wordlist', algorithm)
+    results = {}
+    for size in sizes or DEFAULT_WORDLIST_SIZES:
+        words = _candidates(size)
+        with _quiet():
+            results[str(size)] = measure(lambda: cracker.dictionary_attack(target_hash, words, algorithm),
+                                         size, repeat)
+    return results
+
+
+def bench_progress(size=200000, algorithm='md5', repeat=5):
+    """Throughput cost of the progress layer: dictionary_attack with bars on vs off.
+
+    ``tqdm_update`` is the per-call cost of the old per-candidate
+    ``pbar.update(1)``, for comparison.
+    """
+    from tqdm import tqdm
+
+    cracker = HashCracker()
+    target_hash = cracker.hash_password('not-in-any-wordlist', algorithm)
+    words = _candidates(size)
+    results = {}
+    with _quiet():
+        for state in ('enabled', 'disabled'):
+            progress.set_enabled(state == 'enabled')
+            try:
+                results[state] = measure(lambda: cracker.dictionary_attack(target_hash, words, algorithm),
+                                         size, repeat)
+            finally:
+                progress.set_enabled(True)
+
+        def updates():
+            with tqdm(total=size) as pbar:
+                for _ in range(size):
+                    pbar.update(1)
+        results['tqdm_update'] = measure(updates, size, repeat)
+
+    disabled = results['disabled']['median_ns']
+    results['overhead_pct'] = (results['enabled']['median_ns'] - disabled) / disabled * 100 if disabled else 0.0
+    return results
+
+
+def bench_rule_attack(algorithm='md5', repeat=7):
+    """rule_based_attack candidates/second for a miss"""
+    cracker = HashCracker()
+    target_hash = cracker.hash_password('not-a-rule-candidate', algorithm)
+    with _quiet():
+        candidates = len(cracker.rule_candidates())
+        return measure(lambda: cracker.rule_based_attack(target_hash, algorithm), candidates, repeat)
+
+
+def bench_scoring(repeat=7, rounds=200):
+    """Per-password latency of calculate_entropy and analyze_password"""
+    from password_auditor import AdvancedPasswordAuditor
+
+    auditor = AdvancedPasswordAuditor()
+    passwords = SCORING_PASSWORDS * rounds
+
+    def entropy():
+        for password in passwords:
+            auditor.calculate_entropy(password)
+
+    def analyze():
+        for password in SCORING_PASSWORDS:
+            auditor.analyze_password(password)
+        auditor.audit_history.clear()
+
+    with _quiet():
+        return {
+            'calculate_entropy': measure(entropy, len(passwords), repeat),
+            'analyze_password': measure(analyze, len(SCORING_PASSWORDS), repeat),
+        }
+
+
+def bench_scaling(workers=None, size=200000, algorithm='md5', repeat=3):
+    """ParallelCracker wordlist throughput at several worker counts"""
+    from utils.parallel import ParallelCracker
+
+    target_hash = HashCracker().hash_password('not-in-the-wordlist', algorithm)
+    fd, path = tempfile.mkstemp(suffix='.txt')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(b'\n'.join(_candidates(size)) + b'\n')
+
+        results = {}
+        for count in workers or DEFAULT_WORKER_COUNTS:
+            cracker = ParallelCracker(count)
+            with _quiet():
+                results[str(count)] = measure(lambda: cracker.wordlist_attack(target_hash, path, algorithm),
+                                              size, repeat, warmup=0)
+        base = results[min(results, key=int)]['ops_per_second']
+        for stats in results.values():
+            stats['speedup'] = stats['ops_per_second'] / base if base else 0.0
+        return results
+    finally:
+        os.remove(path)
+
+
+def bench_audit_scaling(path=None, workers=None, size=100000, repeat=1, breach_index=None):
+    """Batch scoring throughput in-process (1 worker) and across ParallelScorer pools.
+
+    Scores the first ``size`` lines of ``path`` (default: generated
+    passwords) to JSON Lines in a null sink; worker counts default to
+    DEFAULT_WORKER_COUNTS plus every core.
+    """
+    from utils.auditpool import ParallelScorer
+    from utils.scoring import read_passwords, score_passwords, write_results
+
+    if path:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            passwords = list(islice(read_passwords(f), size))
+    else:
+        passwords = [f"{SCORING_PASSWORDS[i % len(SCORING_PASSWORDS)]}{i}" for i in range(size)]
+    if breach_index:
+        from utils.breached import CommonPasswords
+        common_passwords = CommonPasswords(breach_index)
+    else:
+        from utils.wordlists import extended_common_passwords as common_passwords
+
+    results = {}
+    with open(os.devnull, 'w') as sink:
+        for count in workers or sorted({*DEFAULT_WORKER_COUNTS, os.cpu_count() or 1}):
+            if count == 1:
+                run = lambda: write_results(score_passwords(passwords, common_passwords), sink)
+            else:
+                scorer = ParallelScorer(count, breach_index=breach_index)
+                run = lambda scorer=scorer: scorer.write(passwords, sink)
+            results[str(count)] = measure(run, len(passwords), repeat, warmup=0)
+    base = results[min(results, key=int)]['ops_per_second']
+    for stats in results.values():
+        stats['speedup'] = stats['ops_per_second'] / base if base else 0.0
+    return results
+
+
+def import_time_us(module):
+    """Cumulative import time of module in a fresh interpreter (python -X importtime), in µs"""
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                               cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+    for line in completed.stderr.splitlines():
+        fields = line.split('|')
+        if len(fields) == 3 and fields[2].strip() == module:
+            return int(fields[1])
+    raise ValueError(f"No import time reported for {module}")
+
+
+def bench_startup(modules=None, repeat=5):
+    """Import time of each CLI/scoring entry point, one fresh interpreter per sample"""
+    return {module: _stats([import_time_us(module) * 1000 for _ in range(repeat)])
+            for module in modules or STARTUP_BUDGETS_US}
+
+
+def run_benchmarks(quick=False, scaling=True):
+    """Run the full suite and return a JSON-serializable report"""
+    sizes = [1000, 10000] if quick else DEFAULT_WORDLIST_SIZES
+    report = {
+        'metadata': {
+            'generated_at': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+        },
+        'hash_throughput': bench_hash_throughput(10000 if quick else 100000, 3 if quick else 7),
+        'verify_hash': bench_verify_hash(10000 if quick else 100000, 3 if quick else 7),
+        'dictionary_attack': bench_dictionary_attack(sizes, repeat=3 if quick else 5),
+        'rule_based_attack': bench_rule_attack(repeat=3 if quick else 7),
+        'progress': bench_progress(20000 if quick else 200000, repeat=3 if quick else 5),
+        'scoring': bench_scoring(3 if quick else 7, 20 if quick else 200),
+        'startup': bench_startup(repeat=3 if quick else 7),
+    }
+    if scaling:
+        report['scaling'] = bench_scaling(size=20000 if quick else 200000, repeat=1 if quick else 3)
+        report['audit_scaling'] = bench_audit_scaling(size=20000 if quick else 100000, repeat=1 if quick else 3)
+    return report
+
+
+def iter_metrics(report, prefix=''):
+    """Yield (name, stats) for every measurement in a report"""
+    for key, value in report.items():
+        if key == 'metadata' or not isinstance(value, dict):
+            continue
+        name = f"{prefix}{key}"
+        if 'median_ns' in value:
+            yield name, value
+        else:
+            yield from iter_metrics(value, name + '.')
+
+
+def compare_reports(baseline, current, threshold=0.10):
+    """List metrics whose median latency regressed by more than threshold"""
+    baseline_metrics = dict(iter_metrics(baseline))
+    regressions = []
+    for name, stats in iter_metrics(current):
+        previous = baseline_metrics.get(name)
+        if previous and previous['median_ns']:
+            change = stats['median_ns'] / previous['median_ns'] - 1
+            if change > threshold:
+                regressions.append((name, previous['median_ns'], stats['median_ns'], change))
+    return regressions
+
+
+def save_report(report, filepath):
+    with open(filepath, 'w') as f:
+        json.dump(report, f, indent=2)
+
+
+def load_report(filepath):
+    with open(filepath) as f:
+        return json.load(f)
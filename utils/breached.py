@@ -0,0 +1,68 @@
+"""Breached/common-password membership backed by an on-disk digest index"""
+
+import hashlib
+
+from utils.digestindex import DigestIndex, write_index
+from utils.wordlists import extended_common_passwords
+
+# Truncated BLAKE2b digests: 8 bytes keep false positives around n / 2**64
+DEFAULT_WIDTH = 8
+INDEX_KIND = 'blake2b-lower'
+
+
+def password_key(password, width=DEFAULT_WIDTH):
+    """Index key of a password: BLAKE2b of its lowercased UTF-8 form"""
+    if isinstance(password, bytes):
+        password = password.decode('utf-8', 'surrogateescape')
+    return hashlib.blake2b(password.lower().encode('utf-8', 'surrogateescape'), digest_size=width).digest()
+
+
+def corpus_passwords(path):
+    """Stream a breach corpus as raw bytes, one password per line.
+
+    Unlike a cracking wordlist nothing is stripped but the line ending:
+    leading '#' and surrounding whitespace are part of leaked passwords.
+    """
+    with open(path, 'rb') as f:
+        for line in f:
+            line = line.rstrip(b'\r\n')
+            if line:
+                yield line
+
+
+def build_password_index(wordlist, index_path, width=DEFAULT_WIDTH):
+    """Build a breached-password index from a wordlist file; returns the number of distinct entries"""
+    return write_index(index_path, (password_key(word, width) for word in corpus_passwords(wordlist)),
+                       width, INDEX_KIND)
+
+
+class PasswordIndex:
+    """Case-insensitive password membership over an index built by build_password_index"""
+    def __init__(self, path):
+        self.index = DigestIndex(path)
+        if self.index.kind != INDEX_KIND:
+            self.index.close()
+            raise ValueError(f"{path} is not a password index (kind {self.index.kind!r})")
+
+    def __contains__(self, password):
+        return password_key(password, self.index.width) in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def close(self):
+        self.index.close()
+
+
+class CommonPasswords:
+    """The built-in common passwords, extended by an optional breached-password index.
+
+    Supports ``in`` like the plain set, so it can be passed wherever
+    ``common_passwords`` is expected (entries are matched lowercased).
+    """
+    def __init__(self, index=None, base=extended_common_passwords):
+        self.base = base
+        self.index = PasswordIndex(index) if isinstance(index, str) else index
+
+    def __contains__(self, password):
+        return password in self.base or (self.index is not None and password in self.index)
@@ -0,0 +1,74 @@
+"""Checkpoint/resume support for long-running cracking jobs"""
+
+import json
+import os
+import time
+from datetime import datetime
+
+DEFAULT_CHECKPOINT = 'hash_cracker.checkpoint.json'
+
+# Seconds between checkpoint writes
+DEFAULT_INTERVAL = 30.0
+
+CHECKPOINT_VERSION = 1
+
+
+class Checkpoint:
+    """Periodically persisted job state (strategy, position, open targets).
+
+    Attacks report progress through ``update`` at chunk boundaries; the state
+    is only serialized when ``interval`` seconds have passed, so the cost in
+    the hot loop is one clock read per chunk. Field values may be callables,
+    which are resolved only when the checkpoint is actually written. Writes
+    go to a temporary file that is atomically renamed over the checkpoint.
+    """
+    def __init__(self, path=DEFAULT_CHECKPOINT, interval=DEFAULT_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self.state = {}
+        self.writes = 0
+        self._last_write = time.monotonic()
+
+    @staticmethod
+    def load(path=DEFAULT_CHECKPOINT):
+        """Saved state, or None when there is no checkpoint"""
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get('version') != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version in {path}: {state.get('version')}")
+        return state
+
+    def update(self, **fields):
+        """Record progress; writes the checkpoint if the interval has elapsed"""
+        self.state.update(fields)
+        if time.monotonic() - self._last_write >= self.interval:
+            self.save()
+
+    def progress(self, strategy):
+        """Callback for an attack: progress(position, **extra) records the strategy position"""
+        def record(position, **extra):
+            self.update(strategy=strategy, position=position, **extra)
+        return record
+
+    def save(self):
+        state = {key: value() if callable(value) else value for key, value in self.state.items()}
+        state['version'] = CHECKPOINT_VERSION
+        state['updated_at'] = datetime.now().isoformat()
+
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            # Mapping-like values (e.g. CrackResult records) are saved as objects
+            json.dump(state, f, default=dict)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+
+        self.writes += 1
+        self._last_write = time.monotonic()
+
+    def clear(self):
+        """Remove the checkpoint once the job has finished"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -1,10 +1,100 @@
 """Advanced hash cracking utilities"""
 
 import hashlib
-import itertools
-import string
-from tqdm import tqdm
 import time
+from itertools import islice
+
+from utils.ingest import HashTargets, detect_hash_type
+from utils.mask import MaskKeyspace
+from utils.progress import Progress
+from utils.rules import RuleEngine, RuleCandidates, DEFAULT_BASE_WORDS
+from utils.results import CrackResult, CrackResults
+from utils.slowhash import CRYPT_SCHEMES, hash_slow, verify_slow
+
+# hashlib constructors for the supported unsalted algorithms
+HASH_FUNCTIONS = {
+    'md5': hashlib.md5,
+    'sha1': hashlib.sha1,
+    'sha256': hashlib.sha256,
+    'sha512': hashlib.sha512,
+}
+
+# Candidates between progress callbacks in index-addressable attacks, and
+# per batch when an iterable wordlist is consumed
+PROGRESS_BLOCK = 65536
+
+def _as_text(password):
+    """Decode a bytes candidate for display in results"""
+    if isinstance(password, bytes):
+        return password.decode('utf-8', errors='replace')
+    return password
+
+def _as_word(word):
+    """Decode a bytes word for mangling; undecodable bytes round-trip via surrogateescape"""
+    if isinstance(word, bytes):
+        return word.decode('utf-8', errors='surrogateescape')
+    return word
+
+def _chunks(wordlist, progress=None):
+    """Yield (chunk, resume offset) pairs.
+    
+    A WordlistSource with a progress callback is cut into line-aligned byte
+    chunks (the offset is where to resume); any other iterable, including
+    generators, is cut into PROGRESS_BLOCK-item batches with offset None.
+    """
+    if progress is not None and hasattr(wordlist, 'chunks'):
+        for chunk in wordlist.chunks():
+            yield chunk, chunk.end
+        return
+    iterator = iter(wordlist)
+    while True:
+        batch = list(islice(iterator, PROGRESS_BLOCK))
+        if not batch:
+            return
+        yield batch, None
+
+def _length(wordlist):
+    """Total for a progress bar: a callable for sized wordlists, None for generators"""
+    return wordlist.__len__ if hasattr(wordlist, '__len__') else None
+
+def match_store(store, candidates, cracked):
+    """Yield (algorithm, digest, candidate, position) for candidates whose hash is in a TargetStore.
+    
+    Each candidate is hashed once per algorithm in the store; the prefix
+    bitmap is tested inline, so most misses never touch the digest index.
+    Digests in the set ``cracked`` are skipped and new ones are added to it.
+    Positions count from 1 within ``candidates`` (a list).
+    """
+    for algorithm, digests in store.sets.items():
+        hash_func = HASH_FUNCTIONS[algorithm]
+        bitmap, shift, index = digests.bitmap, digests.shift, digests.index
+        for position, password in enumerate(candidates, 1):
+            if isinstance(password, str):
+                password = password.encode('utf-8', 'surrogateescape')
+            digest = hash_func(password).digest()
+            prefix = int.from_bytes(digest[:4], 'big') >> shift
+            if bitmap[prefix >> 3] >> (prefix & 7) & 1 and digest in index and digest not in cracked:
+                cracked.add(digest)
+                yield algorithm, digest, password, position
+
+class _Words:
+    """Re-iterable text view of a wordlist that may yield bytes (chunked too, if the wordlist is)"""
+    def __init__(self, wordlist):
+        self.wordlist = wordlist
+        if hasattr(wordlist, 'chunks'):
+            self.chunks = self._chunks
+    
+    def _chunks(self):
+        for chunk in self.wordlist.chunks():
+            words = _Words(chunk)
+            words.end = chunk.end
+            yield words
+    
+    def __iter__(self):
+        return map(_as_word, self.wordlist)
+    
+    def __len__(self):
+        return len(self.wordlist)
 
 class HashCracker:
     def __init__(self):
@@ -21,126 +111,308 @@ class HashCracker:
             'z': ['z', 'Z', '2']
         }
     
+    def resolve_algorithm(self, algorithm):
+        """Resolve an algorithm name to its hashlib constructor"""
+        try:
+            return HASH_FUNCTIONS[algorithm]
+        except KeyError:
+            raise ValueError(f"Unsupported algorithm: {algorithm}") from None
+    
     def hash_password(self, password, algorithm):
-        """Hash password with specified algorithm"""
-        password = password.encode('utf-8')
-        
-        if algorithm == 'md5':
-            return hashlib.md5(password).hexdigest()
-        elif algorithm == 'sha1':
-            return hashlib.sha1(password).hexdigest()
-        elif algorithm == 'sha256':
-            return hashlib.sha256(password).hexdigest()
-        elif algorithm == 'sha512':
-            return hashlib.sha512(password).hexdigest()
-        else:
-            raise ValueError(f"Unsupported algorithm: {algorithm}")
+        """Hash password (str or bytes) with specified algorithm (salted for crypt schemes)"""
+        if algorithm in CRYPT_SCHEMES:
+            return hash_slow(password, algorithm)
+        if isinstance(password, str):
+            password = password.encode('utf-8')
+        
+        return self.resolve_algorithm(algorithm)(password).hexdigest()
     
     def verify_hash(self, password, target_hash, algorithm):
         """Verify if password matches target hash"""
+        if algorithm in CRYPT_SCHEMES:
+            return verify_slow(password, target_hash, algorithm)
         return self.hash_password(password, algorithm) == target_hash
     
     def detect_hash_type(self, hash_string):
-        """Auto-detect hash type based on length"""
-        length = len(hash_string)
-        
-        if length == 32: return 'md5'
-        elif length == 40: return 'sha1'
-        elif length == 64: return 'sha256'
-        elif length == 128: return 'sha512'
-        else: return 'unknown'
+        """Auto-detect hash type from a modular-crypt prefix, else by hex length"""
+        return detect_hash_type(hash_string)
     
-    def dictionary_attack(self, target_hash, wordlist, hash_type='auto', desc="Cracking"):
-        """Perform dictionary attack with progress bar"""
+    def compile_target(self, target_hash, hash_type='auto'):
+        """Resolve a target to (hash constructor, raw digest) for the hot loops"""
         if hash_type == 'auto':
             hash_type = self.detect_hash_type(target_hash)
         
+        hash_func = self.resolve_algorithm(hash_type)
+        try:
+            target_digest = bytes.fromhex(target_hash.strip())
+        except ValueError:
+            raise ValueError(f"Invalid {hash_type} hash: {target_hash}") from None
+        
+        return hash_func, target_digest
+    
+    def dictionary_attack(self, target_hash, wordlist, hash_type='auto', desc="Cracking", progress=None):
+        """Perform dictionary attack with progress bar.
+        
+        ``wordlist`` may be any iterable, including a generator of unknown
+        length. ``progress(offset)`` is called after each chunk of a
+        WordlistSource with the byte offset the attack can be resumed from.
+        """
+        hash_func, target_digest = self.compile_target(target_hash, hash_type)
+        
         attempts = 0
         start_time = time.time()
         
-        with tqdm(total=len(wordlist), desc=desc, unit="word") as pbar:
-            for password in wordlist:
-                attempts += 1
-                if self.verify_hash(password, target_hash, hash_type):
-                    return {
-                        'cracked': True,
-                        'password': password,
-                        'attempts': attempts,
-                        'time': time.time() - start_time,
-                        'method': 'dictionary'
-                    }
-                pbar.update(1)
-        
-        return {
-            'cracked': False,
-            'password': None,
-            'attempts': attempts,
-            'time': time.time() - start_time,
-            'method': 'dictionary'
-        }
+        with Progress(_length(wordlist), desc=desc, unit="word") as bar:
+            for chunk, offset in _chunks(wordlist, progress):
+                for password in chunk:
+                    attempts += 1
+                    candidate = password.encode('utf-8', 'surrogateescape') if password.__class__ is str else password
+                    if hash_func(candidate).digest() == target_digest:
+                        bar.update_to(attempts)
+                        return CrackResult(
+                            cracked=True,
+                            password=_as_text(password),
+                            attempts=attempts,
+                            time=time.time() - start_time,
+                            method='dictionary'
+                        )
+                bar.update_to(attempts)
+                if offset is not None:
+                    progress(offset)
+        
+        return CrackResult(
+            cracked=False,
+            password=None,
+            attempts=attempts,
+            time=time.time() - start_time,
+            method='dictionary'
+        )
     
-    def rule_based_attack(self, target_hash, hash_type='auto', max_length=6):
-        """Rule-based attack with common password patterns"""
-        if hash_type == 'auto':
-            hash_type = self.detect_hash_type(target_hash)
+    def batch_dictionary_attack(self, target_hashes, wordlist, hash_type='auto', desc="Batch cracking",
+                                method='dictionary', progress=None):
+        """Dictionary attack against many hashes at once.
+
+        Targets are grouped by algorithm and indexed by raw digest, so every
+        candidate is hashed once per algorithm instead of once per target.
+        ``target_hashes`` is a list of hash strings or an ingested HashTargets.
+        Returns a CrackResults holding one result per distinct target hash.
+        ``progress(offset, cracked=...)`` is called after each chunk of a
+        WordlistSource; ``cracked`` lazily lists the results cracked so far.
+        """
+        start_time = time.time()
+        
+        if not isinstance(target_hashes, HashTargets):
+            target_hashes = HashTargets.from_hashes(target_hashes, hash_type)
+        
+        # Group targets by algorithm: {algorithm: {digest_bytes: hex_hash}}
+        groups = target_hashes.buckets()
+        order = list(target_hashes)
+        results = {}
+        for target_hash, (algorithm, digest) in target_hashes.entries.items():
+            if digest is None or algorithm not in HASH_FUNCTIONS:
+                results[target_hash] = self._batch_result(target_hash, algorithm, None, 0, start_time, method)
+        
+        total = (lambda: len(wordlist) * len(groups)) if hasattr(wordlist, '__len__') else None
+        attempts = dict.fromkeys(groups, 0)
+        
+        with Progress(total, desc=desc, unit="word") as bar:
+            # Chunk-major, so one resume offset covers every algorithm group
+            for chunk, offset in _chunks(wordlist, progress):
+                for algorithm, pending in groups.items():
+                    if not pending:
+                        continue
+                    hash_func = HASH_FUNCTIONS[algorithm]
+                    count = attempts[algorithm]
+                    for password in chunk:
+                        count += 1
+                        if isinstance(password, str):
+                            password = password.encode('utf-8', 'surrogateescape')
+                        target_hash = pending.pop(hash_func(password).digest(), None)
+                        if target_hash is not None:
+                            results[target_hash] = self._batch_result(
+                                target_hash, algorithm, _as_text(password), count, start_time, method
+                            )
+                            if not pending:
+                                break
+                    attempts[algorithm] = count
+                bar.update_to(sum(attempts.values()))
+                
+                if not any(groups.values()):
+                    break
+                if offset is not None:
+                    progress(offset, cracked=lambda: [result for result in results.values() if result.cracked])
+            
+            for algorithm, pending in groups.items():
+                for target_hash in pending.values():
+                    results[target_hash] = self._batch_result(
+                        target_hash, algorithm, None, attempts[algorithm], start_time, method
+                    )
+        
+        crack_results = CrackResults()
+        for target_hash in order:
+            crack_results.add_result(results[target_hash])
+        crack_results.candidates = max(attempts.values(), default=0)
+        crack_results.hashes_computed = sum(attempts.values())
+        return crack_results
+    
+    def store_attack(self, store, wordlist, desc="Store cracking", method='dictionary', cracked=None,
+                     progress=None):
+        """Dictionary attack against a TargetStore (utils.targetstore) of any size.
+        
+        Targets stay in the memory-mapped store, so unlike
+        batch_dictionary_attack only cracked targets get a result. ``cracked``
+        is a set of raw digests already cracked; they are not reported again
+        and it is updated in place. ``progress(offset)`` is called after each
+        chunk of a WordlistSource.
+        """
+        start_time = time.time()
+        cracked = set() if cracked is None else cracked
+        results = CrackResults()
+        total = (lambda: len(wordlist) * len(store.sets)) if hasattr(wordlist, '__len__') else None
+        attempts = 0
+        
+        with Progress(total, desc=desc, unit="word") as bar:
+            for chunk, offset in _chunks(wordlist, progress):
+                if not isinstance(chunk, list):
+                    chunk = list(chunk)
+                for algorithm, digest, password, position in match_store(store, chunk, cracked):
+                    results.add_result(self._batch_result(
+                        digest.hex(), algorithm, _as_text(password), attempts + position, start_time, method
+                    ))
+                attempts += len(chunk)
+                bar.update_to(attempts * len(store.sets))
+                if offset is not None:
+                    progress(offset)
+        
+        results.candidates = attempts
+        results.hashes_computed = attempts * len(store.sets)
+        # Every candidate was tried against every target, as in a full batch
+        results.total_attempts = attempts * len(store)
+        return results
+    
+    def _batch_result(self, target_hash, algorithm, password, attempts, start_time, method):
+        """Build a per-target result record for batch attacks"""
+        return CrackResult(
+            hash=target_hash,
+            hash_type=algorithm,
+            cracked=password is not None,
+            password=password,
+            attempts=attempts,
+            time=time.time() - start_time,
+            method=method
+        )
+    
+    def rule_engine(self, rules=None):
+        """RuleEngine for a rules file path, a list of rules, or the bundled defaults plus leet rules"""
+        if rules is None:
+            return RuleEngine.default(self.common_leet_map)
+        if isinstance(rules, RuleEngine):
+            return rules
+        if isinstance(rules, str):
+            return RuleEngine.from_file(rules)
+        return RuleEngine(rules)
+    
+    def rule_candidates(self, wordlist=None, rules=None, max_length=None):
+        """Lazily yield rule-based candidates, in keyspace order"""
+        words = DEFAULT_BASE_WORDS if wordlist is None else _Words(wordlist)
+        return RuleCandidates(self.rule_engine(rules), words, max_length)
+    
+    def rule_based_attack(self, target_hash, hash_type='auto', max_length=None, wordlist=None, rules=None,
+                          start=0, progress=None):
+        """Rule-based attack: apply mangling rules to a wordlist (default: common base words).
+        
+        ``progress(position)`` reports where the attack can be resumed: the byte
+        offset for a WordlistSource, otherwise the index of the next base word
+        (which ``start`` skips to).
+        """
+        hash_func, target_digest = self.compile_target(target_hash, hash_type)
+        engine = self.rule_engine(rules)
+        words = DEFAULT_BASE_WORDS if wordlist is None else wordlist
+        if start:
+            words = words[start:]
         
         attempts = 0
         start_time = time.time()
         
-        # Common base words
-        base_words = ['password', 'admin', 'test', 'guest', '123', 'qwerty']
-        
-        # Common suffixes and prefixes
-        suffixes = ['', '1', '12', '123', '!', '!!', '2024', '2023']
-        prefixes = ['', '1', '12', '!']
-        
-        total_combinations = len(base_words) * len(suffixes) * len(prefixes)
-        
-        with tqdm(total=total_combinations, desc="Rule-based", unit="combo") as pbar:
-            for base in base_words:
-                for prefix in prefixes:
-                    for suffix in suffixes:
-                        attempts += 1
-                        
-                        # Try different combinations
-                        candidates = [
-                            prefix + base + suffix,
-                            base.capitalize() + suffix,
-                            base.upper() + suffix,
-                        ]
-                        
-                        for candidate in candidates:
-                            if self.verify_hash(candidate, target_hash, hash_type):
-                                return {
-                                    'cracked': True,
-                                    'password': candidate,
-                                    'attempts': attempts,
-                                    'time': time.time() - start_time,
-                                    'method': 'rule-based'
-                                }
-                        
-                        pbar.update(1)
-        
-        return {
-            'cracked': False,
-            'password': None,
-            'attempts': attempts,
-            'time': time.time() - start_time,
-            'method': 'rule-based'
-        }
+        if hasattr(words, 'chunks'):
+            chunks = _chunks(words, progress)
+        else:
+            # Base words: every word is its own resume point
+            chunks = (([word], start + i + 1) for i, word in enumerate(words))
+        
+        with Progress(lambda: engine.keyspace(words), desc="Rule-based", unit="cand") as bar:
+            for chunk, position in chunks:
+                for word in chunk:
+                    for head, suffixes in engine.expand(_as_word(word)):
+                        # Hash each shared head once; candidates only add their suffix
+                        seeded = hash_func(head.encode('utf-8', 'surrogateescape'))
+                        for suffix in suffixes:
+                            attempts += 1
+                            if max_length is not None and len(head) + len(suffix) > max_length:
+                                continue
+                            state = seeded.copy()
+                            state.update(suffix.encode('utf-8', 'surrogateescape'))
+                            if state.digest() == target_digest:
+                                bar.update_to(attempts)
+                                return CrackResult(
+                                    cracked=True,
+                                    password=_as_text((head + suffix).encode('utf-8', 'surrogateescape')),
+                                    attempts=attempts,
+                                    time=time.time() - start_time,
+                                    method='rule-based'
+                                )
+                bar.update_to(attempts)
+                if progress is not None and position is not None:
+                    progress(position)
+        
+        return CrackResult(
+            cracked=False,
+            password=None,
+            attempts=attempts,
+            time=time.time() - start_time,
+            method='rule-based'
+        )
 
-class CrackResults:
-    """Store and manage cracking results"""
-    def __init__(self):
-        self.results = []
-        self.successful_cracks = 0
-        self.total_attempts = 0
-    
-    def add_result(self, result):
-        self.results.append(result)
-        self.total_attempts += result['attempts']
-        if result['cracked']:
-            self.successful_cracks += 1
-    
-    def get_success_rate(self):
-        return (self.successful_cracks / len(self.results)) * 100 if self.results else 0
+    def mask_attack(self, target_hash, mask, hash_type='auto', start=0, end=None, custom_charsets=None,
+                    progress=None, deadline=None):
+        """Brute-force the keyspace of a mask (e.g. '?u?l?l?l?d?d'), optionally from a saved index.
+        
+        ``progress(index)`` is called every PROGRESS_BLOCK candidates with the
+        keyspace index the attack can be resumed from. With a ``deadline``
+        (utils.scheduler.Deadline) the attack stops at the first block
+        boundary after it passes and returns uncracked.
+        """
+        hash_func, target_digest = self.compile_target(target_hash, hash_type)
+        keyspace = mask if isinstance(mask, MaskKeyspace) else MaskKeyspace(mask, custom_charsets)
+        end = len(keyspace) if end is None else min(end, len(keyspace))
+        
+        attempts = 0
+        start_time = time.time()
+        
+        with Progress(max(0, end - start), desc="Mask", unit="cand") as bar:
+            for block_start in range(start, end, PROGRESS_BLOCK):
+                block_end = min(block_start + PROGRESS_BLOCK, end)
+                for candidate in keyspace.iter_range(block_start, block_end):
+                    attempts += 1
+                    if hash_func(candidate).digest() == target_digest:
+                        bar.update_to(attempts)
+                        return CrackResult(
+                            cracked=True,
+                            password=_as_text(bytes(candidate)),
+                            attempts=attempts,
+                            time=time.time() - start_time,
+                            method='mask'
+                        )
+                bar.update_to(attempts)
+                if progress:
+                    progress(block_end)
+                if deadline is not None and deadline.expired():
+                    break
+        
+        return CrackResult(
+            cracked=False,
+            password=None,
+            attempts=attempts,
+            time=time.time() - start_time,
+            method='mask'
+        )
@@ -0,0 +1,183 @@
+"""Sorted fixed-width digest files, searched in place through mmap"""
+
+import array
+import heapq
+import mmap
+import os
+import struct
+import tempfile
+from bisect import bisect_left
+
+MAGIC = b'PRADIDX1'
+VERSION = 1
+
+# magic, version, record width, record count, records offset, table offset, kind
+_HEADER = struct.Struct('<8sIIQQQ16s')
+HEADER_SIZE = 64
+
+# Records are bucketed by their first two bytes
+PREFIX_BUCKETS = 1 << 16
+
+# Digests sorted in memory per run of the external sort
+RUN_RECORDS = 1 << 20
+
+# Buckets up to this many records are searched with one mmap.find instead of bisect
+SCAN_RECORDS = 256
+
+
+class _Records:
+    """Sequence view of the fixed-width records in a mapped file, for bisect"""
+    def __init__(self, mm, offset, width, count):
+        self.mm = mm
+        self.offset = offset
+        self.width = width
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        start = self.offset + index * self.width
+        return self.mm[start:start + self.width]
+
+
+def read_records(path, width):
+    """Stream the fixed-width records of a raw digest file"""
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(width * 4096)
+            if not block:
+                return
+            for start in range(0, len(block), width):
+                yield block[start:start + width]
+
+
+def write_index(path, digests, width, kind=''):
+    """Write an index of digests (bytes of length width); returns the number of distinct records.
+
+    Input of any size is handled with an external merge sort: runs of
+    RUN_RECORDS digests are sorted in memory and spilled to temporary
+    files, then merged and deduplicated while streaming to ``path``.
+    """
+    if width < 2:
+        raise ValueError("Digest index records must be at least 2 bytes wide")
+    runs = []
+    temp_dir = tempfile.mkdtemp(prefix='digestindex-')
+    try:
+        run = []
+        for digest in digests:
+            if len(digest) != width:
+                raise ValueError(f"Digest of {len(digest)} bytes in a {width}-byte index")
+            run.append(digest)
+            if len(run) == RUN_RECORDS:
+                runs.append(_spill(run, temp_dir, len(runs)))
+                run = []
+        run.sort()
+
+        merged = heapq.merge(run, *(read_records(run_path, width) for run_path in runs))
+        counts = array.array('Q', bytes(8 * PREFIX_BUCKETS))
+        count = 0
+        previous = None
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(bytes(HEADER_SIZE))
+            buffer = []
+            for digest in merged:
+                if digest == previous:
+                    continue
+                previous = digest
+                counts[int.from_bytes(digest[:2], 'big')] += 1
+                count += 1
+                buffer.append(digest)
+                if len(buffer) == 65536:
+                    f.write(b''.join(buffer))
+                    buffer = []
+            f.write(b''.join(buffer))
+
+            # table[p] is the index of the first record with prefix p; table[-1] == count
+            table = array.array('Q', [0])
+            for bucket in counts:
+                table.append(table[-1] + bucket)
+            table_offset = f.tell()
+            f.write(table.tobytes())
+
+            f.seek(0)
+            f.write(_HEADER.pack(MAGIC, VERSION, width, count, HEADER_SIZE, table_offset,
+                                 kind.encode('ascii')[:16]))
+        os.replace(temp_path, path)
+        return count
+    finally:
+        for run_path in runs:
+            os.remove(run_path)
+        os.rmdir(temp_dir)
+
+
+def _spill(run, temp_dir, number):
+    run.sort()
+    path = os.path.join(temp_dir, f"run{number}")
+    with open(path, 'wb') as f:
+        f.write(b''.join(run))
+    return path
+
+
+class DigestIndex:
+    """Read-only membership test over a file written by write_index.
+
+    The file is memory-mapped, so opening it only reads the header and the
+    prefix table, and processes opening the same file share its pages.
+    A lookup is a table read plus a search within one prefix bucket: a
+    single ``find`` over the mapped bytes for small buckets, else a bisect.
+    """
+    def __init__(self, path):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Index file not found: {path}")
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, width, count, records_offset, table_offset, kind = _HEADER.unpack_from(self._mm)
+        if magic != MAGIC or version != VERSION:
+            self._mm.close()
+            raise ValueError(f"Not a digest index (or unsupported version): {path}")
+        self.width = width
+        self.kind = kind.rstrip(b'\0').decode('ascii')
+        self._count = count
+        self._offset = records_offset
+        self._table = array.array('Q')
+        self._table.frombytes(self._mm[table_offset:table_offset + 8 * (PREFIX_BUCKETS + 1)])
+        self._records = _Records(self._mm, records_offset, width, count)
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, digest):
+        prefix = int.from_bytes(digest[:2], 'big')
+        lo, hi = self._table[prefix], self._table[prefix + 1]
+        if lo == hi:
+            return False
+        if hi - lo <= SCAN_RECORDS:
+            width = self.width
+            if len(digest) != width:
+                return False
+            start = self._offset + lo * width
+            end = self._offset + hi * width
+            position = self._mm.find(digest, start, end)
+            # A match straddling two records is not a hit; look past it
+            while position != -1 and (position - start) % width:
+                position = self._mm.find(digest, position + 1, end)
+            return position != -1
+        position = bisect_left(self._records, digest, lo, hi)
+        return position < hi and self._records[position] == digest
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield self._records[index]
+
+    def close(self):
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
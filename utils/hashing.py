@@ -2,6 +2,7 @@
 
 import hashlib
 import binascii
+from utils.ingest import HashTargets
 
 def compute_hashes(password):
     """Compute multiple hash types for a password"""
@@ -36,3 +37,7 @@ def hash_password(password, algorithm='sha256'):
 
 # Supported hash types
 hash_types = ['md5', 'sha1', 'sha256', 'sha512']
+
+def load_hash_file(filepath, hash_type='auto'):
+    """Unique target hashes from a file (bare hex, 'user:hash', 'LABEL: hash (note)' or modular-crypt lines)"""
+    return list(HashTargets.from_file(filepath, hash_type))
@@ -0,0 +1,122 @@
+"""Audit history: running summary aggregates plus an append-only JSON Lines log"""
+
+import json
+import time
+from collections import Counter, deque
+from datetime import datetime
+
+# Audit records kept in memory (the newest ones); the log file keeps them all
+HISTORY_KEEP = 1000
+
+# Seconds between flushes of the log file
+FLUSH_INTERVAL = 1.0
+
+STRONG_LABELS = ('Strong', 'Very Strong')
+WEAK_LABELS = ('Very Weak', 'Weak')
+
+
+def pattern_kind(pattern):
+    """The rule part of a reported pattern ("Keyboard walk: 'qaz'" -> "Keyboard walk")"""
+    return pattern.split(':', 1)[0]
+
+
+def audit_record(result, timestamp=None):
+    """History record for a scoring result (see utils.scoring.score_chunk)"""
+    return {
+        'timestamp': timestamp or datetime.now().isoformat(),
+        'password_length': result['length'],
+        'entropy': result['entropy'],
+        'strength': result['strength'],
+        'analysis': {
+            'char_categories': result['char_categories'],
+            'is_common': result['is_common'],
+            'patterns': result['patterns']
+        }
+    }
+
+
+class AuditHistory:
+    """Audit records summarized in O(1) memory.
+
+    Each record updates running aggregates (count, entropy sum, strength and
+    pattern-kind histograms) and, when ``path`` is given, is appended to that
+    JSON Lines file. Only the newest ``keep`` records stay in memory, so a
+    report can be written at any time without reloading the log.
+    """
+    def __init__(self, path=None, keep=HISTORY_KEEP):
+        self.path = path
+        self.recent = deque(maxlen=keep)
+        self._log = open(path, 'a', encoding='utf-8') if path else None
+        self._flushed = time.monotonic()
+        self.clear()
+
+    def clear(self):
+        """Forget the in-memory records and reset the aggregates (the log file is kept)"""
+        self.recent.clear()
+        self.count = 0
+        self.entropy_total = 0.0
+        self.common = 0
+        self.strengths = Counter()
+        self.patterns = Counter()
+
+    def append(self, record):
+        """Add one audit record"""
+        analysis = record['analysis']
+        self.recent.append(record)
+        self.count += 1
+        self.entropy_total += record['entropy']
+        self.common += analysis['is_common']
+        self.strengths[record['strength']] += 1
+        if analysis['patterns']:
+            self.patterns.update({pattern_kind(pattern) for pattern in analysis['patterns']})
+
+        if self._log:
+            self._log.write(json.dumps(record) + '\n')
+            now = time.monotonic()
+            if now - self._flushed >= FLUSH_INTERVAL:
+                self._log.flush()
+                self._flushed = now
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return iter(self.recent)
+
+    def summary(self):
+        """Report summary from the running aggregates"""
+        return {
+            'average_entropy': self.entropy_total / self.count if self.count else 0.0,
+            'strong_passwords': sum(self.strengths[label] for label in STRONG_LABELS),
+            'weak_passwords': sum(self.strengths[label] for label in WEAK_LABELS),
+            'common_passwords': self.common,
+            'strength_histogram': dict(self.strengths),
+            'pattern_counts': dict(self.patterns.most_common())
+        }
+
+    def write_report(self, filename, metadata):
+        """Write the JSON report: metadata, summary and the in-memory records, streamed one at a time"""
+        self.flush()
+        metadata = dict(metadata, total_audits=self.count, audits_included=len(self.recent))
+        if self.path:
+            metadata['history_file'] = self.path
+
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write('{\n  "metadata": ' + json.dumps(metadata) + ',\n')
+            f.write('  "summary": ' + json.dumps(self.summary()) + ',\n')
+            f.write('  "audits": [')
+            separator = '\n    '
+            for record in self.recent:
+                f.write(separator + json.dumps(record))
+                separator = ',\n    '
+            f.write('\n  ]\n}\n')
+
+    def flush(self):
+        if self._log:
+            self._log.flush()
+            self._flushed = time.monotonic()
+
+    def close(self):
+        if self._log:
+            self._log.close()
+            self._log = None
@@ -0,0 +1,182 @@
+"""Streaming hash-file ingestion: parse, normalise, deduplicate and bucket targets"""
+
+import os
+from utils.slowhash import CRYPT_SCHEMES, detect_scheme
+
+# Hex digest length -> unsalted algorithm
+HEX_LENGTHS = {32: 'md5', 40: 'sha1', 64: 'sha256', 128: 'sha512'}
+DIGEST_HEX = {algorithm: length for length, algorithm in HEX_LENGTHS.items()}
+
+# Line labels naming the algorithm ('SHA1: <hex> (note)')
+LABELS = {
+    'md5': 'md5',
+    'sha1': 'sha1', 'sha-1': 'sha1',
+    'sha256': 'sha256', 'sha-256': 'sha256',
+    'sha512': 'sha512', 'sha-512': 'sha512',
+}
+
+# Malformed lines kept for the report (every one is counted)
+MAX_REPORTED = 10
+
+
+def detect_hash_type(hash_string):
+    """Hash type from a modular-crypt prefix, else by hex length ('unknown' if neither)"""
+    return detect_scheme(hash_string) or HEX_LENGTHS.get(len(hash_string), 'unknown')
+
+
+def parse_hash_line(line, hash_type='auto'):
+    """Parse one line into (hash, algorithm, digest), or None for blank and comment lines.
+
+    Accepts bare hex, 'user:hash', 'LABEL: hash (note)' and modular-crypt
+    hashes (alone, after 'user:' or in a shadow line). Hex hashes are
+    lowercased and decoded to their raw digest; modular-crypt hashes keep
+    their case and have no digest. Raises ValueError for anything else.
+    """
+    line = line.strip()
+    if not line or line.startswith('#'):
+        return None
+
+    fields = line.split(':')
+    for field in fields if '$' in line else ():
+        if field.startswith('$'):
+            crypt = field.split()[0]
+            scheme = detect_scheme(crypt)
+            if scheme is None:
+                raise ValueError("unsupported modular-crypt scheme")
+            if hash_type not in ('auto', scheme):
+                raise ValueError(f"{scheme} hash, expected {hash_type}")
+            return crypt, scheme, None
+
+    # The hash is the first field starting with a digest-length run of hex;
+    # a preceding field may name the algorithm
+    for position, field in enumerate(fields):
+        tokens = field.split(None, 1)
+        if tokens and len(tokens[0]) in HEX_LENGTHS:
+            token = tokens[0]
+            try:
+                digest = bytes.fromhex(token)
+            except ValueError:
+                continue
+            break
+    else:
+        raise ValueError("no hex digest of a supported length")
+
+    algorithm = HEX_LENGTHS[len(token)]
+    named = hash_type if hash_type != 'auto' else LABELS.get(fields[position - 1].strip().lower()) if position else None
+    if named is not None and named != algorithm:
+        raise ValueError(f"{len(token)} hex digits, expected {named}")
+    return token.lower(), algorithm, digest
+
+
+class HashTargets:
+    """Unique cracking targets in first-seen order, each decoded once.
+
+    ``entries`` maps each hash to (algorithm, digest); the digest is None
+    for modular-crypt hashes and for targets no attack supports. Lines,
+    duplicates and malformed lines are counted, and the first MAX_REPORTED
+    malformed lines are kept as (line number, reason, text).
+    """
+    def __init__(self):
+        self.entries = {}
+        self.lines = 0
+        self.duplicates = 0
+        self.malformed = 0
+        self.errors = []
+
+    @classmethod
+    def from_lines(cls, lines, hash_type='auto'):
+        """Ingest an iterable of lines, one at a time"""
+        targets = cls()
+        for number, line in enumerate(lines, 1):
+            targets.lines = number
+            try:
+                parsed = parse_hash_line(line, hash_type)
+            except ValueError as e:
+                targets.reject(number, str(e), line)
+                continue
+            if parsed is not None:
+                targets.add(*parsed)
+        return targets
+
+    @classmethod
+    def from_file(cls, filepath, hash_type='auto'):
+        """Stream a hash file; memory grows with the unique targets, not the file size"""
+        if not os.path.exists(filepath):
+            raise FileNotFoundError(f"Hash file not found: {filepath}")
+        with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
+            return cls.from_lines(f, hash_type)
+
+    @classmethod
+    def from_hashes(cls, hashes, hash_type='auto'):
+        """Targets from bare hash strings; unusable ones are kept without a digest"""
+        targets = cls()
+        for target_hash in hashes:
+            target_hash = target_hash.strip()
+            if detect_scheme(target_hash) is None:
+                target_hash = target_hash.lower()
+            if target_hash in targets.entries:
+                targets.duplicates += 1
+                continue
+            algorithm = detect_hash_type(target_hash) if hash_type == 'auto' else hash_type
+            digest = None
+            if DIGEST_HEX.get(algorithm) == len(target_hash):
+                try:
+                    digest = bytes.fromhex(target_hash)
+                except ValueError:
+                    pass
+            targets.entries[target_hash] = (algorithm, digest)
+        return targets
+
+    def add(self, target_hash, algorithm, digest=None):
+        """Add a target; returns False (and counts it) if it is a duplicate"""
+        if target_hash in self.entries:
+            self.duplicates += 1
+            return False
+        self.entries[target_hash] = (algorithm, digest)
+        return True
+
+    def reject(self, line_number, reason, line):
+        self.malformed += 1
+        if len(self.errors) < MAX_REPORTED:
+            self.errors.append((line_number, reason, line.strip()))
+
+    def algorithm(self, target_hash):
+        return self.entries[target_hash][0]
+
+    def fast(self):
+        """Targets for the unsalted batch attacks"""
+        return [target_hash for target_hash, (_, digest) in self.entries.items() if digest is not None]
+
+    def slow(self):
+        """Salted modular-crypt targets"""
+        return [target_hash for target_hash, (algorithm, _) in self.entries.items() if algorithm in CRYPT_SCHEMES]
+
+    def subset(self, hashes):
+        """A HashTargets restricted to hashes (already ingested, so nothing is re-parsed)"""
+        targets = HashTargets()
+        targets.entries = {target_hash: self.entries[target_hash] for target_hash in hashes}
+        return targets
+
+    def buckets(self):
+        """Decoded targets by algorithm: {algorithm: {digest: hash}}"""
+        groups = {}
+        for target_hash, (algorithm, digest) in self.entries.items():
+            if digest is not None:
+                groups.setdefault(algorithm, {})[digest] = target_hash
+        return groups
+
+    def counts(self):
+        """Unique targets per algorithm"""
+        totals = {}
+        for algorithm, _ in self.entries.values():
+            totals[algorithm] = totals.get(algorithm, 0) + 1
+        return totals
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __contains__(self, target_hash):
+        return target_hash in self.entries
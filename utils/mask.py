@@ -0,0 +1,143 @@
+"""Mask (brute-force) keyspaces with index-addressable candidates"""
+
+import string
+
+# Built-in charsets, hashcat-compatible
+CHARSETS = {
+    'l': string.ascii_lowercase,
+    'u': string.ascii_uppercase,
+    'd': string.digits,
+    'h': '0123456789abcdef',
+    'H': '0123456789ABCDEF',
+    's': ' ' + string.punctuation,
+}
+CHARSETS['a'] = CHARSETS['l'] + CHARSETS['u'] + CHARSETS['d'] + CHARSETS['s']
+
+
+def _expand_charset(text, custom=None):
+    """Expand '?x' references inside a custom charset definition"""
+    chars = []
+    i = 0
+    while i < len(text):
+        if text[i] == '?' and i + 1 < len(text):
+            key = text[i + 1]
+            if key == '?':
+                chars.append('?')
+            elif key in CHARSETS:
+                chars.extend(CHARSETS[key])
+            elif custom and key in custom:
+                chars.extend(custom[key])
+            else:
+                raise ValueError(f"Unknown charset ?{key} in {text!r}")
+            i += 2
+        else:
+            chars.append(text[i])
+            i += 1
+    return ''.join(dict.fromkeys(chars))
+
+
+def _to_bytes(chars):
+    try:
+        return chars.encode('latin-1')
+    except UnicodeEncodeError:
+        raise ValueError(f"Mask charsets must be single-byte characters: {chars!r}") from None
+
+
+class MaskKeyspace:
+    """The candidates described by a mask such as '?u?l?l?l?d?d'.
+
+    Positions are '?l', '?u', '?d', '?h', '?H', '?s', '?a', custom '?1'-'?4'
+    (from ``custom_charsets``), '??' for a literal '?', or any literal
+    character. Candidates are ordered like an odometer (last position fastest),
+    so candidate N can be computed directly and ranges split exactly.
+    """
+    def __init__(self, mask, custom_charsets=None):
+        custom = {}
+        for key, definition in (custom_charsets or {}).items():
+            custom[str(key)] = _expand_charset(definition)
+
+        positions = []
+        i = 0
+        while i < len(mask):
+            if mask[i] == '?' and i + 1 < len(mask):
+                key = mask[i + 1]
+                if key == '?':
+                    positions.append('?')
+                elif key in CHARSETS:
+                    positions.append(CHARSETS[key])
+                elif key in custom:
+                    positions.append(custom[key])
+                else:
+                    raise ValueError(f"Unknown charset ?{key} in mask {mask!r}")
+                i += 2
+            else:
+                positions.append(mask[i])
+                i += 1
+
+        if not positions or not all(positions):
+            raise ValueError(f"Empty mask position in {mask!r}")
+
+        self.mask = mask
+        self.charsets = [_to_bytes(chars) for chars in positions]
+        self._size = 1
+        for charset in self.charsets:
+            self._size *= len(charset)
+
+    def __len__(self):
+        return self._size
+
+    def _digits(self, index):
+        """Per-position charset indices of candidate index"""
+        if not 0 <= index < self._size:
+            raise IndexError(f"Mask index {index} out of range")
+        digits = []
+        for charset in reversed(self.charsets):
+            index, digit = divmod(index, len(charset))
+            digits.append(digit)
+        digits.reverse()
+        return digits
+
+    def candidate(self, index):
+        """Candidate number index, as bytes"""
+        return bytes(charset[digit] for charset, digit in zip(self.charsets, self._digits(index)))
+
+    def iter_range(self, start=0, end=None):
+        """Yield candidates start..end-1 into one reused bytearray.
+
+        The same buffer is mutated in place and yielded each time, so callers
+        must copy it (``bytes(buf)``) if they keep a candidate.
+        """
+        end = self._size if end is None else min(end, self._size)
+        if start >= end:
+            return
+
+        charsets = self.charsets
+        digits = self._digits(start)
+        buf = bytearray(charset[digit] for charset, digit in zip(charsets, digits))
+        last = len(charsets) - 1
+        last_charset = charsets[last]
+        remaining = end - start
+
+        while True:
+            # Sweep the fastest position straight from its charset
+            first = digits[last]
+            count = min(len(last_charset) - first, remaining)
+            for char in last_charset[first:first + count]:
+                buf[last] = char
+                yield buf
+            remaining -= count
+            if not remaining:
+                return
+
+            # Carry into the slower positions
+            digits[last] = 0
+            buf[last] = last_charset[0]
+            position = last - 1
+            while position >= 0:
+                digits[position] += 1
+                if digits[position] < len(charsets[position]):
+                    buf[position] = charsets[position][digits[position]]
+                    break
+                digits[position] = 0
+                buf[position] = charsets[position][0]
+                position -= 1
@@ -0,0 +1,263 @@
+"""Opt-in instrumentation: counters, latency histograms and cProfile dumps.
+
+Nothing here runs unless profiling is switched on with ``profiled()``:
+callers check ``active()`` once per attack or per auditor, and the per-call
+histograms come from wrapping functions only while a session is active, so
+the disabled path has no extra work in any hot loop.
+"""
+
+import functools
+import time
+from contextlib import contextmanager
+from itertools import islice
+
+DEFAULT_METRICS = 'profile_metrics.json'
+
+# Candidates replayed per strategy to split its time between stages
+STAGE_SAMPLE = 20000
+
+_active = None
+
+
+def active():
+    """The Metrics being recorded, or None when profiling is off"""
+    return _active
+
+
+class Histogram:
+    """Latency histogram with power-of-two nanosecond buckets"""
+    __slots__ = ('buckets', 'count', 'total_ns', 'min_ns', 'max_ns')
+
+    def __init__(self):
+        self.buckets = [0] * 64
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = 0
+
+    def add(self, ns):
+        self.buckets[min(ns.bit_length(), 63)] += 1
+        self.count += 1
+        self.total_ns += ns
+        if self.min_ns is None or ns < self.min_ns:
+            self.min_ns = ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+    def percentile(self, fraction):
+        """Upper bound (ns) of the bucket holding the given fraction of samples"""
+        rank = fraction * self.count
+        seen = 0
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= rank:
+                return min((1 << bucket) - 1, self.max_ns)
+        return self.max_ns
+
+    def merge(self, other):
+        """Add the samples of another Histogram (e.g. one recorded in a worker process)"""
+        if not other.count:
+            return
+        self.buckets = [mine + theirs for mine, theirs in zip(self.buckets, other.buckets)]
+        self.count += other.count
+        self.total_ns += other.total_ns
+        if self.min_ns is None or other.min_ns < self.min_ns:
+            self.min_ns = other.min_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+
+    def to_dict(self):
+        if not self.count:
+            return {'count': 0}
+        return {
+            'count': self.count,
+            'mean_us': self.total_ns / self.count / 1000,
+            'min_us': self.min_ns / 1000,
+            'p50_us': self.percentile(0.5) / 1000,
+            'p99_us': self.percentile(0.99) / 1000,
+            'max_us': self.max_ns / 1000,
+            # bucket upper bound (us) -> samples
+            'buckets': {f"{((1 << bucket) - 1) / 1000:g}": count
+                        for bucket, count in enumerate(self.buckets) if count}
+        }
+
+
+class _TimedContainer:
+    """Membership tests against container, timed into a histogram"""
+    def __init__(self, container, histogram):
+        self.container = container
+        self.histogram = histogram
+
+    def __contains__(self, item):
+        start = time.perf_counter_ns()
+        found = item in self.container
+        self.histogram.add(time.perf_counter_ns() - start)
+        return found
+
+    def __len__(self):
+        return len(self.container)
+
+    def __iter__(self):
+        return iter(self.container)
+
+
+class Metrics:
+    """Counters, latency histograms and per-strategy attack statistics for one session"""
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.counters = {}
+        self.histograms = {}
+        self.stages = {}
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def histogram(self, name):
+        if name not in self.histograms:
+            self.histograms[name] = Histogram()
+        return self.histograms[name]
+
+    def timed(self, name, func):
+        """func wrapped to record the latency of every call in histogram name"""
+        histogram = self.histogram(name)
+        clock = time.perf_counter_ns
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.add(clock() - start)
+        return wrapper
+
+    def timed_container(self, name, container):
+        """container with its ``in`` checks timed into histogram name"""
+        return _TimedContainer(container, self.histogram(name))
+
+    def merge_histograms(self, histograms):
+        """Fold {name: Histogram} recorded elsewhere (a worker process) into this session"""
+        for name, histogram in histograms.items():
+            self.histogram(name).merge(histogram)
+
+    def record_attack(self, strategy, result, seconds):
+        """Counters for one attack run (a single result or a batch CrackResults)"""
+        if hasattr(result, 'results'):
+            candidates, hashes, hits = result.candidates, result.hashes_computed, result.successful_cracks
+        else:
+            candidates = hashes = result['attempts']
+            hits = int(result['cracked'])
+        prefix = f"attack.{strategy}"
+        self.count(f"{prefix}.runs")
+        self.count(f"{prefix}.candidates", candidates)
+        self.count(f"{prefix}.hashes", hashes)
+        self.count(f"{prefix}.hits", hits)
+        self.count(f"{prefix}.seconds", seconds)
+
+    def record_workers(self, name, workers, busy_seconds, wall_seconds):
+        """Busy time of a worker pool, for the utilization figure"""
+        self.count(f"workers.{name}.capacity_seconds", workers * wall_seconds)
+        self.count(f"workers.{name}.busy_seconds", busy_seconds)
+
+    def sample_stages(self, strategy, words, hash_func, targets, sample=STAGE_SAMPLE):
+        """Time generating, hashing and comparing over the first ``sample`` candidates of words.
+
+        The attack loops are not instrumented per candidate; this replays a
+        sample once per strategy to split its time between the three stages,
+        so ``words`` must be a fresh iterator or a re-iterable source.
+        ``targets`` holds the attack's raw target digests in the structure its
+        loop searches (a tuple of one digest, or a dict/set for batches), so
+        the compare stage repeats the loop's real lookups.
+        """
+        if strategy in self.stages:
+            return
+        clock = time.perf_counter_ns
+        start = clock()
+        candidates = [word.encode('utf-8', 'surrogateescape') if isinstance(word, str) else bytes(word)
+                      for word in islice(words, sample)]
+        generated = clock()
+        digests = [hash_func(candidate).digest() for candidate in candidates]
+        hashed = clock()
+        for digest in digests:
+            digest in targets
+        compared = clock()
+        if candidates:
+            self.stages[strategy] = {
+                'sample': len(candidates),
+                'generate_ns': (generated - start) / len(candidates),
+                'hash_ns': (hashed - generated) / len(candidates),
+                'compare_ns': (compared - hashed) / len(candidates)
+            }
+
+    def to_dict(self):
+        """The session as a JSON-serialisable report, with derived rates"""
+        strategies = {}
+        for name, value in self.counters.items():
+            if name.startswith('attack.'):
+                strategy, counter = name[len('attack.'):].rsplit('.', 1)
+                strategies.setdefault(strategy, {})[counter] = value
+        for strategy, counters in strategies.items():
+            candidates = counters.get('candidates', 0)
+            counters['hit_rate'] = counters.get('hits', 0) / candidates if candidates else 0.0
+            counters['candidates_per_second'] = candidates / counters['seconds'] if counters.get('seconds') else 0.0
+            stages = self.stages.get(strategy)
+            if stages:
+                per_candidate = stages['generate_ns'] + stages['hash_ns'] + stages['compare_ns']
+                counters['stage_share'] = {
+                    stage: stages[f"{stage}_ns"] / per_candidate if per_candidate else 0.0
+                    for stage in ('generate', 'hash', 'compare')
+                }
+                counters['stage_sample'] = stages
+
+        workers = {}
+        for name, value in self.counters.items():
+            if name.startswith('workers.'):
+                pool, counter = name[len('workers.'):].rsplit('.', 1)
+                workers.setdefault(pool, {})[counter] = value
+        for counters in workers.values():
+            capacity = counters.get('capacity_seconds', 0)
+            counters['utilization'] = counters.get('busy_seconds', 0) / capacity if capacity else 0.0
+
+        return {
+            'elapsed_seconds': time.perf_counter() - self.started,
+            'strategies': strategies,
+            'workers': workers,
+            # Only stages that actually ran (an interactive-only timer stays out of batch reports)
+            'latency': {name: histogram.to_dict() for name, histogram in self.histograms.items()
+                        if histogram.count},
+            'counters': self.counters
+        }
+
+    def write(self, path):
+        import json
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+@contextmanager
+def profiled(metrics_path=None, dump_path=None):
+    """Profile the enclosed block when a metrics file or a cProfile dump path is given.
+
+    Yields the active Metrics (None when both paths are None). The metrics
+    file is JSON; the dump is a pstats file (snakeviz, gprof2dot or
+    flameprof turn it into a call graph or flame graph).
+    """
+    global _active
+    if _active is not None or not (metrics_path or dump_path):
+        # Nested sessions (one CLI dispatching to another) record into the outer one
+        yield _active
+        return
+
+    metrics = _active = Metrics()
+    profiler = None
+    if dump_path:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        yield metrics
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(dump_path)
+        _active = None
+        metrics.write(metrics_path or DEFAULT_METRICS)
@@ -0,0 +1,339 @@
+"""Process-pool execution engine for sharded hash cracking"""
+
+import multiprocessing as mp
+import time
+from itertools import islice
+
+from utils.cracker import HashCracker, HASH_FUNCTIONS, match_store
+from utils.mask import MaskKeyspace
+from utils.metrics import active
+from utils.progress import Progress
+from utils.results import CrackResult, CrackResults
+from utils.rules import RuleEngine, DEFAULT_BASE_WORDS
+from utils.targetstore import TargetStore
+from utils.wordlists import WordlistSource
+
+# Candidates a worker tries between progress flushes / stop checks
+CHECK_INTERVAL = 4096
+
+# Shards handed out per worker, so fast workers can pick up slack
+SHARDS_PER_WORKER = 4
+
+# Large keyspaces are cut into shards of at most this many candidates, so a
+# completed shard (the resume granularity) is a few seconds of work; capped
+# at MAX_SHARDS because the pool queues every job up front
+SHARD_CANDIDATES = 1 << 22
+MAX_SHARDS = 1 << 14
+
+# Worker-process state, set by _init_worker
+_stop_event = None
+_progress = None
+_engines = {}
+_stores = {}
+
+
+def split_range(total, shards):
+    """Split the index range [0, total) into contiguous slices"""
+    shards = max(1, min(shards, total))
+    bounds = [total * i // shards for i in range(shards + 1)]
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+
+
+def shard_count(total, workers):
+    """Number of shards for a keyspace of total candidates"""
+    return min(max(workers * SHARDS_PER_WORKER, -(-total // SHARD_CANDIDATES)), MAX_SHARDS)
+
+
+def _shard_candidates(shard):
+    """Yield the candidate bytes for one shard description"""
+    kind = shard[0]
+    if kind == 'file':
+        _, filepath, start, end, rules = shard
+        source = WordlistSource(filepath, start, end)
+        if rules is None:
+            return iter(source)
+        words = (word.decode('utf-8', 'surrogateescape') for word in source)
+        return (candidate.encode('utf-8', 'surrogateescape')
+                for candidate in _engine(rules).candidates(words))
+    if kind == 'rules':
+        _, words, rules, start, end = shard
+        return (candidate.encode('utf-8', 'surrogateescape')
+                for candidate in _engine(rules).iter_range(words, start, end))
+    if kind == 'mask':
+        _, mask, custom_charsets, start, end = shard
+        return MaskKeyspace(mask, custom_charsets).iter_range(start, end)
+    raise ValueError(f"Unknown shard type: {kind}")
+
+
+def _engine(rules):
+    """Compiled RuleEngine for a tuple of rule texts, cached per worker"""
+    if rules not in _engines:
+        _engines[rules] = RuleEngine(rules)
+    return _engines[rules]
+
+
+def _store(path):
+    """TargetStore for a directory, mapped once per worker (the pages are shared between workers)"""
+    if path not in _stores:
+        _stores[path] = TargetStore(path)
+    return _stores[path]
+
+
+def _init_worker(stop_event, progress):
+    global _stop_event, _progress
+    _stop_event = stop_event
+    _progress = progress
+
+
+def _crack_shard(job):
+    """Worker entry point: search one shard; returns (job index, password or None, busy seconds)"""
+    started = time.perf_counter()
+    index, algorithm, target_digest, shard = job
+    hash_func = HASH_FUNCTIONS[algorithm]
+    pending = 0
+
+    for candidate in _shard_candidates(shard):
+        pending += 1
+        if hash_func(candidate).digest() == target_digest:
+            _stop_event.set()
+            with _progress.get_lock():
+                _progress.value += pending
+            return index, bytes(candidate).decode('utf-8', errors='replace'), time.perf_counter() - started
+
+        if pending == CHECK_INTERVAL:
+            with _progress.get_lock():
+                _progress.value += pending
+            pending = 0
+            if _stop_event.is_set():
+                return index, None, time.perf_counter() - started
+
+    with _progress.get_lock():
+        _progress.value += pending
+    return index, None, time.perf_counter() - started
+
+
+def _crack_store_shard(job):
+    """Worker entry point: match one shard against a target store.
+
+    Returns (job index, [(hash, algorithm, password, attempts)], busy seconds);
+    attempts count from the start of the shard.
+    """
+    started = time.perf_counter()
+    index, store_path, shard = job
+    store = _store(store_path)
+    candidates = _shard_candidates(shard)
+    cracked = set()
+    found = []
+    done = 0
+
+    while not _stop_event.is_set():
+        block = list(islice(candidates, CHECK_INTERVAL))
+        if not block:
+            break
+        for algorithm, digest, password, position in match_store(store, block, cracked):
+            found.append((digest.hex(), algorithm, bytes(password).decode('utf-8', errors='replace'),
+                          done + position))
+        done += len(block)
+        with _progress.get_lock():
+            _progress.value += len(block)
+    return index, found, time.perf_counter() - started
+
+
+class ParallelCracker:
+    """Run a single-target attack across a pool of worker processes.
+
+    With a ``deadline`` (utils.scheduler.Deadline) the workers are stopped
+    once it passes and the attack returns uncracked with the attempts so far.
+    """
+    def __init__(self, max_workers=None, deadline=None):
+        self.max_workers = max_workers or mp.cpu_count()
+        self.deadline = deadline
+
+    def wordlist_attack(self, target_hash, filepath, hash_type='auto', rules=None, desc="Wordlist",
+                        start=0, progress=None):
+        """Dictionary attack with the wordlist file (from byte offset start) split into byte-range shards.
+        
+        With ``rules`` every word is expanded through the rule engine in the worker.
+        ``progress(offset)`` receives the byte offset below which every shard is done.
+        """
+        source = WordlistSource(filepath, start)
+        total = len(source)
+        rule_texts = None
+        if rules is not None:
+            engine = HashCracker().rule_engine(rules)
+            rule_texts = tuple(rule.text for rule in engine.rules)
+            total *= len(engine)
+        shards = [('file', filepath, shard.start, shard.end, rule_texts)
+                  for shard in source.split(shard_count(total, self.max_workers))]
+        bounds = [(shard[2], shard[3]) for shard in shards]
+        return self._run(target_hash, hash_type, shards, total=total, desc=desc, unit="cand",
+                         method='dictionary' if rules is None else 'rule-based',
+                         bounds=bounds, progress=progress)
+
+    def rule_attack(self, target_hash, hash_type='auto', words=None, rules=None, desc="Rule-based",
+                    start=0, progress=None):
+        """Rule-based attack with the words x rules keyspace split into index ranges.
+        
+        ``start`` and the positions passed to ``progress`` are base-word indices.
+        """
+        engine = HashCracker().rule_engine(rules)
+        words = tuple(DEFAULT_BASE_WORDS if words is None else words)
+        rule_texts = tuple(rule.text for rule in engine.rules)
+        first = start * len(engine)
+        total = engine.keyspace(words) - first
+        shards = [('rules', words, rule_texts, first + low, first + high)
+                  for low, high in split_range(total, shard_count(total, self.max_workers))]
+        # Shard boundaries in base words, rounded down so no candidate is skipped on resume
+        bounds = [(shard[3] // len(engine), -(-shard[4] // len(engine))) for shard in shards]
+        return self._run(target_hash, hash_type, shards, total=total, desc=desc, unit="cand",
+                         method='rule-based', bounds=bounds, progress=progress)
+
+    def mask_attack(self, target_hash, mask, hash_type='auto', custom_charsets=None, start=0, desc="Mask",
+                    progress=None):
+        """Mask attack with the keyspace (from index start) split into exact index ranges"""
+        total = max(0, len(MaskKeyspace(mask, custom_charsets)) - start)
+        shards = [('mask', mask, custom_charsets, start + first, start + last)
+                  for first, last in split_range(total, shard_count(total, self.max_workers))]
+        bounds = [(shard[3], shard[4]) for shard in shards]
+        return self._run(target_hash, hash_type, shards, total=total, desc=desc, unit="cand",
+                         method='mask', bounds=bounds, progress=progress)
+
+    def store_attack(self, store_path, filepath, rules=None, desc="Store cracking", cracked=None):
+        """Dictionary (or, with ``rules``, rule-based) attack of a wordlist against a target store.
+        
+        Workers map the store directory themselves, so the targets are never
+        pickled and the page cache holds one copy however many workers run.
+        ``cracked`` is a set of raw digests to skip, updated in place.
+        Returns a CrackResults of the newly cracked targets only.
+        """
+        source = WordlistSource(filepath)
+        total = len(source)
+        rule_texts = None
+        if rules is not None:
+            engine = HashCracker().rule_engine(rules)
+            rule_texts = tuple(rule.text for rule in engine.rules)
+            total *= len(engine)
+        shards = [('file', filepath, shard.start, shard.end, rule_texts)
+                  for shard in source.split(shard_count(total, self.max_workers))]
+        jobs = [(index, store_path, shard) for index, shard in enumerate(shards)]
+        with TargetStore(store_path) as store:
+            algorithms, targets = len(store.sets), len(store)
+
+        cracked = set() if cracked is None else cracked
+        method = 'dictionary' if rules is None else 'rule-based'
+        results = CrackResults()
+        stop_event = mp.Event()
+        counter = mp.Value('q', 0)
+        busy = 0.0
+        start_time = time.time()
+
+        with Progress(total, desc=desc, unit="cand") as bar:
+            pool = mp.Pool(self.max_workers, initializer=_init_worker, initargs=(stop_event, counter))
+            try:
+                pending = pool.imap_unordered(_crack_store_shard, jobs)
+                remaining = len(jobs)
+                while remaining:
+                    if self.deadline is not None and self.deadline.expired():
+                        break
+                    try:
+                        _, found, seconds = pending.next(timeout=0.1)
+                    except mp.TimeoutError:
+                        bar.update_to(counter.value)
+                        continue
+                    remaining -= 1
+                    busy += seconds
+                    for target_hash, algorithm, password, attempts in found:
+                        # The same target can be hit by repeated words in two shards
+                        digest = bytes.fromhex(target_hash)
+                        if digest in cracked:
+                            continue
+                        cracked.add(digest)
+                        results.add_result(CrackResult(
+                            hash=target_hash,
+                            hash_type=algorithm,
+                            cracked=True,
+                            password=password,
+                            attempts=attempts,
+                            time=time.time() - start_time,
+                            method=method
+                        ))
+            finally:
+                stop_event.set()
+                pool.terminate()
+                pool.join()
+            bar.update_to(counter.value)
+
+        metrics = active()
+        if metrics is not None:
+            metrics.record_workers('parallel', self.max_workers, busy, time.time() - start_time)
+
+        results.candidates = counter.value
+        results.hashes_computed = counter.value * algorithms
+        results.total_attempts = counter.value * targets
+        return results
+
+    def _run(self, target_hash, hash_type, shards, total, desc, unit, method, bounds=None, progress=None):
+        """Fan shards out to the pool, aggregating progress into one bar.
+        
+        Shards finish out of order, so ``progress`` is given the low-water mark:
+        the start of the first unfinished shard (``bounds`` holds each shard's
+        (start, end) position).
+        """
+        if hash_type == 'auto':
+            hash_type = HashCracker().detect_hash_type(target_hash)
+        if hash_type not in HASH_FUNCTIONS:
+            raise ValueError(f"Unsupported algorithm: {hash_type}")
+
+        target_digest = bytes.fromhex(target_hash)
+        jobs = [(index, hash_type, target_digest, shard) for index, shard in enumerate(shards)]
+        done = [False] * len(jobs)
+        watermark = 0
+
+        stop_event = mp.Event()
+        counter = mp.Value('q', 0)
+        password = None
+        busy = 0.0
+        start_time = time.time()
+
+        # Workers add to the shared counter every CHECK_INTERVAL candidates; the bar shows its sum
+        with Progress(total, desc=desc, unit=unit) as bar:
+            pool = mp.Pool(self.max_workers, initializer=_init_worker, initargs=(stop_event, counter))
+            try:
+                pending = pool.imap_unordered(_crack_shard, jobs)
+                remaining = len(jobs)
+                while remaining:
+                    if self.deadline is not None and self.deadline.expired():
+                        break
+                    try:
+                        index, found, seconds = pending.next(timeout=0.1)
+                    except mp.TimeoutError:
+                        bar.update_to(counter.value)
+                        continue
+                    remaining -= 1
+                    busy += seconds
+                    if found is not None:
+                        password = found
+                        break
+                    done[index] = True
+                    while watermark < len(done) and done[watermark]:
+                        watermark += 1
+                    if progress is not None and bounds:
+                        progress(bounds[watermark][0] if watermark < len(bounds) else bounds[-1][1])
+            finally:
+                stop_event.set()
+                pool.terminate()
+                pool.join()
+            bar.update_to(counter.value)
+
+        metrics = active()
+        if metrics is not None:
+            # Shards cut short by a hit elsewhere are not counted, so this is a lower bound
+            metrics.record_workers('parallel', self.max_workers, busy, time.time() - start_time)
+
+        return CrackResult(
+            cracked=password is not None,
+            password=password,
+            attempts=counter.value,
+            time=time.time() - start_time,
+            method=method
+        )
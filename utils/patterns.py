@@ -0,0 +1,251 @@
+"""Multi-pattern matching for password pattern detection"""
+
+import re
+from collections import deque
+
+
+class AhoCorasick:
+    """Aho-Corasick automaton compiled to a DFA over the patterns' alphabet.
+
+    ``patterns`` maps each literal to a payload. ``find`` scans the text once
+    and returns the payloads of every pattern that occurs in it, so the cost
+    per password does not grow with the number of patterns.
+    """
+    def __init__(self, patterns):
+        goto = [{}]
+        outputs = [[]]
+
+        for pattern, payload in patterns.items():
+            state = 0
+            for char in pattern:
+                if char not in goto[state]:
+                    goto.append({})
+                    outputs.append([])
+                    goto[state][char] = len(goto) - 1
+                state = goto[state][char]
+            outputs[state].append(payload)
+
+        # Breadth-first fill of failure links, folding them into full transitions
+        fail = [0] * len(goto)
+        delta = [dict(goto[0])] + [None] * (len(goto) - 1)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            transitions = dict(delta[fail[state]])
+            for char, child in goto[state].items():
+                fail[child] = delta[fail[state]].get(char, 0)
+                transitions[char] = child
+                queue.append(child)
+            delta[state] = transitions
+            outputs[state] = outputs[state] + outputs[fail[state]]
+
+        # Drop transitions back to the root; a miss in .get() means state 0
+        self.delta = [{char: target for char, target in row.items() if target} for row in delta]
+        self.outputs = [tuple(output) for output in outputs]
+
+    def find(self, text):
+        """Return the set of payloads for all patterns occurring in text"""
+        delta = self.delta
+        outputs = self.outputs
+        found = set()
+        state = 0
+        for char in text:
+            state = delta[state].get(char, 0)
+            if outputs[state]:
+                found.update(outputs[state])
+        return found
+
+
+class PatternRule:
+    """A named set of literal tokens with an entropy penalty and/or a report message.
+
+    ``penalty`` is charged once per distinct token found. ``message`` is
+    formatted with the earliest-listed token found (``{token}``) and reported
+    once per rule. Tokens are matched against the lowercased password.
+    """
+    def __init__(self, name, tokens, penalty=0, message=None):
+        self.name = name
+        self.tokens = list(dict.fromkeys(tokens))
+        self.penalty = penalty
+        self.message = message
+
+
+class RepeatRule(PatternRule):
+    """Character-count rule for repeated characters.
+
+    ``penalty`` is charged when one character fills more than half the
+    password; ``message`` (with ``{token}`` and ``{count}``) reports a
+    character occurring at least ``threshold`` times.
+    """
+    def __init__(self, name, penalty=0, message=None, threshold=3):
+        super().__init__(name, [], penalty, message)
+        self.threshold = threshold
+        self.run = re.compile(r'(.)\1{%d}' % (threshold - 1), re.DOTALL)
+
+
+def trigrams(*rows):
+    """All 3-character windows of the given keyboard rows"""
+    return [row[i:i+3] for row in rows for i in range(len(row) - 2)]
+
+
+def dates(separators='/-.'):
+    """Day/month tokens such as '25/12' and '12-25' for every calendar day"""
+    days_in_month = [31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
+    tokens = []
+    for month, days in enumerate(days_in_month, 1):
+        for day in range(1, days + 1):
+            for sep in separators:
+                tokens.append(f"{day:02d}{sep}{month:02d}")
+                tokens.append(f"{month:02d}{sep}{day:02d}")
+    return tokens
+
+
+# Rows of the keyboards we look for walks on
+QWERTY_ROWS = ['qwertyuiop', 'asdfghjkl', 'zxcvbnm']
+QWERTZ_ROWS = ['qwertzuiop', 'asdfghjkl', 'yxcvbnm']
+AZERTY_ROWS = ['azertyuiop', 'qsdfghjklm', 'wxcvbn']
+NUMBER_ROWS = ['1234567890', '0987654321']
+KEYPAD_LINES = ['789', '456', '123', '741', '852', '963', '147', '258', '369', '159', '357']
+
+ALPHANUMERIC_SEQUENCES = [
+    '123', '234', '345', '456', '567', '678', '789', '987', '876', '765',
+    'abc', 'bcd', 'cde', 'def', 'efg', 'fgh', 'ghi', 'hij', 'ijk', 'jkl',
+    'qwe', 'wer', 'ert', 'rty', 'tyu', 'yui', 'uio', 'iop', 'asd', 'sdf',
+    'dfg', 'fgh', 'ghj', 'hjk', 'jkl', 'zxc', 'xcv', 'cvb', 'vbn', 'bnm'
+]
+
+# The pattern-rule registry, in reporting order. Penalties are the calibrated
+# entropy penalties; report-only rules (penalty 0) add findings without
+# changing scores, so the entropy path (PenaltyMatcher) never scans them.
+PATTERN_RULES = [
+    PatternRule('sequence-penalty', ['123', 'abc', 'qwe', 'asd', 'zxc', '987', '321'], penalty=10),
+    PatternRule('keyboard-penalty', trigrams(*QWERTY_ROWS), penalty=8),
+    PatternRule('sequence', ALPHANUMERIC_SEQUENCES, message="Sequential pattern: '{token}'"),
+    RepeatRule('repeat', penalty=15, message="Repeated character: '{token}' {count} times"),
+    PatternRule('year', [str(year) for year in range(1900, 2040)], message="Contains common year"),
+    PatternRule('date', dates(), message="Contains date: '{token}'"),
+    PatternRule('keyboard-walk',
+                [token for token in trigrams(*QWERTZ_ROWS, *AZERTY_ROWS, *NUMBER_ROWS) + KEYPAD_LINES
+                 if token not in ALPHANUMERIC_SEQUENCES],
+                message="Keyboard walk: '{token}'"),
+]
+
+
+class PenaltyMatcher:
+    """Entropy penalty of the rules that carry one, without any reporting work.
+
+    Tokens of each length compile to one lookahead alternation, so a single
+    regex pass per length finds every overlapping occurrence; each distinct
+    token then charges the penalties of the rules listing it. Repeat rules
+    charge when one character fills more than half the password.
+    """
+    def __init__(self, rules=None):
+        rules = [rule for rule in (PATTERN_RULES if rules is None else rules) if rule.penalty]
+        # token -> penalty summed over the rules listing it
+        self.weights = {}
+        for rule in rules:
+            for token in rule.tokens:
+                self.weights[token] = self.weights.get(token, 0) + rule.penalty
+        # A lookahead alternation reports one token per position, so tokens of
+        # different lengths (which may start at the same place) scan separately
+        lengths = sorted({len(token) for token in self.weights if token})
+        self.scanners = [
+            re.compile('(?=(%s))' % '|'.join(re.escape(token) for token in self.weights if len(token) == length)).findall
+            for length in lengths
+        ]
+        self.repeat_penalty = sum(rule.penalty for rule in rules if isinstance(rule, RepeatRule))
+
+    def penalty(self, password):
+        if not password:
+            return 0
+        lowered = password.lower()
+        penalty = 0
+        for findall in self.scanners:
+            found = findall(lowered)
+            if found:
+                penalty += sum(map(self.weights.__getitem__, set(found)))
+        # A character filling more than half the password leaves room for at most
+        # len/2 distinct characters, and must be the password's sorted median
+        if self.repeat_penalty and len(set(password)) * 2 <= len(password) + 1:
+            if password.count(sorted(password)[len(password) // 2]) * 2 > len(password):
+                penalty += self.repeat_penalty
+        return penalty
+
+
+class PatternMatcher:
+    """Pattern rules' findings and penalty for one password.
+
+    The rules with a report message are compiled into a single automaton,
+    scanned once per password; the penalty comes from a PenaltyMatcher over
+    the same rules, which is all the entropy path needs.
+    """
+    def __init__(self, rules=None):
+        self.rules = list(PATTERN_RULES if rules is None else rules)
+        self.penalty = PenaltyMatcher(self.rules).penalty
+
+        # token -> ((rule index, token rank), ...) so one hit feeds every rule using it
+        payloads = {}
+        for rule_index, rule in enumerate(self.rules):
+            if not rule.message:
+                continue
+            for rank, token in enumerate(rule.tokens):
+                payloads.setdefault(token, []).append((rule_index, rank))
+        self.automaton = AhoCorasick({token: tuple(hits) for token, hits in payloads.items()})
+        self.repeat_rules = [rule for rule in self.rules if isinstance(rule, RepeatRule) and rule.message]
+
+    def scan(self, password):
+        """Return (entropy penalty, list of human-readable patterns)"""
+        if not password:
+            return 0, []
+
+        best = {}
+        for hits in self.automaton.find(password.lower()):
+            for rule_index, rank in hits:
+                if rank < best.get(rule_index, rank + 1):
+                    best[rule_index] = rank
+
+        repeats = {}
+        if self.repeat_rules:
+            # Runs in the sorted string are repeated characters
+            ordered = ''.join(sorted(password))
+            for rule in self.repeat_rules:
+                repeats[rule] = rule.run.search(ordered)
+
+        patterns = []
+        for rule_index, rule in enumerate(self.rules):
+            if not rule.message:
+                continue
+            if rule in repeats:
+                if repeats[rule]:
+                    char = repeats[rule].group(1)
+                    patterns.append(rule.message.format(token=char, count=password.count(char)))
+            elif rule_index in best:
+                patterns.append(rule.message.format(token=rule.tokens[best[rule_index]]))
+
+        return self.penalty(password), patterns
+
+
+# Compiled on first use, so importing the module stays cheap
+_default_matcher = None
+_default_penalty = None
+
+
+def default_matcher():
+    """The PatternMatcher for PATTERN_RULES"""
+    global _default_matcher
+    if _default_matcher is None:
+        _default_matcher = PatternMatcher()
+    return _default_matcher
+
+
+def scan_patterns(password):
+    """Scan password with the default rule registry: (penalty, patterns)"""
+    return (_default_matcher or default_matcher()).scan(password)
+
+
+def pattern_penalty(password):
+    """Entropy penalty under the default rule registry; skips report-only rules"""
+    global _default_penalty
+    if _default_penalty is None:
+        _default_penalty = PenaltyMatcher().penalty
+    return _default_penalty(password)
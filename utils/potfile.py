@@ -0,0 +1,108 @@
+"""Persistent cracked-hash store ("potfile")"""
+
+import os
+import sqlite3
+import string
+from datetime import datetime
+
+DEFAULT_POTFILE = os.path.join(os.path.expanduser('~'), '.password-resilience.pot')
+
+_HEX_DIGITS = frozenset(string.hexdigits)
+
+
+def target_key(target_hash):
+    """Raw digest bytes for hex hashes, the encoded string for anything else"""
+    target_hash = target_hash.strip()
+    if target_hash and len(target_hash) % 2 == 0 and _HEX_DIGITS.issuperset(target_hash):
+        return bytes.fromhex(target_hash)
+    return target_hash.encode('utf-8')
+
+
+class Potfile:
+    """SQLite-backed map of (algorithm, digest) -> plaintext.
+
+    The table is keyed on (algorithm, digest), so lookups are index seeks.
+    Writes are append-only (INSERT OR IGNORE, never update), and WAL mode
+    with a busy timeout lets several processes write at the same time.
+    Connections are opened lazily per process, so a Potfile can be handed
+    to forked workers.
+    """
+    def __init__(self, path=DEFAULT_POTFILE, timeout=30.0):
+        self.path = path
+        self.timeout = timeout
+        self._conn = None
+        self._pid = None
+
+    def _connection(self):
+        if self._conn is None or self._pid != os.getpid():
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS cracked ('
+                ' algorithm TEXT NOT NULL,'
+                ' digest BLOB NOT NULL,'
+                ' plaintext TEXT NOT NULL,'
+                ' cracked_at TEXT NOT NULL,'
+                ' PRIMARY KEY (algorithm, digest)'
+                ') WITHOUT ROWID'
+            )
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def lookup(self, algorithm, target_hash):
+        """Plaintext for a previously cracked hash, or None"""
+        row = self._connection().execute(
+            'SELECT plaintext FROM cracked WHERE algorithm = ? AND digest = ?',
+            (algorithm, target_key(target_hash))
+        ).fetchone()
+        return row[0] if row else None
+
+    def lookup_many(self, targets):
+        """Map target hash -> plaintext for every resolved (hash, algorithm) pair"""
+        conn = self._connection()
+        found = {}
+        for target_hash, algorithm in targets:
+            row = conn.execute(
+                'SELECT plaintext FROM cracked WHERE algorithm = ? AND digest = ?',
+                (algorithm, target_key(target_hash))
+            ).fetchone()
+            if row:
+                found[target_hash] = row[0]
+        return found
+
+    def add(self, algorithm, target_hash, plaintext):
+        """Record a cracked hash; existing entries are never overwritten"""
+        self.add_many([(algorithm, target_hash, plaintext)])
+
+    def add_many(self, entries):
+        """Record (algorithm, hash, plaintext) triples in one transaction"""
+        cracked_at = datetime.now().isoformat()
+        rows = [(algorithm, target_key(target_hash), plaintext, cracked_at)
+                for algorithm, target_hash, plaintext in entries]
+        if not rows:
+            return
+        conn = self._connection()
+        with conn:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.executemany(
+                'INSERT OR IGNORE INTO cracked (algorithm, digest, plaintext, cracked_at) VALUES (?, ?, ?, ?)',
+                rows
+            )
+
+    def __len__(self):
+        return self._connection().execute('SELECT COUNT(*) FROM cracked').fetchone()[0]
+
+    def close(self):
+        if self._conn is not None and self._pid == os.getpid():
+            self._conn.close()
+        self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,63 @@
+"""Throttled progress display for the cracking loops"""
+
+import time
+
+# Seconds between display refreshes
+REFRESH_INTERVAL = 0.5
+
+_enabled = True
+
+
+def set_enabled(enabled):
+    """Switch progress bars on or off for the whole process (e.g. headless runs)"""
+    global _enabled
+    _enabled = enabled
+
+
+def enabled():
+    return _enabled
+
+
+class Progress:
+    """A progress bar fed running totals instead of per-item updates.
+
+    Loops keep their own counter and pass it to ``update_to`` once per batch
+    or chunk; the bar is redrawn at most every ``interval`` seconds, so the
+    cost per call is one clock read. ``total`` may be None (unknown length)
+    or a callable, which is only evaluated when the bar is shown. When
+    progress is disabled no bar is created (tqdm is not even imported) but
+    ``count`` is still kept.
+    """
+    def __init__(self, total=None, desc=None, unit='it', enabled=None, interval=REFRESH_INTERVAL):
+        self.count = 0
+        self.interval = interval
+        self._bar = None
+        self._next = 0.0
+        if _enabled if enabled is None else enabled:
+            from tqdm import tqdm
+            self._bar = tqdm(total=total() if callable(total) else total, desc=desc, unit=unit,
+                             mininterval=interval)
+
+    def update_to(self, count):
+        """Record the running total (from this process or summed across workers)"""
+        self.count = count
+        if self._bar is not None:
+            now = time.monotonic()
+            if now >= self._next:
+                self._next = now + self.interval
+                self._bar.update(count - self._bar.n)
+
+    def add(self, amount):
+        self.update_to(self.count + amount)
+
+    def close(self):
+        if self._bar is not None:
+            self._bar.update(self.count - self._bar.n)
+            self._bar.close()
+            self._bar = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
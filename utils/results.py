@@ -0,0 +1,172 @@
+"""Compact cracking result records and result sets"""
+
+import csv
+import sys
+from json.encoder import encode_basestring_ascii
+
+# Field order of a result record (and of the CSV/JSONL export)
+RESULT_FIELDS = ('hash', 'hash_type', 'cracked', 'password', 'attempts', 'time', 'method')
+
+# Single-target attacks report these; batch results also carry hash and hash_type
+BASE_FIELDS = RESULT_FIELDS[2:]
+
+
+class CrackResult:
+    """One cracking result, stored in slots instead of a dict.
+
+    Supports the dict-style access the result dicts had (``result['password']``,
+    ``result['attempts'] += n``, ``.get``, ``dict(result)``); ``hash`` and
+    ``hash_type`` are only listed as keys when set. Method and algorithm
+    names are interned, so every record shares the same strings.
+    """
+    __slots__ = RESULT_FIELDS
+
+    def __init__(self, cracked, password, attempts, time, method, hash=None, hash_type=None):
+        self.hash = hash
+        self.hash_type = sys.intern(hash_type) if hash_type else hash_type
+        self.cracked = cracked
+        self.password = password
+        self.attempts = attempts
+        self.time = time
+        self.method = sys.intern(method)
+
+    @classmethod
+    def from_mapping(cls, result):
+        """Record for a result dict (e.g. one restored from a checkpoint)"""
+        return cls(result['cracked'], result['password'], result['attempts'], result['time'], result['method'],
+                   result.get('hash'), result.get('hash_type'))
+
+    def keys(self):
+        return RESULT_FIELDS if self.hash is not None else BASE_FIELDS
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def __getitem__(self, key):
+        if key not in RESULT_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in RESULT_FIELDS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self.keys()
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in RESULT_FIELDS else default
+
+    def __eq__(self, other):
+        if isinstance(other, (CrackResult, dict)):
+            return dict(self) == dict(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"CrackResult({dict(self)!r})"
+
+
+def _json(value):
+    """JSON text for a record field"""
+    if value is None:
+        return 'null'
+    if value is True:
+        return 'true'
+    if value is False:
+        return 'false'
+    if isinstance(value, str):
+        return encode_basestring_ascii(value)
+    return repr(value)
+
+
+class CrackResults:
+    """Store and manage cracking results.
+
+    Results are kept as CrackResult records (dicts passed to add_result are
+    converted) with running totals per method and per algorithm, and are
+    exported to CSV or JSON Lines straight from the records.
+    """
+    def __init__(self):
+        self.results = []
+        self.successful_cracks = 0
+        self.total_attempts = 0
+        # Set by batch attacks: candidates tried and digests computed across all algorithms
+        self.candidates = 0
+        self.hashes_computed = 0
+        # name -> [targets, cracked, attempts]
+        self._methods = {}
+        self._algorithms = {}
+
+    def add_result(self, result):
+        if not isinstance(result, CrackResult):
+            result = CrackResult.from_mapping(result)
+        self.results.append(result)
+        self.total_attempts += result.attempts
+        if result.cracked:
+            self.successful_cracks += 1
+        self._tally(self._methods, result.method, result)
+        if result.hash_type is not None:
+            self._tally(self._algorithms, result.hash_type, result)
+
+    @staticmethod
+    def _tally(totals, name, result):
+        entry = totals.get(name)
+        if entry is None:
+            entry = totals[name] = [0, 0, 0]
+        entry[0] += 1
+        entry[1] += result.cracked
+        entry[2] += result.attempts
+
+    def get_success_rate(self):
+        return (self.successful_cracks / len(self.results)) * 100 if self.results else 0
+
+    def __len__(self):
+        return len(self.results)
+
+    def __iter__(self):
+        return iter(self.results)
+
+    def by_method(self):
+        """{method: {'targets', 'cracked', 'attempts', 'success_rate'}}"""
+        return self._summarize(self._methods)
+
+    def by_algorithm(self):
+        """{algorithm: {'targets', 'cracked', 'attempts', 'success_rate'}} (batch results only)"""
+        return self._summarize(self._algorithms)
+
+    @staticmethod
+    def _summarize(totals):
+        return {
+            name: {'targets': targets, 'cracked': cracked, 'attempts': attempts,
+                   'success_rate': cracked / targets * 100}
+            for name, (targets, cracked, attempts) in totals.items()
+        }
+
+    def write_csv(self, f):
+        """Write the results as CSV with a RESULT_FIELDS header; returns the number of rows"""
+        writer = csv.writer(f)
+        writer.writerow(RESULT_FIELDS)
+        writer.writerows((r.hash, r.hash_type, r.cracked, r.password, r.attempts, r.time, r.method)
+                         for r in self.results)
+        return len(self.results)
+
+    def write_jsonl(self, f):
+        """Write one JSON object per result; returns the number of rows"""
+        for r in self.results:
+            f.write(f'{{"hash": {_json(r.hash)}, "hash_type": {_json(r.hash_type)}, '
+                    f'"cracked": {_json(r.cracked)}, "password": {_json(r.password)}, '
+                    f'"attempts": {r.attempts}, "time": {_json(r.time)}, "method": {_json(r.method)}}}\n')
+        return len(self.results)
+
+    def export(self, path, output_format=None):
+        """Write the results to path as 'csv' or 'jsonl' (default: from the file extension)"""
+        if output_format is None:
+            output_format = 'csv' if path.lower().endswith('.csv') else 'jsonl'
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            if output_format == 'csv':
+                return self.write_csv(f)
+            return self.write_jsonl(f)
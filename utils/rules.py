@@ -0,0 +1,216 @@
+"""Mangling-rule engine (hashcat/John-style rules) for rule-based attacks"""
+
+import os
+
+DEFAULT_RULES_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                  'rules', 'default.rule')
+
+# Base words used when a rule attack is given no wordlist
+DEFAULT_BASE_WORDS = ['password', 'admin', 'test', 'guest', '123', 'qwerty']
+
+_POSITIONS = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+
+def _position(char):
+    index = _POSITIONS.find(char)
+    if index < 0:
+        raise ValueError(f"Invalid rule position: {char!r}")
+    return index
+
+
+def _toggle_at(word, n):
+    if n >= len(word):
+        return word
+    return word[:n] + word[n].swapcase() + word[n + 1:]
+
+
+# op -> (argument kinds, function); 'c' is a literal character, 'n' a position
+OPERATIONS = {
+    ':': ('', lambda w: w),
+    'l': ('', str.lower),
+    'u': ('', str.upper),
+    'c': ('', str.capitalize),
+    'C': ('', lambda w: w[:1].lower() + w[1:].upper()),
+    't': ('', str.swapcase),
+    'T': ('n', _toggle_at),
+    'r': ('', lambda w: w[::-1]),
+    'd': ('', lambda w: w + w),
+    'f': ('', lambda w: w + w[::-1]),
+    '{': ('', lambda w: w[1:] + w[:1]),
+    '}': ('', lambda w: w[-1:] + w[:-1]),
+    '$': ('c', lambda w, c: w + c),
+    '^': ('c', lambda w, c: c + w),
+    '[': ('', lambda w: w[1:]),
+    ']': ('', lambda w: w[:-1]),
+    'D': ('n', lambda w, n: w[:n] + w[n + 1:]),
+    "'": ('n', lambda w, n: w[:n]),
+    's': ('cc', lambda w, x, y: w.replace(x, y)),
+    '@': ('c', lambda w, c: w.replace(c, '')),
+    'z': ('n', lambda w, n: w[:1] * n + w),
+    'Z': ('n', lambda w, n: w + w[-1:] * n),
+}
+
+
+def parse_rule(text):
+    """Parse one rule line into a tuple of (op, args) steps"""
+    steps = []
+    i = 0
+    while i < len(text):
+        op = text[i]
+        i += 1
+        if op == ' ':
+            continue
+        if op not in OPERATIONS:
+            raise ValueError(f"Unknown rule operation {op!r} in rule: {text}")
+        kinds, _ = OPERATIONS[op]
+        if i + len(kinds) > len(text):
+            raise ValueError(f"Missing argument for {op!r} in rule: {text}")
+        args = []
+        for kind in kinds:
+            args.append(_position(text[i]) if kind == 'n' else text[i])
+            i += 1
+        steps.append((op, tuple(args)))
+    return tuple(steps)
+
+
+def leet_rules(leet_map):
+    """Single-substitution rules ('sa4', 'so0', ...) from a leet map like HashCracker.common_leet_map"""
+    rules = []
+    for char, substitutes in leet_map.items():
+        for substitute in substitutes:
+            if substitute.lower() != char:
+                rules.append(f"s{char}{substitute}")
+    return rules
+
+
+class Rule:
+    """A compiled rule, split into a head transform and a trailing append suffix.
+
+    Rules whose steps end in ``$X`` appends share a head with other rules, so
+    a hash state seeded with the head can be copied per suffix.
+    """
+    __slots__ = ('text', 'head', 'suffix')
+
+    def __init__(self, text):
+        steps = parse_rule(text)
+        appends = len(steps)
+        while appends and steps[appends - 1][0] == '$':
+            appends -= 1
+        self.text = text
+        self.head = tuple(step for step in steps[:appends] if step[0] != ':')
+        self.suffix = ''.join(args[0] for _, args in steps[appends:])
+
+    def apply(self, word):
+        return apply_steps(self.head, word) + self.suffix
+
+
+def apply_steps(steps, word):
+    for op, args in steps:
+        word = OPERATIONS[op][1](word, *args)
+    return word
+
+
+class RuleEngine:
+    """Applies a list of rules to words, generating candidates lazily.
+
+    The keyspace is words x rules, ordered word-major and, within a word, by
+    rule group (rules sharing a head transform are adjacent). Candidate N is
+    ``rules[N % len(rules)]`` applied to ``words[N // len(rules)]``, so the
+    space can be split by index.
+    """
+    def __init__(self, rules):
+        compiled = []
+        seen = set()
+        for text in rules:
+            # Only blank/comment lines are skipped: a trailing space may be an argument ('$ ')
+            if not text.strip() or text.lstrip().startswith('#') or text in seen:
+                continue
+            seen.add(text)
+            compiled.append(Rule(text))
+
+        # Group by head transform, keeping first-seen order of the groups
+        groups = {}
+        for rule in compiled:
+            groups.setdefault(rule.head, []).append(rule)
+        self.groups = [(head, [rule.suffix for rule in group]) for head, group in groups.items()]
+        self.rules = [rule for group in groups.values() for rule in group]
+
+    @classmethod
+    def from_file(cls, filepath, extra_rules=()):
+        if not os.path.exists(filepath):
+            raise FileNotFoundError(f"Rules file not found: {filepath}")
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return cls([line.rstrip('\r\n') for line in f] + list(extra_rules))
+
+    @classmethod
+    def default(cls, leet_map=None):
+        """The bundled default rules, plus leet substitutions when a map is given"""
+        return cls.from_file(DEFAULT_RULES_FILE, leet_rules(leet_map) if leet_map else ())
+
+    def __len__(self):
+        return len(self.rules)
+
+    def keyspace(self, words):
+        """Number of candidates for words (None if words has no length)"""
+        return len(words) * len(self.rules) if hasattr(words, '__len__') else None
+
+    def expand(self, word):
+        """Yield (head, suffixes) for one word, one pair per rule group"""
+        for head, suffixes in self.groups:
+            yield apply_steps(head, word), suffixes
+
+    def candidates(self, words, max_length=None):
+        """Lazily yield every candidate, in keyspace order"""
+        for word in words:
+            for head, suffixes in self.expand(word):
+                for suffix in suffixes:
+                    candidate = head + suffix
+                    if max_length is None or len(candidate) <= max_length:
+                        yield candidate
+
+    def candidate(self, words, index):
+        """Candidate number index of the keyspace (words must be indexable)"""
+        word_index, rule_index = divmod(index, len(self.rules))
+        return self.rules[rule_index].apply(words[word_index])
+
+    def iter_range(self, words, start, end):
+        """Yield candidates start..end-1 of the keyspace (words must be indexable)"""
+        rules = self.rules
+        word_index, rule_index = divmod(start, len(rules))
+        for _ in range(start, end):
+            yield rules[rule_index].apply(words[word_index])
+            rule_index += 1
+            if rule_index == len(rules):
+                word_index += 1
+                rule_index = 0
+
+
+class RuleCandidates:
+    """Re-iterable, lazily generated candidates of a RuleEngine over words.
+
+    ``len()`` is the keyspace (words x rules) without generating anything,
+    which progress bars and shard planning can use directly. Over chunked
+    words (a WordlistSource) ``chunks()`` yields the candidates of each
+    word chunk, with that chunk's resume offset as ``end``.
+    """
+    def __init__(self, engine, words, max_length=None):
+        self.engine = engine
+        self.words = words
+        self.max_length = max_length
+        if hasattr(words, 'chunks'):
+            self.chunks = self._chunks
+
+    def _chunks(self):
+        for words in self.words.chunks():
+            chunk = RuleCandidates(self.engine, words, self.max_length)
+            chunk.end = words.end
+            yield chunk
+
+    def __iter__(self):
+        return self.engine.candidates(self.words, self.max_length)
+
+    def __len__(self):
+        keyspace = self.engine.keyspace(self.words)
+        if keyspace is None:
+            raise TypeError("keyspace unknown: words have no length")
+        return keyspace
@@ -0,0 +1,151 @@
+"""Adaptive strategy ordering by expected hits per second, and run time budgets"""
+
+import json
+import os
+import time
+from itertools import islice
+
+DEFAULT_STATS = os.path.join(os.path.expanduser('~'), '.password-resilience.stats.json')
+
+# Hit rate (hits per candidate per target) assumed before a strategy has any
+# history, worth PRIOR_WEIGHT candidates, so one lucky or unlucky run does not
+# reorder the strategies on its own
+PRIOR_HIT_RATES = {'common': 1e-3, 'wordlist': 1e-5, 'rules': 1e-6}
+PRIOR_WEIGHT = 100000
+
+# Candidates per second assumed until a strategy has run for MIN_SECONDS
+DEFAULT_THROUGHPUT = 500000.0
+MIN_SECONDS = 0.05
+
+# Candidates between deadline checks in a budgeted source
+BUDGET_BLOCK = 4096
+
+# Bytes sampled from a wordlist to estimate its line count
+SAMPLE_BYTES = 1024 * 1024
+
+
+class StrategyStats:
+    """Candidates, hits and seconds per strategy across runs, optionally saved as JSON.
+
+    Hit rates are per candidate per target: a batch run against many hashes
+    counts every candidate once for each target it was tried against.
+    """
+    def __init__(self, path=None):
+        self.path = path
+        self.totals = {}
+        if path and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.totals = json.load(f)
+
+    def record(self, strategy, result, seconds):
+        """Add one attack run: a CrackResult, or a batch CrackResults"""
+        if hasattr(result, 'results'):
+            candidates, exposure, hits = result.candidates, result.total_attempts, result.successful_cracks
+        else:
+            candidates = exposure = result['attempts']
+            hits = int(result['cracked'])
+        totals = self.totals.setdefault(strategy, {'runs': 0, 'candidates': 0, 'exposure': 0, 'hits': 0,
+                                                   'seconds': 0.0})
+        totals['runs'] += 1
+        totals['candidates'] += candidates
+        totals['exposure'] += exposure
+        totals['hits'] += hits
+        totals['seconds'] += seconds
+
+    def hit_rate(self, strategy):
+        """Smoothed hits per candidate per target"""
+        totals = self.totals.get(strategy, {})
+        prior = PRIOR_HIT_RATES.get(strategy, min(PRIOR_HIT_RATES.values()))
+        return (totals.get('hits', 0) + prior * PRIOR_WEIGHT) / (totals.get('exposure', 0) + PRIOR_WEIGHT)
+
+    def throughput(self, strategy):
+        """Measured candidates per second (DEFAULT_THROUGHPUT until timed)"""
+        totals = self.totals.get(strategy)
+        if totals and totals['seconds'] >= MIN_SECONDS:
+            return totals['candidates'] / totals['seconds']
+        return DEFAULT_THROUGHPUT
+
+    def save(self):
+        if not self.path:
+            return
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.totals, f, indent=2)
+        os.replace(temp_path, self.path)
+
+
+def estimate_lines(filepath):
+    """Approximate line count of a file from the line length in its first SAMPLE_BYTES"""
+    size = os.path.getsize(filepath)
+    with open(filepath, 'rb') as f:
+        sample = f.read(SAMPLE_BYTES)
+    if len(sample) == size:
+        return sample.count(b'\n') + (not sample.endswith(b'\n') and size > 0)
+    return int(size * max(sample.count(b'\n'), 1) / len(sample))
+
+
+def schedule(keyspaces, stats, targets=1):
+    """Plan strategies, highest expected hits per second first.
+
+    ``keyspaces`` maps strategy -> estimated candidates (None if unknown),
+    in the default order, which breaks ties. Returns one dict per strategy
+    with its hits_per_second and estimated seconds.
+    """
+    plan = []
+    for strategy, keyspace in keyspaces.items():
+        throughput = stats.throughput(strategy)
+        plan.append({
+            'strategy': strategy,
+            'keyspace': keyspace,
+            'hits_per_second': stats.hit_rate(strategy) * throughput * targets,
+            'seconds': keyspace / throughput if keyspace is not None else None
+        })
+    plan.sort(key=lambda step: -step['hits_per_second'])
+    return plan
+
+
+class Deadline:
+    """Wall-clock budget for a run (``seconds`` None means unlimited, 0 already expired)"""
+    def __init__(self, seconds=None):
+        self.at = time.monotonic() + seconds if seconds is not None else None
+
+    def expired(self):
+        return self.at is not None and time.monotonic() >= self.at
+
+    def limit(self, words):
+        """words, cut off once the deadline passes (unchanged when unlimited)"""
+        return words if self.at is None else Budgeted(words, self)
+
+
+class Budgeted:
+    """Candidate source that stops yielding when its deadline passes.
+
+    The clock is read once per BUDGET_BLOCK candidates, or per chunk for a
+    chunked WordlistSource (whose chunk offsets stay resumable). Length and
+    other attributes are those of the wrapped source.
+    """
+    def __init__(self, words, deadline):
+        self.words = words
+        self.deadline = deadline
+        if hasattr(words, 'chunks'):
+            self.chunks = self._chunks
+
+    def __iter__(self):
+        iterator = iter(self.words)
+        while not self.deadline.expired():
+            block = list(islice(iterator, BUDGET_BLOCK))
+            if not block:
+                return
+            yield from block
+
+    def _chunks(self):
+        for chunk in self.words.chunks():
+            if self.deadline.expired():
+                return
+            yield chunk
+
+    def __len__(self):
+        return len(self.words)
+
+    def __getattr__(self, name):
+        return getattr(self.words, name)
@@ -0,0 +1,206 @@
+"""Bounded LRU cache of scoring results for repeated passwords.
+
+Entries are keyed by a keyed BLAKE2b hash of the password, so no plaintext
+is held as a cache key. In memory the key is random per process. An
+optional SQLite file shares results between processes (a process pool, the
+audit service's workers, or later runs); its key must come from outside the
+file (a key file or SECRET_ENV), since anyone holding both could test
+password guesses against the stored hashes.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_SIZE = 65536
+
+# Keys looked up per SQLite query (below the bound-parameter limit)
+_QUERY_BATCH = 500
+
+# Environment variable holding the hex key of a cache file
+SECRET_ENV = 'PASSWORD_RESILIENCE_CACHE_KEY'
+
+
+def load_secret(key_file=None):
+    """Key for a cache file: from key_file, else the SECRET_ENV variable, else None.
+
+    A missing key file is created, readable by its owner only, with a new
+    random key. Keys are stored as hex.
+    """
+    if key_file:
+        try:
+            fd = os.open(key_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            with open(key_file, 'r', encoding='ascii') as f:
+                value = f.read().strip()
+        else:
+            value = os.urandom(32).hex()
+            with os.fdopen(fd, 'w', encoding='ascii') as f:
+                f.write(value + '\n')
+    else:
+        value = os.environ.get(SECRET_ENV)
+    return bytes.fromhex(value) if value else None
+
+
+class ScoreCache:
+    """LRU of score dicts (see utils.scoring.score_chunk) with optional TTL and SQLite backing.
+
+    ``maxsize`` bounds the in-memory entries; ``ttl`` (seconds) expires
+    entries in memory and on disk. ``namespace`` separates results that
+    depend on context, such as the common-password index used. A ``path``
+    needs a ``secret`` (bytes; default load_secret()), which is never
+    written to the file. Cached dicts are shared between callers and must
+    not be modified.
+    """
+    def __init__(self, maxsize=DEFAULT_SIZE, ttl=None, path=None, namespace='', secret=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.path = path
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expired = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            if secret is None:
+                secret = load_secret()
+            if not secret:
+                raise ValueError(f"A cache file needs a key kept outside it (a key file or {SECRET_ENV})")
+            if len(secret) > 64:
+                raise ValueError("Cache keys are at most 64 bytes")
+            self._db = self._open(path)
+        else:
+            secret = os.urandom(32)
+        self._secret = secret
+        secret = hashlib.blake2b(namespace.encode('utf-8'), key=self._secret, digest_size=32).digest()
+        # Keyed state copied per password (cheaper than re-keying)
+        self._hasher = hashlib.blake2b(key=secret, digest_size=16)
+
+    def _open(self, path):
+        db = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute('PRAGMA synchronous=NORMAL')
+        # Earlier versions kept the hash key in the file itself
+        db.execute('DROP TABLE IF EXISTS meta')
+        db.execute('CREATE TABLE IF NOT EXISTS scores (key BLOB PRIMARY KEY, expires REAL, result TEXT)')
+        db.execute('DELETE FROM scores WHERE expires IS NOT NULL AND expires < ?', (time.time(),))
+        return db
+
+    def options(self):
+        """Arguments that open this cache in another process (sharing the file, if any)"""
+        return {'maxsize': self.maxsize, 'ttl': self.ttl, 'path': self.path,
+                'secret': self._secret if self.path else None}
+
+    def keys(self, passwords):
+        """Cache keys: keyed 128-bit BLAKE2b digests of the passwords"""
+        copy = self._hasher.copy
+        keys = []
+        for password in passwords:
+            hasher = copy()
+            hasher.update(password.encode('utf-8', 'surrogatepass'))
+            keys.append(hasher.digest())
+        return keys
+
+    def score_chunk(self, passwords, score):
+        """Results for a list of passwords; ``score(list)`` is called only for those not cached"""
+        keys = self.keys(passwords)
+        results = [None] * len(keys)
+        missing = {}
+        now = time.time()
+        with self._lock:
+            entries = self._entries
+            for i, key in enumerate(keys):
+                entry = entries.get(key)
+                if entry is not None:
+                    expires, result = entry
+                    if expires is None or expires > now:
+                        entries.move_to_end(key)
+                        results[i] = result
+                        continue
+                    del entries[key]
+                    self.expired += 1
+                missing.setdefault(key, []).append(i)
+            hits = len(keys) - sum(map(len, missing.values()))
+            if missing and self._db is not None:
+                for key, expires, result in self._load(list(missing), now):
+                    result = json.loads(result)
+                    self._store(key, expires, result)
+                    positions = missing.pop(key)
+                    for i in positions:
+                        results[i] = result
+                    self.disk_hits += 1
+                    hits += len(positions) - 1
+            self.hits += hits
+
+        if not missing:
+            return results
+        scored = score([passwords[positions[0]] for positions in missing.values()])
+        expires = now + self.ttl if self.ttl else None
+        with self._lock:
+            for (key, positions), result in zip(missing.items(), scored):
+                self._store(key, expires, result)
+                for i in positions:
+                    results[i] = result
+                # Repeats within the chunk were scored once
+                self.hits += len(positions) - 1
+            self.misses += len(missing)
+            if self._db is not None:
+                self._db.execute('BEGIN')
+                self._db.executemany('INSERT OR REPLACE INTO scores VALUES (?, ?, ?)',
+                                     [(key, expires, json.dumps(result))
+                                      for key, result in zip(missing, scored)])
+                self._db.execute('COMMIT')
+        return results
+
+    def score(self, password, score):
+        """Result for one password (``score`` maps a list to a list of results)"""
+        return self.score_chunk([password], score)[0]
+
+    def _load(self, keys, now):
+        for start in range(0, len(keys), _QUERY_BATCH):
+            batch = keys[start:start + _QUERY_BATCH]
+            yield from self._db.execute(
+                f"SELECT key, expires, result FROM scores WHERE key IN ({','.join('?' * len(batch))})"
+                " AND (expires IS NULL OR expires > ?)", (*batch, now)
+            ).fetchall()
+
+    def _store(self, key, expires, result):
+        self._entries[key] = (expires, result)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expired': self.expired,
+            'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0
+        }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute('DELETE FROM scores')
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def __len__(self):
+        return len(self._entries)
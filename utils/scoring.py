@@ -0,0 +1,268 @@
+"""Headless password strength scoring for batch audits.
+
+This module is the lightweight scoring entry point: it imports no
+colorama, tqdm, hashlib or multiprocessing, so it starts quickly when run
+per call (``python -m utils.scoring PASSWORD ...``).
+"""
+
+import array
+import csv
+import json
+import math
+import string
+from bisect import bisect_right
+
+from utils.patterns import scan_patterns
+from utils.wordlists import extended_common_passwords
+
+# Character classes in the order calculate_entropy reports them
+CHAR_CLASSES = ('lower', 'upper', 'digits', 'special', 'other')
+
+# Pool size contributed by each class, and its bit in a pool mask
+POOL_SIZES = (26, 26, 10, 32, 50)
+
+# Entropy bits per character for every combination of classes present
+LOG2_POOL = array.array('d', [
+    math.log2(sum(size for bit, size in enumerate(POOL_SIZES) if mask & (1 << bit))) if mask else 0.0
+    for mask in range(1 << len(POOL_SIZES))
+])
+
+# Upper entropy bounds of each strength label (see strength_label)
+STRENGTH_THRESHOLDS = (28, 36, 60, 128)
+STRENGTH_LABELS = ("Very Weak", "Weak", "Moderate", "Strong", "Very Strong")
+
+# Translation tables folding each character onto a class marker: lower 'a',
+# upper 'A', digit '0', punctuation '!', printable whitespace ' ', and 0x7f
+# for other ASCII. Non-ASCII characters (str path only) count as 'other'.
+_CLASS_MARKERS = ('a', 'A', '0', '!')
+_CLASS_TABLE = {code: ord(' ') if chr(code) in string.whitespace else 0x7f for code in range(128)}
+for _marker, _chars in zip(_CLASS_MARKERS, (string.ascii_lowercase, string.ascii_uppercase,
+                                            string.digits, string.punctuation)):
+    _CLASS_TABLE.update((ord(char), ord(_marker)) for char in _chars)
+_ASCII_CLASS_TABLE = bytes(_CLASS_TABLE[code] for code in range(128)) + bytes(range(128, 256))
+
+# Passwords scored per vectorized chunk
+CHUNK_SIZE = 10000
+
+
+def class_counts(password):
+    """Character counts per class as [lower, upper, digits, special, other]"""
+    if password.isascii():
+        classes = password.encode('ascii').translate(_ASCII_CLASS_TABLE)
+        lower, upper, digits, special = (classes.count(b'a'), classes.count(b'A'),
+                                         classes.count(b'0'), classes.count(b'!'))
+        return [lower, upper, digits, special, classes.count(b'\x7f')]
+    
+    classes = password.translate(_CLASS_TABLE)
+    lower, upper, digits, special = (classes.count('a'), classes.count('A'),
+                                     classes.count('0'), classes.count('!'))
+    # Printable whitespace belongs to no class; everything else left over is 'other'
+    other = len(classes) - lower - upper - digits - special - classes.count(' ')
+    return [lower, upper, digits, special, other]
+
+
+def classify_characters(password):
+    """Count characters per class in a single table-driven pass"""
+    lower, upper, digits, special, other = class_counts(password)
+    return {'lower': lower, 'upper': upper, 'digits': digits, 'special': special, 'other': other}
+
+
+def counts_mask(counts):
+    """Bit mask of the character classes present, from class_counts"""
+    lower, upper, digits, special, other = counts
+    return (lower > 0) | (upper > 0) << 1 | (digits > 0) << 2 | (special > 0) << 3 | (other > 0) << 4
+
+
+def pool_mask(char_categories):
+    """Bit mask of the character classes present"""
+    return counts_mask([char_categories[name] for name in CHAR_CLASSES])
+
+
+def advanced_patterns(password):
+    """Human-readable list of predictable patterns"""
+    return scan_patterns(password)[1]
+
+
+def strength_label(entropy):
+    """Strength rating for an entropy value"""
+    return STRENGTH_LABELS[bisect_right(STRENGTH_THRESHOLDS, entropy)]
+
+
+def score_chunk(passwords, common_passwords, scan=scan_patterns):
+    """Score a list of passwords, computing the numeric columns array-wise"""
+    count = len(passwords)
+    lengths = array.array('l', [0]) * count
+    masks = array.array('B', [0]) * count
+    penalties = array.array('d', [0.0]) * count
+    categories = []
+    patterns = []
+    common = []
+
+    # One pass per password for everything that needs the characters
+    for i, password in enumerate(passwords):
+        counts = class_counts(password)
+        categories.append(dict(zip(CHAR_CLASSES, counts)))
+        lengths[i] = len(password)
+        masks[i] = counts_mask(counts)
+        penalties[i], found = scan(password)
+        patterns.append(found)
+        common.append(password.lower() in common_passwords)
+
+    # Numeric scoring over the columns
+    raw = array.array('d', map(float.__mul__, map(float, lengths), map(LOG2_POOL.__getitem__, masks)))
+    adjusted = array.array('d', map(max, [0.0] * count, map(float.__sub__, raw, penalties)))
+    labels = [STRENGTH_LABELS[bisect_right(STRENGTH_THRESHOLDS, value)] for value in adjusted]
+
+    return [
+        {
+            'length': lengths[i],
+            'entropy': adjusted[i],
+            'raw_entropy': raw[i],
+            'strength': labels[i],
+            'is_common': common[i],
+            'char_categories': categories[i],
+            'patterns': patterns[i],
+        }
+        for i in range(count)
+    ]
+
+
+def score_password(password, common_passwords=extended_common_passwords):
+    """Score one password (the same result dict as score_chunk)"""
+    return score_chunk([password], common_passwords)[0]
+
+
+def score_passwords(passwords, common_passwords, chunk_size=CHUNK_SIZE, scan=scan_patterns, cache=None,
+                    scorer=score_chunk):
+    """Stream (index, result) pairs for an iterable of passwords.
+
+    With a ``cache`` (utils.scorecache.ScoreCache) only passwords it does
+    not hold are scored. ``scorer`` stands in for score_chunk (e.g. timed).
+    """
+    def score(chunk):
+        return scorer(chunk, common_passwords, scan)
+
+    if cache is not None:
+        def score(chunk, uncached=score):
+            return cache.score_chunk(chunk, uncached)
+
+    chunk = []
+    index = 0
+    for password in passwords:
+        chunk.append(password)
+        if len(chunk) == chunk_size:
+            for result in score(chunk):
+                yield index, result
+                index += 1
+            chunk = []
+    if chunk:
+        for result in score(chunk):
+            yield index, result
+            index += 1
+
+
+# Common-password list and score cache of a scoring worker process, set by init_worker
+_worker_common = extended_common_passwords
+_worker_cache = None
+
+
+def init_worker(breach_index=None, cache_options=None):
+    """Process-pool initializer: open the breached-password index (mmap, shared between processes).
+
+    ``cache_options`` are ScoreCache arguments; with a ``path`` every
+    process shares the cached scores through that file.
+    """
+    global _worker_common, _worker_cache
+    if breach_index:
+        from utils.breached import CommonPasswords
+        _worker_common = CommonPasswords(breach_index)
+    else:
+        _worker_common = extended_common_passwords
+    _worker_cache = None
+    if cache_options is not None:
+        from utils.scorecache import ScoreCache
+        _worker_cache = ScoreCache(namespace=breach_index or '', **cache_options)
+
+
+def worker_common():
+    """The common-password list init_worker opened in this process"""
+    return _worker_common
+
+
+def worker_cache():
+    """The ScoreCache init_worker set up in this process (None without one)"""
+    return _worker_cache
+
+
+def _score_worker(passwords):
+    return score_chunk(passwords, _worker_common)
+
+
+def score_many(passwords):
+    """Pool entry point: score a batch against this worker's common-password list and cache"""
+    if _worker_cache is not None:
+        return _worker_cache.score_chunk(passwords, _score_worker)
+    return _score_worker(passwords)
+
+
+def check_common_many(passwords):
+    """Pool entry point: common-password membership for a batch"""
+    return [password.lower() in _worker_common for password in passwords]
+
+
+def read_passwords(f):
+    """Yield one password per line, keeping everything but the line ending"""
+    for line in f:
+        yield line.rstrip('\r\n')
+
+
+CSV_FIELDS = ['id', 'length', 'entropy', 'raw_entropy', 'strength', 'is_common',
+              *CHAR_CLASSES, 'patterns']
+
+
+def write_results(results, f, output_format='jsonl', header=True):
+    """Write (index, result) pairs as JSON Lines or CSV; returns the row count"""
+    rows = 0
+    if output_format == 'csv':
+        writer = csv.writer(f)
+        if header:
+            writer.writerow(CSV_FIELDS)
+        for index, result in results:
+            char_categories = result['char_categories']
+            writer.writerow([index, result['length'], f"{result['entropy']:.4f}", f"{result['raw_entropy']:.4f}",
+                             result['strength'], result['is_common'],
+                             *(char_categories[name] for name in CHAR_CLASSES),
+                             '; '.join(result['patterns'])])
+            rows += 1
+    elif output_format == 'jsonl':
+        dumps = json.dumps
+        for index, result in results:
+            f.write(dumps({'id': index, **result}) + '\n')
+            rows += 1
+    else:
+        raise ValueError(f"Unsupported output format: {output_format}")
+    return rows
+
+
+def main(argv=None):
+    """Score passwords given as arguments (or one per stdin line) as JSON Lines on stdout"""
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description='Lightweight password strength scoring (JSON Lines)')
+    parser.add_argument('passwords', nargs='*', help='Passwords to score (default: read stdin)')
+    parser.add_argument('--index', help='Breached-password index file (checked as common passwords)')
+    parser.add_argument('--format', choices=['jsonl', 'csv'], default='jsonl', help='Output format')
+    args = parser.parse_args(argv)
+
+    common_passwords = extended_common_passwords
+    if args.index:
+        from utils.breached import CommonPasswords
+        common_passwords = CommonPasswords(args.index)
+
+    passwords = args.passwords or read_passwords(sys.stdin)
+    write_results(score_passwords(passwords, common_passwords), sys.stdout, args.format)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,238 @@
+"""Long-lived asyncio audit service (HTTP over TCP or a Unix socket, stdlib only)"""
+
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from utils.scoring import check_common_many, init_worker, score_many, worker_cache
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# Largest micro-batch, and how long the first request of a batch may wait for
+# company (0: flush on the next event-loop iteration, which already collects
+# every request that arrived in the same poll)
+MAX_BATCH = 512
+MAX_DELAY = 0.0
+
+# Batches up to this size are cheaper to score inline than to hand to the
+# executor (a thread hop costs more than scoring a few passwords)
+INLINE_LIMIT = 16
+
+# Request bodies beyond this are rejected with 413
+MAX_BODY = 1024 * 1024
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+            413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+class MicroBatcher:
+    """Coalesce concurrent single-item calls into one bulk call run in an executor.
+
+    The first item of a batch starts a ``max_delay`` timer; the batch is
+    flushed when the timer fires or it reaches ``max_batch`` items. Batches
+    larger than ``inline_limit`` run in the executor, smaller ones on the
+    event loop. The bulk function must map a list of items to a list of
+    results in the same order.
+    """
+    def __init__(self, func, executor, max_batch=MAX_BATCH, max_delay=MAX_DELAY, inline_limit=INLINE_LIMIT):
+        self.func = func
+        self.executor = executor
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.inline_limit = inline_limit
+        self.batches = 0
+        self.items = 0
+        self._pending = []
+        self._timer = None
+
+    async def submit(self, item):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            if self.max_delay:
+                self._timer = loop.call_later(self.max_delay, self._flush)
+            else:
+                self._timer = loop.call_soon(self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        self.batches += 1
+        self.items += len(batch)
+        if len(batch) <= self.inline_limit:
+            try:
+                self._deliver(batch, self.func([item for item, _ in batch]))
+            except Exception as e:
+                self._fail(batch, e)
+        else:
+            asyncio.get_running_loop().create_task(self._run(batch))
+
+    async def _run(self, batch):
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                self.executor, self.func, [item for item, _ in batch]
+            )
+        except Exception as e:
+            self._fail(batch, e)
+            return
+        self._deliver(batch, results)
+
+    @staticmethod
+    def _fail(batch, error):
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+    @staticmethod
+    def _deliver(batch, results):
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+class AuditService:
+    """HTTP/1.1 JSON service for strength scoring and common-password checks.
+
+    Endpoints:
+      POST /score   {"password": "..."} or {"passwords": [...]}
+      POST /common  {"password": "..."} or {"passwords": [...]}
+      GET  /health  service counters
+
+    Scoring runs in ``workers`` processes (a single thread when 0), so the
+    event loop only parses requests and batches them. ``breach_index`` is a
+    password index file every scoring process maps read-only. ``cache`` is
+    a dict of ScoreCache options enabling a score cache in each process.
+    """
+    def __init__(self, workers=0, max_batch=MAX_BATCH, max_delay=MAX_DELAY, breach_index=None, cache=None):
+        # Small batches are scored on the event loop, so this process needs the index too
+        init_worker(breach_index, cache)
+        if workers:
+            self.executor = ProcessPoolExecutor(workers, initializer=init_worker, initargs=(breach_index, cache))
+        else:
+            self.executor = ThreadPoolExecutor(1)
+        self.scorer = MicroBatcher(score_many, self.executor, max_batch, max_delay)
+        self.common = MicroBatcher(check_common_many, self.executor, max_batch, max_delay)
+        self.requests = 0
+        self.started = time.time()
+
+    async def score(self, passwords):
+        return await asyncio.gather(*(self.scorer.submit(password) for password in passwords))
+
+    async def check_common(self, passwords):
+        return await asyncio.gather(*(self.common.submit(password) for password in passwords))
+
+    async def route(self, method, path, body):
+        """Dispatch one request; returns (status, payload)"""
+        if path == '/health':
+            return 200, {
+                'status': 'ok',
+                'uptime': time.time() - self.started,
+                'requests': self.requests,
+                'batches': self.scorer.batches + self.common.batches,
+                'batched_items': self.scorer.items + self.common.items,
+                # This process only: worker processes keep their own counters
+                'cache': worker_cache().stats() if worker_cache() is not None else None,
+            }
+        if path not in ('/score', '/common'):
+            return 404, {'error': f"unknown endpoint: {path}"}
+        if method != 'POST':
+            return 405, {'error': f"{path} expects POST"}
+
+        try:
+            request = json.loads(body)
+            single = 'password' in request
+            passwords = [request['password']] if single else request['passwords']
+            if not isinstance(passwords, list) or not all(isinstance(p, str) for p in passwords):
+                raise ValueError
+        except (ValueError, KeyError, TypeError):
+            return 400, {'error': 'expected JSON {"password": str} or {"passwords": [str, ...]}'}
+
+        if path == '/score':
+            results = await self.score(passwords)
+            return 200, results[0] if single else {'results': results}
+        results = await self.check_common(passwords)
+        if single:
+            return 200, {'is_common': results[0]}
+        return 200, {'results': [{'is_common': result} for result in results]}
+
+    async def handle(self, reader, writer):
+        """Serve one connection, keeping it alive between requests"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    await self._respond(writer, 400, {'error': 'malformed request line'}, False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+                try:
+                    length = int(headers.get('content-length') or 0)
+                except ValueError:
+                    await self._respond(writer, 400, {'error': 'invalid Content-Length'}, False)
+                    break
+                if length > MAX_BODY:
+                    await self._respond(writer, 413, {'error': 'request body too large'}, False)
+                    break
+                body = await reader.readexactly(length) if length else b'{}'
+
+                self.requests += 1
+                try:
+                    status, payload = await self.route(method, path.split('?', 1)[0], body)
+                except Exception as e:
+                    status, payload = 500, {'error': str(e)}
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload).encode('utf-8')
+        writer.write(
+            f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + body
+        )
+        await writer.drain()
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT, socket_path=None):
+        """Start listening on a Unix socket (if given) or host:port; returns the asyncio server"""
+        if socket_path:
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+            return await asyncio.start_unix_server(self.handle, path=socket_path)
+        return await asyncio.start_server(self.handle, host, port)
+
+    async def serve_forever(self, host=DEFAULT_HOST, port=DEFAULT_PORT, socket_path=None):
+        server = await self.start(host, port, socket_path)
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
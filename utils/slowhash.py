@@ -0,0 +1,236 @@
+"""Salted, deliberately slow hashes (modular crypt format) via passlib"""
+
+import heapq
+import os
+import time
+from collections import deque
+from itertools import islice
+from utils.metrics import active
+from utils.progress import Progress
+from utils.results import CrackResult
+from utils.wordlists import BloomFilter
+
+# Modular-crypt prefixes and the passlib handler that verifies them
+CRYPT_PREFIXES = (
+    ('$2a$', 'bcrypt'),
+    ('$2b$', 'bcrypt'),
+    ('$2y$', 'bcrypt'),
+    ('$pbkdf2-sha256$', 'pbkdf2_sha256'),
+    ('$pbkdf2-sha512$', 'pbkdf2_sha512'),
+    ('$pbkdf2$', 'pbkdf2_sha1'),
+    ('$6$', 'sha512_crypt'),
+    ('$5$', 'sha256_crypt'),
+    ('$1$', 'md5_crypt'),
+    ('$apr1$', 'apr_md5_crypt'),
+    ('$scrypt$', 'scrypt'),
+    ('$argon2', 'argon2'),
+)
+
+CRYPT_SCHEMES = frozenset(scheme for _, scheme in CRYPT_PREFIXES)
+
+# Target seconds of work per scheduled unit (one target x a block of candidates)
+UNIT_SECONDS = 0.25
+MAX_BLOCK = 4096
+
+# Candidates are deduplicated and scheduled a window at a time, so memory
+# stays bounded whatever the length of the candidate stream
+CANDIDATE_WINDOW = 65536
+DEDUPE_BYTES = 4 * 1024 * 1024
+
+# Password used to time one verification of each cost setting
+_PROBE = 'cost-probe'
+
+
+def detect_scheme(hash_string):
+    """passlib scheme name for a modular-crypt hash, or None"""
+    for prefix, scheme in CRYPT_PREFIXES:
+        if hash_string.startswith(prefix):
+            return scheme
+    return None
+
+
+def scheme_handler(scheme):
+    """The passlib handler for a scheme (passlib is imported on first use)"""
+    if scheme not in CRYPT_SCHEMES:
+        raise ValueError(f"Unsupported algorithm: {scheme}")
+    from passlib import hash as passlib_hash
+    return getattr(passlib_hash, scheme)
+
+
+def hash_slow(password, scheme):
+    """Hash password with a fresh salt and the scheme's default cost"""
+    return scheme_handler(scheme).hash(password)
+
+
+def verify_slow(password, hash_string, scheme=None):
+    """Verify password (str or bytes) against a modular-crypt hash"""
+    handler = scheme_handler(scheme or detect_scheme(hash_string))
+    try:
+        return handler.verify(password, hash_string)
+    except ValueError:
+        return False
+
+
+def cost_key(hash_string, scheme):
+    """(scheme, rounds) identifying the verification cost of a hash; raises ValueError if malformed"""
+    parsed = scheme_handler(scheme).from_string(hash_string)
+    return scheme, getattr(parsed, 'rounds', None)
+
+
+def _verify_unit(unit):
+    """Worker entry point: try a block of candidates against one hash; returns (index, word, attempts, seconds)"""
+    started = time.perf_counter()
+    index, scheme, hash_string, words = unit
+    verify = scheme_handler(scheme).verify
+    for attempts, word in enumerate(words, 1):
+        if verify(word, hash_string):
+            return index, word, attempts, time.perf_counter() - started
+    return index, None, len(words), time.perf_counter() - started
+
+
+class SlowHashScheduler:
+    """Cost-aware dictionary attack against salted slow hashes.
+
+    Every target is timed once per (scheme, rounds) and gets candidate
+    blocks sized to about UNIT_SECONDS of work. Units are scheduled by the
+    time already spent on their target, so cheap hashes and the earliest
+    (most likely) candidates go first and an expensive target cannot starve
+    the rest. Verification runs in a process pool when max_workers > 1.
+    No new units are scheduled once ``deadline`` (a Deadline) has passed.
+
+    Candidates are read ``window`` at a time and every target finishes a
+    window before the next is read. Repeats are dropped by a Bloom filter of
+    ``dedupe_bytes`` over the whole stream (a few unique words may also be
+    skipped), or only within each window when dedupe_bytes is 0.
+    """
+    def __init__(self, max_workers=None, unit_seconds=UNIT_SECONDS, deadline=None,
+                 window=CANDIDATE_WINDOW, dedupe_bytes=DEDUPE_BYTES):
+        self.max_workers = max_workers or os.cpu_count()
+        self.unit_seconds = unit_seconds
+        self.deadline = deadline
+        self.window = window
+        self.dedupe_bytes = dedupe_bytes
+        self._costs = {}
+
+    def estimate_cost(self, hash_string, scheme):
+        """Seconds per verification, measured once per cost setting"""
+        key = cost_key(hash_string, scheme)
+        if key not in self._costs:
+            start = time.perf_counter()
+            scheme_handler(scheme).verify(_PROBE, hash_string)
+            self._costs[key] = max(time.perf_counter() - start, 1e-6)
+        return self._costs[key]
+
+    def windows(self, candidates):
+        """Lazily yield lists of up to ``window`` distinct, not previously seen candidates"""
+        stream = iter(candidates)
+        seen = BloomFilter(self.dedupe_bytes) if self.dedupe_bytes else None
+        while True:
+            block = list(islice(stream, self.window))
+            if not block:
+                return
+            if seen is None:
+                block = list(dict.fromkeys(block))
+            else:
+                block = [word for word in block if not seen.add(word)]
+            if block:
+                yield block
+
+    def run(self, targets, candidates, desc="Slow hashes", method='dictionary'):
+        """Attack (hash, scheme) targets with an ordered candidate stream; returns {hash: result}"""
+        start_time = time.time()
+        total = len(candidates) if hasattr(candidates, '__len__') else None
+        windows = self.windows(candidates)
+        results = {}
+        attempts = {}
+        heap = []
+        plan = {}
+
+        for index, (hash_string, scheme) in enumerate(targets):
+            try:
+                cost = self.estimate_cost(hash_string, scheme)
+            except ValueError:
+                results[hash_string] = self._result(hash_string, scheme, None, 0, start_time, method)
+                continue
+            block = max(1, min(MAX_BLOCK, int(self.unit_seconds / cost)))
+            plan[index] = (hash_string, scheme, cost, block)
+            attempts[index] = 0
+
+        # The current window and the number of candidates in earlier windows
+        window = []
+        offset = 0
+
+        def next_unit():
+            nonlocal window, offset
+            if self.deadline is not None and self.deadline.expired():
+                return None
+            while True:
+                while heap:
+                    _, cost, index, first = heapq.heappop(heap)
+                    hash_string, scheme, _, block = plan[index]
+                    if hash_string in results:
+                        continue
+                    last = min(first + block, len(window))
+                    if last < len(window):
+                        heapq.heappush(heap, ((offset + last) * cost, cost, index, last))
+                    return index, scheme, hash_string, window[first:last]
+                pending = [index for index, (hash_string, *_) in plan.items() if hash_string not in results]
+                if not pending:
+                    return None
+                offset += len(window)
+                window = next(windows, [])
+                if not window:
+                    return None
+                for index in pending:
+                    heapq.heappush(heap, (offset * plan[index][2], plan[index][2], index, 0))
+
+        busy = 0.0
+
+        def record(index, password, count, seconds):
+            nonlocal busy
+            busy += seconds
+            hash_string, scheme, _, _ = plan[index]
+            attempts[index] += count
+            if password is not None and hash_string not in results:
+                results[hash_string] = self._result(hash_string, scheme, password, attempts[index], start_time, method)
+            bar.add(count)
+
+        with Progress(None if total is None else total * len(plan), desc=desc, unit="verify") as bar:
+            if self.max_workers > 1:
+                import multiprocessing as mp
+                with mp.Pool(self.max_workers) as pool:
+                    inflight = deque()
+                    while True:
+                        while len(inflight) < self.max_workers * 2:
+                            unit = next_unit()
+                            if unit is None:
+                                break
+                            inflight.append(pool.apply_async(_verify_unit, (unit,)))
+                        if not inflight:
+                            break
+                        record(*inflight.popleft().get())
+            else:
+                unit = next_unit()
+                while unit is not None:
+                    record(*_verify_unit(unit))
+                    unit = next_unit()
+
+        metrics = active()
+        if metrics is not None:
+            metrics.record_workers('slowhash', self.max_workers, busy, time.time() - start_time)
+
+        for index, (hash_string, scheme, _, _) in plan.items():
+            if hash_string not in results:
+                results[hash_string] = self._result(hash_string, scheme, None, attempts[index], start_time, method)
+        return results
+
+    def _result(self, hash_string, scheme, password, attempts, start_time, method):
+        return CrackResult(
+            hash=hash_string,
+            hash_type=scheme,
+            cracked=password is not None,
+            password=password,
+            attempts=attempts,
+            time=time.time() - start_time,
+            method=method
+        )
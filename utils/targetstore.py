@@ -0,0 +1,173 @@
+"""Compact target sets for huge hash dumps: raw digests sorted per algorithm, shared through mmap.
+
+A store is a directory with one digest index (utils.digestindex) per
+unsalted algorithm, plus a prefix bitmap that rejects most non-targets
+before the index is searched. Everything is memory-mapped read-only, so
+opening a store is cheap and worker processes share one copy of it.
+"""
+
+import mmap
+import os
+import shutil
+import tempfile
+
+from utils.digestindex import DigestIndex, read_records, write_index
+from utils.ingest import DIGEST_HEX, detect_hash_type, parse_hash_line
+
+INDEX_SUFFIX = '.idx'
+FILTER_SUFFIX = '.bits'
+
+# Prefix bitmap size: about 8 bits per target, between these powers of two
+MIN_FILTER_BITS = 16
+MAX_FILTER_BITS = 27
+
+
+def _filter_bits(count):
+    return min(max((8 * count).bit_length(), MIN_FILTER_BITS), MAX_FILTER_BITS)
+
+
+def build_store(hash_file, path, hash_type='auto'):
+    """Write the unsalted targets of a hash file into store directory path.
+
+    Lines are parsed one at a time and digests spilled to temporary files,
+    then sorted and deduplicated by write_index, so memory use does not
+    grow with the dump. The store is written to a new directory beside
+    path and swapped in when complete, replacing any previous store there.
+    Returns counts: lines, malformed and salted (skipped modular-crypt)
+    lines, and distinct targets per algorithm. Raises ValueError, leaving
+    any previous store in place, when the file has no unsalted targets.
+    """
+    path = os.path.abspath(path)
+    stats = {'lines': 0, 'malformed': 0, 'salted': 0, 'targets': {}}
+    temp_dir = tempfile.mkdtemp(prefix='targetstore-')
+    build_dir = tempfile.mkdtemp(prefix=f".{os.path.basename(path)}-", dir=os.path.dirname(path))
+    spills = {}
+    try:
+        with open(hash_file, 'r', encoding='utf-8', errors='replace') as f:
+            for number, line in enumerate(f, 1):
+                stats['lines'] = number
+                try:
+                    parsed = parse_hash_line(line, hash_type)
+                except ValueError:
+                    stats['malformed'] += 1
+                    continue
+                if parsed is None:
+                    continue
+                _, algorithm, digest = parsed
+                if digest is None:
+                    stats['salted'] += 1
+                    continue
+                if algorithm not in spills:
+                    spills[algorithm] = open(os.path.join(temp_dir, algorithm), 'wb')
+                spills[algorithm].write(digest)
+        if not spills:
+            raise ValueError(f"No unsalted targets in {hash_file} ({stats['lines']:,} lines, "
+                             f"{stats['malformed']:,} malformed, {stats['salted']:,} salted)")
+
+        for algorithm, spill in spills.items():
+            spill.close()
+            width = DIGEST_HEX[algorithm] // 2
+            index_path = os.path.join(build_dir, algorithm + INDEX_SUFFIX)
+            count = write_index(index_path, read_records(spill.name, width), width, kind=algorithm)
+            _write_filter(os.path.join(build_dir, algorithm + FILTER_SUFFIX), DigestIndex(index_path), count)
+            stats['targets'][algorithm] = count
+        _swap_in(build_dir, path)
+    finally:
+        for spill in spills.values():
+            spill.close()
+        shutil.rmtree(temp_dir)
+        shutil.rmtree(build_dir, ignore_errors=True)
+    return stats
+
+
+def _swap_in(build_dir, path):
+    """Move a finished store directory to path, removing the store it replaces"""
+    if not os.path.exists(path):
+        os.replace(build_dir, path)
+        return
+    old_dir = f"{build_dir}.old"
+    os.replace(path, old_dir)
+    os.replace(build_dir, path)
+    shutil.rmtree(old_dir)
+
+
+def _write_filter(path, index, count):
+    """Bitmap of the leading ``bits`` bits of every digest; the first byte stores bits"""
+    bits = _filter_bits(count)
+    shift = 32 - bits
+    bitmap = bytearray(1 << (bits - 3))
+    with index:
+        for digest in index:
+            prefix = int.from_bytes(digest[:4], 'big') >> shift
+            bitmap[prefix >> 3] |= 1 << (prefix & 7)
+    with open(path, 'wb') as f:
+        f.write(bytes([bits]))
+        f.write(bitmap)
+
+
+class DigestSet:
+    """One algorithm's targets: prefix bitmap check, then the sorted digest index"""
+    def __init__(self, index_path, filter_path):
+        self.index = DigestIndex(index_path)
+        self.algorithm = self.index.kind
+        with open(filter_path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.shift = 32 - self._mm[0]
+        # Bitmap bytes start at offset 1
+        self.bitmap = memoryview(self._mm)[1:]
+
+    def __contains__(self, digest):
+        prefix = int.from_bytes(digest[:4], 'big') >> self.shift
+        return bool(self.bitmap[prefix >> 3] >> (prefix & 7) & 1) and digest in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def close(self):
+        self.bitmap.release()
+        self._mm.close()
+        self.index.close()
+
+
+class TargetStore:
+    """Read-only targets of a store directory written by build_store, by algorithm"""
+    def __init__(self, path):
+        if not os.path.isdir(path):
+            raise FileNotFoundError(f"Target store not found: {path}")
+        self.path = path
+        self.sets = {}
+        for name in sorted(os.listdir(path)):
+            if name.endswith(INDEX_SUFFIX):
+                base = os.path.join(path, name[:-len(INDEX_SUFFIX)])
+                digests = DigestSet(base + INDEX_SUFFIX, base + FILTER_SUFFIX)
+                self.sets[digests.algorithm] = digests
+        if not self.sets:
+            raise ValueError(f"No target indexes in {path}")
+
+    def counts(self):
+        return {algorithm: len(digests) for algorithm, digests in self.sets.items()}
+
+    def __len__(self):
+        return sum(map(len, self.sets.values()))
+
+    def __contains__(self, target_hash):
+        """Membership of a hex hash string"""
+        target_hash = target_hash.strip().lower()
+        digests = self.sets.get(detect_hash_type(target_hash))
+        try:
+            return digests is not None and bytes.fromhex(target_hash) in digests
+        except ValueError:
+            return False
+
+    def close(self):
+        for digests in self.sets.values():
+            digests.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,7 +1,11 @@
 """wordlist utilities"""
 
+import mmap
 import os
 
+# Default size of the line-aligned chunks a WordlistSource is walked in
+CHUNK_BYTES = 1024 * 1024
+
 # Extended common passwords (top 200+)
 extended_common_passwords = {
     '123456', 'password', '12345678', 'qwerty', '123456789',
@@ -56,6 +60,125 @@ def load_wordlist(filepath):
     
     return wordlist
 
+class BloomFilter:
+    """Fixed-size Bloom filter for approximate set membership of bytes"""
+    def __init__(self, size_bytes=16 * 1024 * 1024, hashes=4):
+        self.bits = bytearray(size_bytes)
+        self.size = size_bytes * 8
+        self.hashes = hashes
+    
+    def add(self, item):
+        """Add item; return True if it was (probably) already present"""
+        h1 = hash(item)
+        h2 = (h1 >> 32) | 1
+        present = True
+        for i in range(self.hashes):
+            index = (h1 + i * h2) % self.size
+            byte, bit = index >> 3, 1 << (index & 7)
+            if not self.bits[byte] & bit:
+                self.bits[byte] |= bit
+                present = False
+        return present
+
+class WordlistSource:
+    """Memory-mapped wordlist that streams candidates as bytes in file order.
+    
+    Entries are stripped and comment/blank lines skipped, like load_wordlist,
+    but nothing is materialized: memory use is independent of file size.
+    ``start``/``end`` restrict the source to a byte range so it can be sharded;
+    ``dedupe_bytes`` enables a Bloom filter of that size to drop repeats (a
+    small false-positive rate means a few unique words may also be skipped).
+    """
+    def __init__(self, filepath, start=0, end=None, dedupe_bytes=0):
+        if not os.path.exists(filepath):
+            raise FileNotFoundError(f"Wordlist file not found: {filepath}")
+        
+        self.filepath = filepath
+        self.start = start
+        self.end = os.path.getsize(filepath) if end is None else end
+        self.dedupe_bytes = dedupe_bytes
+        self._line_count = None
+        self._seen = None
+    
+    def __iter__(self):
+        if self.end <= self.start:
+            return
+        
+        seen = self._seen
+        if seen is None and self.dedupe_bytes:
+            seen = BloomFilter(self.dedupe_bytes)
+        
+        with open(self.filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            mm.seek(self.start)
+            readline = mm.readline
+            end = self.end
+            while mm.tell() < end:
+                line = readline().strip()
+                if not line or line.startswith(b'#'):
+                    continue
+                if seen is not None and seen.add(line):
+                    continue
+                yield line
+    
+    def __len__(self):
+        """Number of lines in the range (an upper bound on yielded entries)"""
+        if self._line_count is None:
+            count = 0
+            last = b'\n'
+            with open(self.filepath, 'rb') as f:
+                f.seek(self.start)
+                remaining = self.end - self.start
+                while remaining > 0:
+                    chunk = f.read(min(remaining, 1024 * 1024))
+                    if not chunk:
+                        break
+                    count += chunk.count(b'\n')
+                    remaining -= len(chunk)
+                    last = chunk[-1:]
+            self._line_count = count + (last != b'\n')
+        return self._line_count
+    
+    def split(self, shards):
+        """Split into contiguous sources whose ranges start and end on line boundaries"""
+        size = self.end - self.start
+        if size <= 0:
+            return []
+        
+        shards = max(1, min(shards, size))
+        bounds = [self.start]
+        with open(self.filepath, 'rb') as f:
+            for i in range(1, shards):
+                f.seek(max(self.start + size * i // shards, bounds[-1]))
+                if f.tell() > self.start:
+                    f.seek(f.tell() - 1)
+                    f.readline()  # advance to the start of the next line
+                bounds.append(min(f.tell(), self.end))
+        bounds.append(self.end)
+        
+        return [WordlistSource(self.filepath, start, end, self.dedupe_bytes)
+                for start, end in zip(bounds, bounds[1:]) if end > start]
+    
+    def chunks(self, chunk_bytes=CHUNK_BYTES):
+        """Lazily yield consecutive line-aligned sub-sources of about chunk_bytes each.
+        
+        Each chunk's ``end`` is a resumable byte offset: every entry before it
+        has been yielded once the chunk is exhausted. Chunks share one dedupe
+        filter, so deduplication spans the whole walk.
+        """
+        seen = BloomFilter(self.dedupe_bytes) if self.dedupe_bytes else None
+        start = self.start
+        with open(self.filepath, 'rb') as f:
+            while start < self.end:
+                end = self.end
+                if start + chunk_bytes < self.end:
+                    f.seek(start + chunk_bytes - 1)
+                    f.readline()  # advance to the start of the next line
+                    end = min(f.tell(), self.end)
+                chunk = WordlistSource(self.filepath, start, end, self.dedupe_bytes)
+                chunk._seen = seen
+                yield chunk
+                start = end
+
 def generate_rockyou_sample():
     """Generate a sample rockyou wordlist for testing"""
     sample_passwords = list(extended_common_passwords)[:50]  # Top 50 common